@@ -50,6 +50,15 @@ def _load_module_from_path(module_name: str, path: str):
         raise RuntimeError(f"Gagal import modul {module_name} dari {path}: {e}") from e
     return module
 
+@st.cache_resource(show_spinner=False, max_entries=2 * len(MODULE_MAP))
+def _load_module_cached(module_name: str, path: str, mtime: float):
+    """
+    Satu objek modul per (path, mtime) untuk seluruh proses: rerun Streamlit tidak mengeksekusi ulang
+    file halaman (import instaloader/yt-dlp/pandas, definisi fungsi). File diubah → mtime baru → dimuat ulang.
+    Gagal import tidak di-cache, jadi rerun berikutnya mencoba lagi.
+    """
+    return _load_module_from_path(module_name, path)
+
 def _call_with_optional_kw(fn, **kwargs):
     """Panggil fungsi dengan hanya argumen yang didukung oleh signaturenya."""
     try:
@@ -66,6 +75,7 @@ def _call_with_optional_kw(fn, **kwargs):
 def _run_module_ui(path: str, prefix: str):
     """
     Urutan eksekusi UI modul:
+      0) Modul dimuat sekali per (path, mtime) lewat _load_module_cached
       1) render_app(key_prefix=prefix)
       2) render(key_prefix=prefix)
       3) main(key_prefix=prefix)
@@ -73,7 +83,7 @@ def _run_module_ui(path: str, prefix: str):
     """
     module_name = f"_scraper_{os.path.splitext(os.path.basename(path))[0]}"
     try:
-        mod = _load_module_from_path(module_name, path)
+        mod = _load_module_cached(module_name, path, os.path.getmtime(path))
     except Exception as e:
         st.error(str(e))
         return
@@ -88,7 +98,7 @@ def _run_module_ui(path: str, prefix: str):
             else:
                 return  # sukses
 
-    # Fallback: eksekusi file apa adanya
+    # Fallback modul lama tanpa entry point: eksekusi file apa adanya (tiap rerun, tanpa cache)
     try:
         runpy.run_path(path, init_globals={"st": st})
     except Exception as e:
@@ -0,0 +1,3 @@
+# benchmarks/
+# Benchmark tanpa jaringan: fixture lokal (fixtures.py), extractor yt-dlp palsu (ytdlp_plugins/),
+# stub tweet-harvest (stub_harvest.py), runner (run.py → python -m benchmarks).
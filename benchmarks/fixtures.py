@@ -0,0 +1,369 @@
+# benchmarks/fixtures.py
+# Stand-in lokal untuk semua sumber data scraper (tanpa jaringan):
+#   /ig/...   → Instagram: halaman profil (JSON tertanam), web_profile_info, GraphQL doc_id (timeline + media)
+#   /yt/...   → YouTube: halaman channel (ytInitialData) + youtubei/v1/browse (lanjutan) untuk scrapetube
+#   /ytv/<id> → metadata video YouTube (dibaca extractor yt-dlp palsu di ytdlp_plugins/)
+#   /tt/...   → TikTok: daftar video profil + metadata per video (extractor yt-dlp palsu)
+#   /cdn/...  → CDN gambar (JPEG), latensi bisa diatur
+#   /_stats   → jumlah request per jenis (tidak ikut dihitung)
+# Data deterministik: item ke-i diposting NOW - i × 6 jam, sehingga hasil antar-run bisa dibandingkan.
+
+import io
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+STEP_S = 6 * 3600
+IG_PAGE = 12     # ukuran halaman timeline IG (sama dengan instaloader)
+LIST_PAGE = 30   # ukuran halaman daftar video TikTok / lanjutan channel YouTube
+IG_USER_PK = "1790000000"
+
+def epoch_now() -> int:
+    return int(time.time()) // 3600 * 3600
+
+def post_ts(now: int, i: int) -> int:
+    return now - i * STEP_S
+
+def _jpeg(size=(640, 640)) -> bytes:
+    from PIL import Image
+    noise = Image.effect_noise(size, 48)
+    img = Image.merge("RGB", (noise, noise.rotate(90), Image.linear_gradient("L").resize(size)))
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+# ================== Data sintetis ==================
+def ig_kind(i: int) -> str:
+    return "sidecar" if i % 6 == 0 else "video" if i % 6 == 3 else "image"
+
+def ig_shortcode(i: int) -> str:
+    return f"B{i:08d}"
+
+def ig_node(base: str, now: int, i: int) -> dict:
+    """Node timeline format lama (edge_owner_to_timeline_media), seperti respons web_profile_info."""
+    kind = ig_kind(i)
+    node = {
+        "__typename": {"sidecar": "GraphSidecar", "video": "GraphVideo"}.get(kind, "GraphImage"),
+        "id": str(3_000_000_000 + i),
+        "shortcode": ig_shortcode(i),
+        "taken_at_timestamp": post_ts(now, i),
+        "display_url": f"{base}/cdn/ig/{i}.jpg",
+        "is_video": kind == "video",
+        "edge_media_to_caption": {"edges": [{"node": {"text": f"Kegiatan ke-{i}\nbaris kedua #bench"}}]},
+        "edge_media_preview_like": {"count": 10 + i * 3},
+        "edge_media_to_comment": {"count": i % 17},
+        "owner": {"id": IG_USER_PK},
+    }
+    if kind == "sidecar":
+        # Tiap album ke-4: satu anak video tanpa video_url (seperti timeline asli) → instaloader ambil full metadata
+        needs_full = i % 24 == 0
+        node["edge_sidecar_to_children"] = {"edges": [
+            {"node": {"__typename": "GraphVideo" if needs_full and k == 3 else "GraphImage",
+                      "shortcode": f"{ig_shortcode(i)}{k}", "is_video": needs_full and k == 3,
+                      "display_url": f"{base}/cdn/ig/{i}-{k}.jpg"}}
+            for k in (1, 2, 3)
+        ]}
+    return node
+
+def ig_media_item(base: str, now: int, i: int) -> dict:
+    """Item Polaris (xdt_api__v1__media__shortcode__web_info) untuk full metadata satu post."""
+    kind = ig_kind(i)
+    item = {
+        "code": ig_shortcode(i), "pk": str(3_000_000_000 + i), "taken_at": post_ts(now, i),
+        "media_type": {"sidecar": 8, "video": 2}.get(kind, 1),
+        "user": {"pk": IG_USER_PK, "username": "benchuser", "full_name": "Bench User"},
+        "image_versions2": {"candidates": [{"url": f"{base}/cdn/ig/{i}.jpg"}]},
+        "caption": {"text": f"Kegiatan ke-{i}\nbaris kedua #bench"},
+        "like_count": 10 + i * 3, "comment_count": i % 17, "view_count": 100 + i,
+    }
+    if kind == "sidecar":
+        item["carousel_media"] = [
+            {"code": f"{ig_shortcode(i)}{k}", "media_type": 2 if (i % 24 == 0 and k == 3) else 1,
+             "image_versions2": {"candidates": [{"url": f"{base}/cdn/ig/{i}-{k}.jpg"}]},
+             "video_versions": [{"url": f"{base}/cdn/ig/{i}-{k}.mp4"}] if (i % 24 == 0 and k == 3) else []}
+            for k in (1, 2, 3)
+        ]
+    return item
+
+def ig_timeline(base: str, now: int, n: int, offset: int) -> dict:
+    edges = [{"node": ig_node(base, now, i)} for i in range(offset, min(n, offset + IG_PAGE))]
+    nxt = offset + IG_PAGE
+    return {"count": n, "edges": edges,
+            "page_info": {"has_next_page": nxt < n, "end_cursor": f"c{nxt}" if nxt < n else None}}
+
+def ig_rows(base: str, n: int, now: Optional[int] = None) -> list:
+    """Baris IG_COLUMNS siap ekspor (album = satu baris per gambar), sama dengan hasil scrape_posts_range."""
+    now = now or epoch_now()
+    rows = []
+    for i in range(n):
+        node = ig_node(base, now, i)
+        base_row = {
+            "tanggal_post": datetime.fromtimestamp(node["taken_at_timestamp"], tz=timezone.utc).isoformat(),
+            "link_post": f"https://www.instagram.com/p/{node['shortcode']}/",
+            "caption": f"Kegiatan ke-{i} baris kedua #bench",
+            "like": node["edge_media_preview_like"]["count"],
+        }
+        if "edge_sidecar_to_children" in node:
+            for k, e in enumerate(node["edge_sidecar_to_children"]["edges"], start=1):
+                rows.append({**base_row, "gambar": e["node"]["display_url"], "tipe": f"album_gambar_{k}"})
+        else:
+            rows.append({**base_row, "gambar": node["display_url"], "tipe": "video" if node["is_video"] else "foto"})
+    return rows
+
+def tt_video_id(i: int) -> str:
+    return str(7_400_000_000_000_000_000 + i)
+
+def tt_video(base: str, now: int, i: int, user: str = "benchuser") -> dict:
+    ts = post_ts(now, i)
+    return {
+        "id": tt_video_id(i), "title": f"Video ke-{i} #fyp", "description": f"Video ke-{i} #fyp",
+        "timestamp": ts, "upload_date": datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y%m%d"),
+        "uploader": user, "duration": 15 + i % 45,
+        "thumbnail": f"{base}/cdn/tt/{i}.jpg",
+        "like_count": 100 + i * 7, "view_count": 1000 + i * 31, "comment_count": i % 29, "repost_count": i % 11,
+        "webpage_url": f"https://www.tiktok.com/@{user}/video/{tt_video_id(i)}",
+    }
+
+def yt_video_id(i: int) -> str:
+    return f"bench{i:06d}"
+
+def _relative(now: int, i: int) -> str:
+    age = now - post_ts(now, i)
+    days = age // 86400
+    if days == 0:
+        return f"{max(1, age // 3600)} hours ago"
+    if days < 14:
+        return f"{days} day{'s' if days > 1 else ''} ago"
+    return f"{days // 7} weeks ago"
+
+def yt_renderer(now: int, i: int) -> dict:
+    return {"richItemRenderer": {"content": {"videoRenderer": {
+        "videoId": yt_video_id(i),
+        "title": {"runs": [{"text": f"Rilis kegiatan ke-{i}"}]},
+        "publishedTimeText": {"simpleText": _relative(now, i)},
+        "lengthText": {"simpleText": f"{1 + i % 20}:{i % 60:02d}"},
+    }}}}
+
+def yt_items(now: int, n: int, offset: int) -> list:
+    items = [yt_renderer(now, i) for i in range(offset, min(n, offset + LIST_PAGE))]
+    nxt = offset + LIST_PAGE
+    if nxt < n:
+        items.append({"continuationItemRenderer": {"continuationEndpoint": {
+            "clickTrackingParams": f"ctp{nxt}", "continuationCommand": {"token": f"cont{nxt}"}}}})
+    return items
+
+def yt_video(now: int, i: int) -> dict:
+    ts = post_ts(now, i)
+    return {"id": yt_video_id(i), "title": f"Rilis kegiatan ke-{i}",
+            "upload_date": datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y%m%d"), "timestamp": ts,
+            "description": f"Deskripsi video ke-{i}\n" + "lorem ipsum " * 20,
+            "like_count": 5 + i, "view_count": 200 + i * 13, "duration": 60 + i}
+
+def x_rows(base: str, now: int, n: int, user: str = "benchuser") -> list:
+    """Baris CSV tweet-harvest (kolom sama dengan keluaran aslinya)."""
+    out = []
+    for i in range(n):
+        ts = datetime.fromtimestamp(post_ts(now, i), tz=timezone.utc)
+        out.append({
+            "conversation_id_str": str(1_880_000_000_000_000_000 + i),
+            "created_at": ts.strftime("%a %b %d %H:%M:%S +0000 %Y"),
+            "favorite_count": i % 50, "full_text": f"Tweet ke-{i}, \"kutipan\"\nbaris kedua" if i % 3 else f"RT @lain: {i}",
+            "id_str": str(1_880_000_000_000_000_000 + i),
+            "image_url": f"{base}/cdn/x/{i}.jpg" if i % 2 == 0 else "",
+            "in_reply_to_screen_name": "", "lang": "in", "location": "", "quote_count": 0, "reply_count": i % 5,
+            "retweet_count": i % 7, "tweet_url": f"https://x.com/{user}/status/{1_880_000_000_000_000_000 + i}",
+            "user_id_str": "42", "username": user,
+        })
+    return out
+
+# ================== Server ==================
+class FixtureServer:
+    """
+    Satu ThreadingHTTPServer untuk semua stand-in. n = jumlah item per akun/channel.
+    cdn_latency / api_latency (detik) = jeda per request (meniru RTT + waktu server).
+    """
+
+    def __init__(self, n: int = 120, cdn_latency: float = 0.04, api_latency: float = 0.02,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.n = n
+        self.cdn_latency = cdn_latency
+        self.api_latency = api_latency
+        self.now = epoch_now()
+        self.image = _jpeg()
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self.url = f"http://{host}:{self._httpd.server_address[1]}"
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixtures", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    def _handler(self):
+        srv = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive, seperti server asli
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body: bytes, ctype: str, status: int = 200, headers: Optional[dict] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, obj, headers: Optional[dict] = None):
+                self._send(json.dumps(obj).encode("utf-8"), "application/json; charset=utf-8", headers=headers)
+
+            def _body(self) -> bytes:
+                n = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(n) if n else b""
+
+            def do_GET(self):
+                self._route("GET", b"")
+
+            def do_POST(self):
+                self._route("POST", self._body())
+
+            def _route(self, method: str, body: bytes):
+                parts = urlsplit(self.path)
+                path, query = parts.path, parse_qs(parts.query)
+                if path == "/_stats":
+                    return self._json(srv.stats())
+                kind = path.split("/")[1] if path.count("/") >= 1 else ""
+                srv._count(kind)
+                time.sleep(srv.cdn_latency if kind == "cdn" else srv.api_latency)
+                try:
+                    handler = {"cdn": self._cdn, "ig": self._ig, "yt": self._yt, "ytv": self._ytv, "tt": self._tt}[kind]
+                except KeyError:
+                    return self._send(b"not found", "text/plain", 404)
+                handler(method, path, query, body)
+
+            # ---------- CDN ----------
+            def _cdn(self, method, path, query, body):
+                if path.endswith(".mp4"):
+                    return self._send(b"\x00" * 1024, "video/mp4")
+                self._send(srv.image, "image/jpeg", headers={"Cache-Control": "max-age=86400"})
+
+            # ---------- Instagram ----------
+            def _ig(self, method, path, query, body):
+                rest = path[len("/ig"):]
+                if rest in ("", "/"):
+                    return self._send(b"<html></html>", "text/html", headers={"Set-Cookie": "csrftoken=bench; Path=/"})
+                if rest.startswith("/api/v1/users/web_profile_info"):
+                    user = (query.get("username") or ["benchuser"])[0]
+                    return self._json({"status": "ok", "data": {"user": {
+                        "id": IG_USER_PK, "username": user, "full_name": "Bench User", "is_private": False,
+                        "edge_followed_by": {"count": 1234}, "edge_follow": {"count": 56},
+                        "edge_owner_to_timeline_media": ig_timeline(srv.url, srv.now, srv.n, 0),
+                    }}})
+                if rest.startswith("/graphql/query"):
+                    form = parse_qs(body.decode("utf-8"))
+                    doc_id = (form.get("doc_id") or [""])[0]
+                    variables = json.loads((form.get("variables") or ["{}"])[0])
+                    if "shortcode" in variables:   # full metadata satu post
+                        i = int(re.sub(r"\D", "", variables["shortcode"]) or 0)
+                        return self._json({"status": "ok", "data": {"xdt_api__v1__media__shortcode__web_info": {
+                            "items": [ig_media_item(srv.url, srv.now, i)]}}})
+                    offset = int(str(variables.get("after") or "c0").lstrip("c"))
+                    return self._json({"status": "ok", "doc_id": doc_id, "data": {"user": {
+                        "edge_owner_to_timeline_media": ig_timeline(srv.url, srv.now, srv.n, offset)}}})
+                user = rest.strip("/").split("/")[0]
+                embedded = {"require": [["ScheduledServerJS", "handle", None, [{"__bbox": {"result": {"data": {
+                    "xig_user_by_username": {"pk": IG_USER_PK, "id": "profile-" + user, "username": user,
+                                             "full_name": "Bench User", "is_private": False},
+                }}}}]]]}
+                html = ('<!DOCTYPE html><html><head></head><body>'
+                        f'<script type="application/json" data-sjs>{json.dumps(embedded)}</script>'
+                        '</body></html>')
+                self._send(html.encode("utf-8"), "text/html; charset=utf-8")
+
+            # ---------- YouTube (scrapetube) ----------
+            def _yt(self, method, path, query, body):
+                if path.startswith("/yt/youtubei/v1/browse"):
+                    token = json.loads(body or b"{}").get("continuation") or "cont0"
+                    offset = int(token[len("cont"):])
+                    return self._json({"onResponseReceivedActions": [{"appendContinuationItemsAction": {
+                        "continuationItems": yt_items(srv.now, srv.n, offset)}}]})
+                initial = {"contents": {"twoColumnBrowseResultsRenderer": {"tabs": [{"tabRenderer": {
+                    "title": "Videos", "content": {"richGridRenderer": {"contents": yt_items(srv.now, srv.n, 0)}}}}]}}}
+                html = ('<html><script>ytcfg.set({"INNERTUBE_CONTEXT":{"client":{"hl":"en",'
+                        '"clientName":"WEB","clientVersion":"2.20250101.00.00"}},"innertubeApiKey":"benchkey"});'
+                        f'</script><script>var ytInitialData = {json.dumps(initial)};</script></html>')
+                self._send(html.encode("utf-8"), "text/html; charset=utf-8")
+
+            def _ytv(self, method, path, query, body):
+                i = int(re.sub(r"\D", "", path.rsplit("/", 1)[-1]) or 0)
+                self._json(yt_video(srv.now, i))
+
+            # ---------- TikTok (yt-dlp) ----------
+            def _tt(self, method, path, query, body):
+                seg = path.strip("/").split("/")
+                if len(seg) >= 3 and seg[1] == "user":
+                    offset = int((query.get("cursor") or ["0"])[0])
+                    ids = [tt_video_id(i) for i in range(offset, min(srv.n, offset + LIST_PAGE))]
+                    nxt = offset + LIST_PAGE
+                    return self._json({"ids": ids, "next": nxt if nxt < srv.n else None})
+                if len(seg) >= 3 and seg[1] == "video":
+                    i = int(seg[2]) - 7_400_000_000_000_000_000
+                    return self._json(tt_video(srv.url, srv.now, i))
+                self._send(b"not found", "text/plain", 404)
+
+        return Handler
+
+# ================== Routing host asli → fixture ==================
+@contextmanager
+def route_hosts(mapping: Dict[str, str]):
+    """
+    Arahkan request `requests` ke host tertentu (mis. www.instagram.com) ke base URL fixture.
+    Dipasang di HTTPAdapter.send → semua Session (termasuk sesi anonim/salinan instaloader dan
+    RateLimitedAdapter) ikut, sementara pembatas laju tetap melihat host aslinya.
+    """
+    from requests.adapters import HTTPAdapter
+
+    orig = HTTPAdapter.send
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        target = mapping.get(parts.hostname or "")
+        if target:
+            request.url = target.rstrip("/") + parts.path + (f"?{parts.query}" if parts.query else "")
+        return orig(self, request, **kwargs)
+
+    HTTPAdapter.send = send
+    try:
+        yield
+    finally:
+        HTTPAdapter.send = orig
@@ -0,0 +1,262 @@
+# benchmarks/run.py
+# Benchmark tanpa jaringan untuk semua scraper & eksportir Excel, terhadap stand-in lokal (benchmarks.fixtures):
+#   python -m benchmarks                                  # semua kasus, 120 item per akun
+#   python -m benchmarks --items 300 --cdn-latency-ms 80 --only ig_scrape,xlsx_x
+#   python -m benchmarks --json bench.json                # simpan hasil
+#   python -m benchmarks --baseline bench.json            # exit 1 kalau ada regresi di luar toleransi
+# Tiap kasus jalan di proses anak sendiri → peak RSS per kasus tidak tercampur kasus lain.
+# Metrik: rows/detik, request HTTP per baris (dihitung fixture), peak RSS (MB, termasuk import).
+#
+# Default: pembatas laju (SCRAPER_RATE_LIMITS) & cache gambar dimatikan supaya yang terukur kode scraper,
+# bukan jeda sopan / hit cache. --rate-limits → pakai laju default per host.
+
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGIN_DIR = os.path.join(ROOT, "benchmarks", "ytdlp_plugins")
+USER = "benchuser"
+
+# ================== Kasus (jalan di proses anak) ==================
+def _finish(f) -> int:
+    """Ukuran file hasil eksportir (byte), lalu tutup."""
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.close()
+    return size
+
+def case_ig_scrape(base: str, n: int) -> dict:
+    from benchmarks.fixtures import route_hosts
+    from scraper_core.instagram import new_instaloader, scrape_posts_range
+    with route_hosts({"www.instagram.com": base + "/ig", "i.instagram.com": base + "/ig"}):
+        L = new_instaloader()
+        L.context.sleep = False   # jeda acak instaloader (±1,7 s/request) bukan bagian yang diukur
+        rows = scrape_posts_range(L, USER, limit=None, album_all=True)
+    return {"rows": len(rows)}
+
+def case_tt_fetch(base: str, n: int) -> dict:
+    from scraper_core.tiktok import fetch_user_videos
+    return {"rows": len(fetch_user_videos(USER, n))}
+
+def case_tt_fetch_parallel(base: str, n: int) -> dict:
+    from scraper_core.tiktok import fetch_user_videos_parallel
+    entries, errors = fetch_user_videos_parallel(USER, n)
+    return {"rows": len(entries), "errors": len(errors)}
+
+def case_yt_channel(base: str, n: int) -> dict:
+    from benchmarks.fixtures import route_hosts
+    from scraper_core.youtube import scrape_channel_rows
+    with route_hosts({"www.youtube.com": base + "/yt"}):
+        rows = scrape_channel_rows(f"https://www.youtube.com/@{USER}", n, enrich=True)
+    return {"rows": len(rows)}
+
+def case_x_harvest(base: str, n: int) -> dict:
+    from scraper_core.x import harvest_tweets
+    today = date.today()
+    start = today - timedelta(days=n // 4 + 2)
+    mini, _, _ = harvest_tweets(USER, start.isoformat(), today.isoformat(), n, "bench",
+                                only_original=False, exclude_quote=False)
+    return {"rows": len(mini)}
+
+def case_xlsx_instagram(base: str, n: int) -> dict:
+    from benchmarks.fixtures import ig_rows
+    from scraper_core.instagram import rows_to_excel_with_images
+    rows = ig_rows(base, n)
+    return {"rows": len(rows), "_run": lambda: {"bytes": _finish(rows_to_excel_with_images(rows))}}
+
+def case_xlsx_tiktok(base: str, n: int) -> dict:
+    from benchmarks.fixtures import epoch_now, tt_video
+    from scraper_core.tiktok import build_dataframe, iter_preview_images, make_excel_with_images
+    now = epoch_now()
+    df = build_dataframe([tt_video(base, now, i) for i in range(n)])
+    return {"rows": len(df),
+            "_run": lambda: {"bytes": _finish(make_excel_with_images(df, iter_preview_images(df, None)))}}
+
+def case_xlsx_youtube(base: str, n: int) -> dict:
+    from benchmarks.fixtures import epoch_now, route_hosts, yt_video
+    from scraper_core.youtube import build_thumb_url, create_excel_with_images, rows_to_frame
+    now = epoch_now()
+    rows = []
+    for i in range(n):
+        v = yt_video(now, i)
+        rows.append({"thumbnail_url": build_thumb_url(v["id"], "hq"), "title": v["title"], "published_text": None,
+                     "published_date": f"{v['upload_date'][:4]}-{v['upload_date'][4:6]}-{v['upload_date'][6:]}",
+                     "duration_text": None, "like_count": v["like_count"],
+                     "video_url": f"https://www.youtube.com/watch?v={v['id']}", "video_id": v["id"],
+                     "description": v["description"]})
+    df = rows_to_frame(rows)
+
+    def run():
+        with route_hosts({"i.ytimg.com": base + "/cdn/yt"}):
+            return {"bytes": _finish(create_excel_with_images(df))}
+    return {"rows": len(df), "_run": run}
+
+def case_xlsx_x(base: str, n: int) -> dict:
+    import pandas as pd
+    from benchmarks.fixtures import epoch_now, x_rows
+    from scraper_core.x import add_media_url_column, build_mini_table, export_excel_5cols
+    mini = build_mini_table(add_media_url_column(pd.DataFrame(x_rows(base, epoch_now(), n))))
+    return {"rows": len(mini), "_run": lambda: {"bytes": _finish(export_excel_5cols(
+        mini, USER, keep_full_image_in_excel=False, save_originals_to_disk=False))}}
+
+# Kasus scrape diukur seluruhnya; kasus xlsx_* menyiapkan input dulu lalu hanya `_run` yang diukur
+CASES: Dict[str, Callable[[str, int], dict]] = {
+    "ig_scrape": case_ig_scrape,
+    "tt_fetch": case_tt_fetch,
+    "tt_fetch_parallel": case_tt_fetch_parallel,
+    "yt_channel": case_yt_channel,
+    "x_harvest": case_x_harvest,
+    "xlsx_instagram": case_xlsx_instagram,
+    "xlsx_tiktok": case_xlsx_tiktok,
+    "xlsx_youtube": case_xlsx_youtube,
+    "xlsx_x": case_xlsx_x,
+}
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:   # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def _fixture_stats(base: str) -> Dict[str, int]:
+    with urllib.request.urlopen(base + "/_stats", timeout=10) as r:
+        return json.loads(r.read())
+
+def run_case(name: str, base: str, n: int) -> dict:
+    """Jalankan satu kasus di proses ini → dict metrik."""
+    before = _fixture_stats(base)
+    t0 = time.perf_counter()
+    res = CASES[name](base, n)
+    run = res.pop("_run", None)
+    if run is not None:          # eksportir: input sudah siap, ukur ekspornya saja
+        before = _fixture_stats(base)
+        t0 = time.perf_counter()
+        res.update(run())
+    secs = time.perf_counter() - t0
+    after = _fixture_stats(base)
+    reqs = {k: after.get(k, 0) - before.get(k, 0) for k in after if after.get(k, 0) != before.get(k, 0)}
+    rows = res["rows"]
+    total = sum(reqs.values())
+    return {
+        "case": name, **res, "seconds": round(secs, 3),
+        "rows_per_sec": round(rows / secs, 2) if secs else 0.0,
+        "requests": total, "requests_per_row": round(total / rows, 3) if rows else None,
+        "requests_by_kind": reqs, "peak_rss_mb": _peak_rss_mb(),
+    }
+
+# ================== Orkestrasi (proses induk) ==================
+def _child_env(base: str, args) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (ROOT, PLUGIN_DIR, env.get("PYTHONPATH")) if p)
+    env["SCRAPER_BENCH_FIXTURE"] = base
+    env["SCRAPER_BENCH_HARVEST_DELAY"] = str(args.api_latency_ms / 1000.0)
+    env["SCRAPER_HARVEST_CMD"] = f"{shlex.quote(sys.executable)} -m benchmarks.stub_harvest"
+    env["SCRAPER_THUMB_CACHE_MB"] = "0"
+    env["SCRAPER_STORE"] = "off"
+    if not args.rate_limits:
+        env["SCRAPER_RATE_LIMITS"] = "off"
+    return env
+
+def run_all(names: List[str], args) -> List[dict]:
+    from benchmarks.fixtures import FixtureServer
+
+    results = []
+    with FixtureServer(n=args.items, cdn_latency=args.cdn_latency_ms / 1000.0,
+                       api_latency=args.api_latency_ms / 1000.0) as srv:
+        env = _child_env(srv.url, args)
+        for name in names:
+            with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as cwd:
+                proc = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.run", "--case", name, "--fixture", srv.url,
+                     "--items", str(args.items)],
+                    cwd=cwd, env=env, capture_output=True, text=True, timeout=args.timeout,
+                )
+            line = next((ln for ln in reversed(proc.stdout.splitlines()) if ln.startswith("{")), None)
+            if proc.returncode != 0 or line is None:
+                res = {"case": name, "error": (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ["?"]}
+            else:
+                res = json.loads(line)
+            results.append(res)
+            print_result(res)
+    return results
+
+def print_result(res: dict):
+    if res.get("error"):
+        print(f"{res['case']:<18} GAGAL: {res['error'][0]}", file=sys.stderr)
+        return
+    rss = "-" if res["peak_rss_mb"] is None else f"{res['peak_rss_mb']:.0f} MB"
+    rpr = "-" if res["requests_per_row"] is None else f"{res['requests_per_row']:.2f}"
+    print(f"{res['case']:<18} {res['rows']:>6} baris  {res['seconds']:>7.2f}s  {res['rows_per_sec']:>8.1f} baris/s  "
+          f"{rpr:>6} req/baris  peak {rss:>7}", flush=True)
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[str]:
+    """Regresi dibanding baseline: baris/s turun, req/baris atau peak RSS naik lebih dari toleransi."""
+    old = {r["case"]: r for r in baseline if not r.get("error")}
+    problems = []
+    for r in results:
+        b = old.get(r["case"])
+        if r.get("error"):
+            problems.append(f"{r['case']}: gagal jalan")
+            continue
+        if not b:
+            continue
+        if b["rows_per_sec"] and r["rows_per_sec"] < b["rows_per_sec"] * (1 - tolerance):
+            problems.append(f"{r['case']}: baris/s {b['rows_per_sec']} → {r['rows_per_sec']}")
+        if b.get("requests_per_row") is not None and r.get("requests_per_row") is not None \
+                and r["requests_per_row"] > b["requests_per_row"] * (1 + tolerance) + 0.01:
+            problems.append(f"{r['case']}: req/baris {b['requests_per_row']} → {r['requests_per_row']}")
+        if b.get("peak_rss_mb") and r.get("peak_rss_mb") and r["peak_rss_mb"] > b["peak_rss_mb"] * (1 + tolerance):
+            problems.append(f"{r['case']}: peak RSS {b['peak_rss_mb']} → {r['peak_rss_mb']} MB")
+    return problems
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark scraper tanpa jaringan")
+    ap.add_argument("--items", type=int, default=120, help="jumlah post/video/tweet per akun (default 120)")
+    ap.add_argument("--cdn-latency-ms", type=float, default=40.0, help="latensi CDN gambar per request")
+    ap.add_argument("--api-latency-ms", type=float, default=20.0, help="latensi endpoint API/halaman per request")
+    ap.add_argument("--only", help="daftar kasus dipisah koma (default semua): " + ",".join(CASES))
+    ap.add_argument("--json", help="simpan hasil ke file JSON")
+    ap.add_argument("--baseline", help="JSON hasil sebelumnya; exit 1 kalau ada regresi")
+    ap.add_argument("--tolerance", type=float, default=0.3, help="toleransi regresi relatif (default 0.3)")
+    ap.add_argument("--rate-limits", action="store_true", help="jangan matikan pembatas laju per host")
+    ap.add_argument("--timeout", type=float, default=900, help="batas waktu per kasus (detik)")
+    ap.add_argument("--case", help=argparse.SUPPRESS)
+    ap.add_argument("--fixture", help=argparse.SUPPRESS)
+    return ap
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.case:                      # proses anak
+        print(json.dumps(run_case(args.case, args.fixture, args.items), ensure_ascii=False))
+        return 0
+
+    names = [s.strip() for s in args.only.split(",") if s.strip()] if args.only else list(CASES)
+    unknown = [s for s in names if s not in CASES]
+    if unknown:
+        raise SystemExit(f"Kasus tidak dikenal: {', '.join(unknown)} (pilih: {', '.join(CASES)})")
+    results = run_all(names, args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"items": args.items, "cdn_latency_ms": args.cdn_latency_ms,
+                       "api_latency_ms": args.api_latency_ms, "results": results}, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare(results, json.load(f).get("results") or [], args.tolerance)
+        for p in problems:
+            print(f"REGRESI {p}", file=sys.stderr)
+        return 1 if problems else 0
+    return 1 if any(r.get("error") for r in results) else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
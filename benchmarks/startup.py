@@ -0,0 +1,133 @@
+# benchmarks/startup.py
+# Biaya import per modul (cold start hub / worker), tiap modul di proses anak baru:
+#   python -m benchmarks.startup                          # semua modul, median 5 kali
+#   python -m benchmarks.startup --only instagram,scraper_core.tiktok --repeat 9
+#   python -m benchmarks.startup --json startup.json      # simpan hasil
+#   python -m benchmarks.startup --baseline startup.json  # exit 1 kalau ada regresi di luar toleransi
+# Halaman Streamlit diukur SETELAH streamlit dimuat (biaya streamlit sendiri = baris `streamlit`),
+# jadi angkanya = yang dibayar hub saat pertama kali membuka halaman itu.
+# Kolom "berat" = dependensi besar yang ikut termuat oleh import modul itu (idealnya kosong untuk halaman).
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (modul, pramuat) — pramuat di-import dulu dan tidak ikut dihitung
+MODULES = [
+    ("streamlit", ()),
+    ("scraper_core", ()),
+    ("scraper_core.cli", ()),
+    ("scraper_core.instagram", ()),
+    ("scraper_core.tiktok", ()),
+    ("scraper_core.youtube", ()),
+    ("scraper_core.x", ()),
+    ("scraper_core.xlsx", ()),
+    ("scraper_core.images", ()),
+    ("scraper_core.columnar", ()),
+    ("scraper_core.store", ()),
+    ("instagram", ("streamlit",)),
+    ("tiktok", ("streamlit",)),
+    ("youtube", ("streamlit",)),
+    ("x", ("streamlit",)),
+]
+HEAVY = ("yt_dlp", "instaloader", "scrapetube", "openpyxl", "PIL", "pyarrow", "pandas", "numpy", "dateutil")
+
+_CHILD = """
+import importlib, json, sys, time
+for m in {preload!r}:
+    importlib.import_module(m)
+before = set(sys.modules)
+t0 = time.perf_counter()
+importlib.import_module({module!r})
+ms = (time.perf_counter() - t0) * 1000
+heavy = [h for h in {heavy!r} if h in sys.modules and h not in before]
+print(json.dumps({{"ms": ms, "heavy": heavy, "modules": len(set(sys.modules) - before)}}))
+"""
+
+def measure(module: str, preload=(), repeat: int = 5) -> dict:
+    """Median waktu import `module` di `repeat` proses baru (cwd = root repo, seperti `streamlit run`)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in (ROOT, os.environ.get("PYTHONPATH")) if p))
+    env.setdefault("SCRAPER_STORE", "off")
+    code = _CHILD.format(preload=tuple(preload), module=module, heavy=HEAVY)
+    runs = []
+    for _ in range(max(1, repeat)):
+        proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+        line = next((ln for ln in reversed(proc.stdout.splitlines()) if ln.startswith("{")), None)
+        if proc.returncode != 0 or line is None:
+            return {"module": module, "error": (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ["?"]}
+        runs.append(json.loads(line))
+    return {
+        "module": module, "after": list(preload),
+        "import_ms": round(statistics.median(r["ms"] for r in runs), 1),
+        "min_ms": round(min(r["ms"] for r in runs), 1),
+        "new_modules": runs[-1]["modules"], "heavy": runs[-1]["heavy"],
+    }
+
+def print_result(res: dict):
+    if res.get("error"):
+        print(f"{res['module']:<24} GAGAL: {res['error'][0]}", file=sys.stderr)
+        return
+    after = f" (setelah {', '.join(res['after'])})" if res["after"] else ""
+    print(f"{res['module']:<24} {res['import_ms']:>8.1f} ms  min {res['min_ms']:>7.1f} ms  "
+          f"{res['new_modules']:>5} modul  berat: {', '.join(res['heavy']) or '-'}{after}", flush=True)
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[str]:
+    """Regresi: import lebih lambat dari toleransi (+20 ms absolut untuk jitter), atau dependensi berat baru."""
+    old = {r["module"]: r for r in baseline if not r.get("error")}
+    problems = []
+    for r in results:
+        b = old.get(r["module"])
+        if r.get("error"):
+            problems.append(f"{r['module']}: gagal import")
+            continue
+        if not b:
+            continue
+        if r["import_ms"] > b["import_ms"] * (1 + tolerance) + 20:
+            problems.append(f"{r['module']}: import {b['import_ms']} → {r['import_ms']} ms")
+        new_heavy = sorted(set(r["heavy"]) - set(b.get("heavy") or []))
+        if new_heavy:
+            problems.append(f"{r['module']}: ikut memuat {', '.join(new_heavy)}")
+    return problems
+
+def build_parser() -> argparse.ArgumentParser:
+    names = [m for m, _ in MODULES]
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.startup", description="Biaya import per modul")
+    ap.add_argument("--repeat", type=int, default=5, help="jumlah proses per modul, diambil median (default 5)")
+    ap.add_argument("--only", help="daftar modul dipisah koma (default semua): " + ",".join(names))
+    ap.add_argument("--json", help="simpan hasil ke file JSON")
+    ap.add_argument("--baseline", help="JSON hasil sebelumnya; exit 1 kalau ada regresi")
+    ap.add_argument("--tolerance", type=float, default=0.3, help="toleransi regresi relatif (default 0.3)")
+    return ap
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    table = dict(MODULES)
+    names = [s.strip() for s in args.only.split(",") if s.strip()] if args.only else list(table)
+    unknown = [s for s in names if s not in table]
+    if unknown:
+        raise SystemExit(f"Modul tidak dikenal: {', '.join(unknown)} (pilih: {', '.join(table)})")
+    results = []
+    for name in names:
+        res = measure(name, table[name], args.repeat)
+        results.append(res)
+        print_result(res)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "repeat": args.repeat, "results": results},
+                      f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare(results, json.load(f).get("results") or [], args.tolerance)
+        for p in problems:
+            print(f"REGRESI {p}", file=sys.stderr)
+        return 1 if problems else 0
+    return 1 if any(r.get("error") for r in results) else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
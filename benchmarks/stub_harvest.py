@@ -0,0 +1,48 @@
+# benchmarks/stub_harvest.py
+# Pengganti `npx tweet-harvest` untuk benchmark (dipasang lewat SCRAPER_HARVEST_CMD):
+#   python -m benchmarks.stub_harvest -o akun.csv -s "from:akun since:... until:..." -l 200 --token x
+# Menulis CSV sintetis ./tweets-data/<o> per batch (seperti tweet-harvest: relatif ke cwd, satu batch per scroll),
+# gambar menunjuk ke CDN fixture (ENV SCRAPER_BENCH_FIXTURE). Jeda per batch: ENV SCRAPER_BENCH_HARVEST_DELAY (detik).
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+
+from benchmarks.fixtures import epoch_now, x_rows
+
+BATCH = 20
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="stub_harvest")
+    ap.add_argument("-o", required=True)
+    ap.add_argument("-s", required=True)
+    ap.add_argument("-l", type=int, default=100)
+    ap.add_argument("--token")
+    a = ap.parse_args(argv)
+
+    m = re.search(r"from:(\S+)", a.s)
+    user = m.group(1) if m else "benchuser"
+    name = a.o if a.o.lower().endswith(".csv") else f"{a.o}.csv"
+    os.makedirs("tweets-data", exist_ok=True)
+    path = os.path.join("tweets-data", name)
+    delay = float(os.getenv("SCRAPER_BENCH_HARVEST_DELAY", "0"))
+    rows = x_rows(os.getenv("SCRAPER_BENCH_FIXTURE", "http://127.0.0.1:9"), epoch_now(), a.l, user)
+
+    print(f"Searching: {a.s}", flush=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["id_str"])
+        w.writeheader()
+        for start in range(0, len(rows), BATCH):
+            w.writerows(rows[start:start + BATCH])
+            f.flush()
+            print(f"Your tweets saved to: {path} (total {min(start + BATCH, len(rows))})", flush=True)
+            if delay:
+                time.sleep(delay)
+    sys.stderr.write("Done scrolling\n")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
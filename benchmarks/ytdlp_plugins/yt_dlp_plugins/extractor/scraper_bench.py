@@ -0,0 +1,59 @@
+# benchmarks/ytdlp_plugins/yt_dlp_plugins/extractor/scraper_bench.py
+# Extractor yt-dlp palsu untuk benchmark: URL TikTok & YouTube watch dilayani fixture lokal
+# (ENV SCRAPER_BENCH_FIXTURE). Hanya dimuat kalau benchmarks/ytdlp_plugins ada di sys.path / PYTHONPATH;
+# plugin yt-dlp selalu dicek sebelum extractor bawaan, jadi kode scraper tidak perlu diubah.
+
+import os
+
+from yt_dlp.extractor.common import InfoExtractor
+
+
+def _base():
+    return os.environ["SCRAPER_BENCH_FIXTURE"].rstrip("/")
+
+
+def _formats(vid):
+    return [
+        {"format_id": "play-540", "url": f"{_base()}/cdn/tt/{vid}-540.mp4", "ext": "mp4",
+         "width": 576, "height": 1024, "vcodec": "h264", "acodec": "aac", "tbr": 900},
+        {"format_id": "play-720", "url": f"{_base()}/cdn/tt/{vid}-720.mp4", "ext": "mp4",
+         "width": 720, "height": 1280, "vcodec": "h265", "acodec": "aac", "tbr": 1400},
+    ]
+
+
+class BenchTikTokVideoIE(InfoExtractor):
+    IE_NAME = "bench:tiktok"
+    _VALID_URL = r"https?://(?:www\.)?tiktok\.com/@[\w.-]+/video/(?P<id>\d+)"
+
+    def _real_extract(self, url):
+        vid = self._match_id(url)
+        info = self._download_json(f"{_base()}/tt/video/{vid}", vid, note=False)
+        return {**info, "formats": _formats(vid)}
+
+
+class BenchTikTokUserIE(InfoExtractor):
+    IE_NAME = "bench:tiktok:user"
+    _VALID_URL = r"https?://(?:www\.)?tiktok\.com/@(?P<id>[\w.-]+)/?(?:[?#]|$)"
+
+    def _entries(self, user):
+        cursor = 0
+        while cursor is not None:
+            page = self._download_json(f"{_base()}/tt/user/{user}", user, note=False, query={"cursor": cursor})
+            for vid in page["ids"]:
+                yield self.url_result(f"https://www.tiktok.com/@{user}/video/{vid}", BenchTikTokVideoIE, vid)
+            cursor = page.get("next")
+
+    def _real_extract(self, url):
+        user = self._match_id(url)
+        return self.playlist_result(self._entries(user), user, user)
+
+
+class BenchYoutubeIE(InfoExtractor):
+    IE_NAME = "bench:youtube"
+    _VALID_URL = r"https?://(?:www\.)?youtube\.com/watch\?v=(?P<id>[\w-]{11})"
+
+    def _real_extract(self, url):
+        vid = self._match_id(url)
+        info = self._download_json(f"{_base()}/ytv/{vid}", vid, note=False)
+        return {**info, "formats": [{"format_id": "18", "url": f"{_base()}/cdn/yt/{vid}.mp4", "ext": "mp4",
+                                     "width": 640, "height": 360, "vcodec": "avc1", "acodec": "mp4a"}]}
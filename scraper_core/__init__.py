@@ -0,0 +1,50 @@
+# scraper_core/__init__.py
+# Inti scraper tanpa Streamlit: bisa dipakai dari worker, cron, atau CLI (python -m scraper_core).
+#
+# Modul per platform:
+#   scraper_core.instagram  → scrape_posts_range, login_with_cookies, session_pool (sesi hangat), ekspor CSV/Excel
+#   scraper_core.tiktok     → fetch_user_videos, build_dataframe, make_excel_with_images
+#   scraper_core.youtube    → scrape_channel_rows (scrapetube + ytdlp_fetch), create_excel_with_images
+#   scraper_core.records    → PostRecord (satu tipe baris untuk semua platform), records_to_frame
+#   scraper_core.x          → harvest_tweets (HarvestRun: tail CSV → postfilter_wib), export_excel_5cols
+#   scraper_core.store      → ResultStore (SQLite lokal, upsert per ID post, query rentang tanggal per akun)
+#   scraper_core.jobs       → run_batch (banyak akun lintas platform, konkurensi per platform, summary.json)
+#   scraper_core.metrics    → collect/span (waktu, request, byte, retry per tahap), ekspor JSON/Prometheus
+#   scraper_core.journal    → open_journal (checkpoint NDJSON rows + cursor paginasi, resume run yang terputus)
+
+import importlib
+
+# Nama publik → submodul. Import submodul ditunda sampai nama itu dipakai,
+# supaya `import scraper_core` tidak ikut memuat instaloader/yt-dlp/scrapetube.
+_EXPORTS = {
+    "scrape_posts_range": "instagram",
+    "login_with_cookies": "instagram",
+    "sync_posts": "instagram",
+    "session_pool": "instagram",
+    "fetch_user_videos": "tiktok",
+    "build_dataframe": "tiktok",
+    "scrape_channel_rows": "youtube",
+    "ytdlp_fetch": "youtube",
+    "harvest_tweets": "x",
+    "run_tweet_harvest": "x",
+    "HarvestRun": "x",
+    "postfilter_wib": "x",
+    "PostRecord": "records",
+    "records_to_frame": "records",
+    "ResultStore": "store",
+    "default_store": "store",
+    "load_targets": "jobs",
+    "run_batch": "jobs",
+    "RunMetrics": "metrics",
+    "collect": "metrics",
+    "span": "metrics",
+    "open_journal": "journal",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    sub = _EXPORTS.get(name)
+    if sub is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f"{__name__}.{sub}"), name)
@@ -0,0 +1,3 @@
+from scraper_core.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# scraper_core/cli.py
+# CLI batch tanpa Streamlit:
+#   python -m scraper_core instagram bpskabupatenpasuruan --cookies cookies.json -o ig.xlsx
+#   python -m scraper_core tiktok viralkan.id --limit 60 -o tt.csv
+#   python -m scraper_core youtube https://www.youtube.com/@NamaChannel --start 2025-01-01 -o yt.xlsx
+#   python -m scraper_core x username --start 2025-01-01 --end 2025-01-31 -o tweets.xlsx
+# Format output ditentukan dari ekstensi file (.csv / .xlsx / .parquet / .arrow).
+# --dataset DIR → hasil juga di-merge ke dataset Parquet terpartisi platform/account/month.
+# --store → hasil di-upsert ke store SQLite lokal; --from-store → ekspor dari store tanpa jaringan.
+# Run Instagram/TikTok/YouTube yang terputus dilanjutkan dari checkpoint jurnal (scraper_core.journal); --fresh → dari awal.
+# Banyak akun sekaligus (scraper_core.jobs):
+#   python -m scraper_core batch targets.json --out-dir runs/2025-01-31 --concurrency tiktok=3 --deadline 90
+
+import argparse
+import os
+import sys
+from datetime import datetime, date
+
+def _parse_day(s: str) -> date:
+    try:
+        return datetime.strptime(s, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tanggal harus YYYY-MM-DD: {s!r}")
+
+# Mode batch: progress per baris (\r) dimatikan karena banyak target jalan bersamaan
+_quiet = False
+
+def set_quiet(quiet: bool):
+    global _quiet
+    _quiet = bool(quiet)
+
+def _progress(label: str):
+    if _quiet:
+        return None
+    def cb(i, n):
+        print(f"\r{label}… {i}/{n}", end="", file=sys.stderr, flush=True)
+        if i >= n:
+            print(file=sys.stderr)
+    return cb
+
+def _output_kind(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in (".csv", ".xlsx", ".parquet", ".arrow"):
+        raise SystemExit(f"Ekstensi output tidak didukung: {ext or '(kosong)'} (pakai .csv, .xlsx, .parquet atau .arrow)")
+    return ext[1:]
+
+def _columnar(args, legacy_df, platform: str, account: str) -> bool:
+    """Tulis .parquet/.arrow dan/atau merge ke --dataset dari frame kolom lama. True kalau output sudah ditulis."""
+    kind = _output_kind(args.output)
+    if kind not in ("parquet", "arrow") and not args.dataset:
+        return False
+    from scraper_core.records import legacy_to_frame
+    from scraper_core import columnar
+    unified = legacy_to_frame(legacy_df, platform, account)
+    if args.dataset:
+        parts = columnar.write_partitioned(unified, args.dataset)
+        print(f"Dataset: {len(parts)} partisi diperbarui di {args.dataset}", file=sys.stderr)
+    if kind == "parquet":
+        _write_bytes(args.output, columnar.to_parquet_bytes(unified))
+    elif kind == "arrow":
+        _write_bytes(args.output, columnar.to_arrow_bytes(unified))
+    else:
+        return False
+    return True
+
+def _from_store(args, platform: str, account: str):
+    """--from-store: frame kolom lama dari store lokal (tanpa jaringan)."""
+    from scraper_core.store import load_legacy
+    use_dates = bool(args.start or args.end)
+    df = load_legacy(platform, account, args.start, args.end, limit=None if use_dates else args.limit)
+    print(f"Store lokal: {len(df)} baris {platform}/{account}", file=sys.stderr)
+    return df
+
+def _to_store(args, legacy_df, platform: str, account: str):
+    """--store: upsert hasil scrape ke store lokal (key = ID post)."""
+    if not args.store:
+        return
+    from scraper_core.store import save_legacy
+    n = save_legacy(legacy_df, platform, account)
+    print(f"Store lokal: {n} baris di-upsert", file=sys.stderr)
+
+def _journal(args, platform: str, account: str, **params):
+    """Jurnal checkpoint run ini (scraper_core.journal); --fresh → buang checkpoint lama."""
+    from scraper_core.journal import open_journal
+    journal = open_journal(platform, account, fresh=args.fresh, **params)
+    if journal is not None and journal.resumed:
+        print(f"Melanjutkan dari checkpoint: {len(journal.rows)} baris sudah ada ({journal.path})", file=sys.stderr)
+    return journal
+
+def _write_bytes(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+# ================== Per platform ==================
+def run_instagram(args) -> int:
+    from scraper_core.instagram import (
+        load_cookies_any_from_text, session_pool, scrape_posts_range, sync_posts,
+        rows_to_csv_bytes, rows_to_excel_with_images, IG_COLUMNS,
+    )
+    from scraper_core.xlsx import copy_to_path
+    import pandas as pd
+    account = args.target.lstrip("@")
+    if args.from_store:
+        rows = _from_store(args, "instagram", account).to_dict("records")
+    else:
+        if not args.cookies:
+            raise SystemExit("--cookies wajib untuk scrape Instagram (atau pakai --from-store).")
+        with open(args.cookies, encoding="utf-8") as f:
+            cookies = load_cookies_any_from_text(f.read())
+        # Pool sesi: target berikutnya dengan cookies sama (batch) memakai sesi hangat ini tanpa warm-up ulang
+        with session_pool().session(cookies) as ps:
+            me = ps.username
+            if not ps.reused:
+                print(f"Login sebagai @{me}" if me else "Peringatan: cookies terpasang tapi tidak terdeteksi login aktif.",
+                      file=sys.stderr)
+
+            use_dates = bool(args.start or args.end)
+            limit = None if use_dates else args.limit
+            scrape = sync_posts if args.incremental else scrape_posts_range
+            rows = scrape(
+                ps.L,
+                target_username=account,
+                limit=limit,
+                d1=args.start,
+                d2=args.end,
+                album_all=not args.first_image_only,
+                journal=_journal(args, "instagram", account, limit=limit, start=args.start, end=args.end,
+                                 album_all=not args.first_image_only, incremental=args.incremental),
+            )
+        _to_store(args, pd.DataFrame(rows, columns=IG_COLUMNS), "instagram", account)
+    if _columnar(args, pd.DataFrame(rows, columns=IG_COLUMNS), "instagram", account):
+        return len(rows)
+    if _output_kind(args.output) == "csv":
+        _write_bytes(args.output, rows_to_csv_bytes(rows))
+    else:
+        copy_to_path(rows_to_excel_with_images(rows, on_progress=_progress("Gambar"),
+                                               workers=args.image_workers), args.output)
+    return len(rows)
+
+def run_tiktok(args) -> int:
+    from scraper_core.tiktok import (
+        fetch_user_videos_parallel, build_dataframe, apply_date_filter,
+        iter_preview_images, make_excel_with_images, write_netscape_from_json,
+    )
+    from scraper_core.xlsx import copy_to_path
+    account = args.target.lstrip("@")
+    cookie_path, cookie_json_bytes = None, None
+    if args.cookies:
+        if args.cookies.lower().endswith(".json"):
+            with open(args.cookies, "rb") as f:
+                cookie_json_bytes = f.read()
+            cookie_path = write_netscape_from_json(cookie_json_bytes)
+        else:
+            cookie_path = args.cookies
+
+    if args.from_store:
+        df = _from_store(args, "tiktok", account)
+    else:
+        entries, errors = fetch_user_videos_parallel(account, args.limit, cookie_path,
+                                                     workers=args.workers, on_progress=_progress("Video"),
+                                                     journal=_journal(args, "tiktok", account, limit=args.limit))
+        for err in errors:
+            print(f"Gagal #{err['index']}: {err['url']} — {err['error']}", file=sys.stderr)
+        df = build_dataframe(entries)
+        _to_store(args, df, "tiktok", account)
+        if args.start and args.end:
+            df = apply_date_filter(df, args.start, args.end)
+
+    if _columnar(args, df, "tiktok", account):
+        return len(df)
+    if _output_kind(args.output) == "csv":
+        _write_bytes(args.output, df.to_csv(index=False).encode("utf-8"))
+    else:
+        imgs = iter_preview_images(df, cookie_json_bytes, workers=args.image_workers,
+                                   on_progress=_progress("Gambar"))
+        copy_to_path(make_excel_with_images(df, preloaded_images=imgs), args.output)
+    return len(df)
+
+def run_youtube(args) -> int:
+    from scraper_core.youtube import (
+        YTDLP_AVAILABLE, scrape_channel_rows, rows_to_frame, create_excel_with_images,
+    )
+    from scraper_core.xlsx import copy_to_path
+    if args.from_store:
+        df = _from_store(args, "youtube", args.target)
+    else:
+        if (args.start or args.end) and not YTDLP_AVAILABLE:
+            raise SystemExit("Filter tanggal memerlukan yt-dlp: pip install yt-dlp")
+        rows = scrape_channel_rows(
+            args.target, args.limit, args.start, args.end,
+            enrich=not args.no_enrich, on_progress=_progress("Memproses video"),
+            workers=args.workers,
+            stop_after_older=args.stop_after_older,
+            journal=_journal(args, "youtube", args.target, limit=args.limit, start=args.start, end=args.end,
+                             enrich=not args.no_enrich, stop_after_older=args.stop_after_older),
+        )
+        df = rows_to_frame(rows)
+        _to_store(args, df, "youtube", args.target)
+    # hasil kosong tetap menulis file (header/skema saja) → path output yang dilaporkan selalu ada
+    if _columnar(args, df, "youtube", args.target):
+        return len(df)
+    if _output_kind(args.output) == "csv":
+        _write_bytes(args.output, df.to_csv(index=False).encode("utf-8-sig"))
+    else:
+        copy_to_path(create_excel_with_images(df, img_col="thumbnail_url", max_img_width=160,
+                                              workers=args.image_workers,
+                                              on_progress=_progress("Gambar")), args.output)
+    return len(df)
+
+def _harvest_status(run):
+    for line in run.poll():
+        print(line, file=sys.stderr)
+    goal = f"/{run.target_rows}" if run.target_rows else ""
+    print(f"\rTweet lolos filter… {run.rows_so_far}{goal} (mentah {run.raw_rows})", end="",
+          file=sys.stderr, flush=True)
+    if run.done:
+        print(file=sys.stderr)
+
+def run_x(args) -> int:
+    from scraper_core.x import harvest_tweets, export_excel_5cols, HarvestError
+    from scraper_core.xlsx import copy_to_path
+    account = args.target.lstrip("@")
+    if args.from_store:
+        mini = _from_store(args, "x", account)
+    else:
+        token = args.token or os.getenv("AUTH_TOKEN", "")
+        if not token:
+            raise SystemExit("auth_token kosong (isi --token atau ENV AUTH_TOKEN).")
+        end_d = args.end or date.today()
+        start_d = args.start or end_d
+        try:
+            mini, logs, csv_path = harvest_tweets(
+                account, start_d.strftime("%Y-%m-%d"), end_d.strftime("%Y-%m-%d"),
+                args.limit, token,
+                only_original=not args.include_replies,
+                exclude_quote=not args.include_quote,
+                require_media=args.require_media,
+                target_rows=args.target_rows,
+                on_update=None if _quiet else _harvest_status,
+            )
+        except HarvestError as e:
+            print(e.logs, file=sys.stderr)
+            raise SystemExit(str(e))
+        print(f"CSV mentah: {csv_path}", file=sys.stderr)
+        _to_store(args, mini, "x", account)
+
+    if _columnar(args, mini, "x", account):
+        return len(mini)
+    if _output_kind(args.output) == "csv":
+        _write_bytes(args.output, mini.to_csv(index=False).encode("utf-8"))
+    else:
+        out = export_excel_5cols(
+            mini=mini,
+            username=account,
+            keep_full_image_in_excel=False,
+            save_originals_to_disk=args.save_originals,
+            on_progress=_progress("Gambar"),
+            workers=args.image_workers,
+        )
+        copy_to_path(out, args.output)
+    return len(mini)
+
+def run_batch(args) -> int:
+    from scraper_core.jobs import load_targets, parse_limits, print_result, run_batch as _run
+    try:
+        targets = load_targets(args.targets)
+        limits = parse_limits(args.concurrency)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"Daftar target tidak valid: {e}")
+    print(f"Batch: {len(targets)} target → {args.out_dir}", file=sys.stderr)
+    summary = _run(
+        targets, args.out_dir, limits=limits,
+        deadline_s=args.deadline * 60 if args.deadline else None,
+        retries=args.retries, dataset=args.dataset, on_result=print_result,
+    )
+    for p, st in sorted(summary["platforms"].items()):
+        print(f"{p:<9} ok {st['ok']}/{st['targets']}, gagal {st['failed']}, dilewati {st['skipped']}, "
+              f"{st['rows']} baris ({st['rows_per_sec']} baris/detik)", file=sys.stderr)
+    print(f"Total {summary['rows']} baris dalam {summary['wall_seconds']:.0f}s; "
+          f"gagal {summary['failed']}, dilewati {summary['skipped']}", file=sys.stderr)
+    args.output = os.path.join(args.out_dir, "summary.json")
+    return summary["rows"]
+
+# ================== Argparse ==================
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m scraper_core",
+                                description="Scraper Instagram / TikTok / YouTube / X tanpa Streamlit.")
+    sub = p.add_subparsers(dest="platform", required=True)
+
+    def common(sp, default_limit):
+        sp.add_argument("target", help="username / handle / URL channel")
+        sp.add_argument("-o", "--output", required=True, help="file output (.csv, .xlsx, .parquet atau .arrow)")
+        sp.add_argument("--dataset", default=None, metavar="DIR",
+                        help="merge hasil ke dataset Parquet terpartisi platform/account/month di DIR")
+        sp.add_argument("--limit", type=int, default=default_limit)
+        sp.add_argument("--start", type=_parse_day, default=None, help="YYYY-MM-DD (inklusif)")
+        sp.add_argument("--end", type=_parse_day, default=None, help="YYYY-MM-DD (inklusif)")
+        sp.add_argument("--store", action="store_true",
+                        help="upsert hasil ke store SQLite lokal (ENV SCRAPER_STORE, default .cache/results.sqlite3)")
+        sp.add_argument("--from-store", action="store_true",
+                        help="ambil data dari store lokal saja (tanpa jaringan), lalu ekspor seperti biasa")
+        sp.add_argument("--image-workers", type=int, default=None,
+                        help="unduhan gambar paralel untuk .xlsx (default: ENV SCRAPER_IMAGE_WORKERS atau 8)")
+        sp.add_argument("--metrics", default=None, metavar="FILE",
+                        help="simpan metrik per tahap (waktu, request, byte, retry): .json atau .prom (Prometheus)")
+        sp.add_argument("--fresh", action="store_true",
+                        help="instagram/tiktok/youtube: abaikan checkpoint run yang terputus (ENV SCRAPER_JOURNAL_DIR), mulai dari awal")
+
+    ig = sub.add_parser("instagram", help="scrape_posts_range via instaloader")
+    common(ig, 100)
+    ig.add_argument("--cookies", default=None, help="cookies JSON (minimal sessionid & csrftoken); wajib kecuali --from-store")
+    ig.add_argument("--first-image-only", action="store_true", help="ambil gambar pertama album saja")
+    ig.add_argument("--incremental", action="store_true",
+                    help="hanya post baru sejak sync terakhir (state di ENV SCRAPER_IG_SYNC_DIR atau .cache/ig_sync)")
+    ig.set_defaults(func=run_instagram)
+
+    tt = sub.add_parser("tiktok", help="fetch_user_videos via yt-dlp")
+    common(tt, 60)
+    tt.add_argument("--cookies", default=None, help="cookies .json (extension) atau .txt (Netscape)")
+    tt.add_argument("--workers", type=int, default=None,
+                    help="ekstraksi video paralel (default: ENV SCRAPER_TIKTOK_WORKERS atau 4)")
+    tt.set_defaults(func=run_tiktok)
+
+    yt = sub.add_parser("youtube", help="scrapetube + ytdlp_fetch")
+    common(yt, 50)
+    yt.add_argument("--no-enrich", action="store_true", help="lewati deskripsi & like_count (yt-dlp)")
+    yt.add_argument("--workers", type=int, default=None,
+                    help="panggilan yt-dlp paralel (default: ENV SCRAPER_YTDLP_WORKERS atau 4)")
+    yt.add_argument("--stop-after-older", type=int, default=5,
+                    help="dengan --start: berhenti setelah N video berturut-turut lebih tua (0 = tidak berhenti)")
+    yt.set_defaults(func=run_youtube)
+
+    xp = sub.add_parser("x", help="run_tweet_harvest → postfilter_wib")
+    common(xp, 200)
+    xp.add_argument("--token", default=None, help="auth_token (default: ENV AUTH_TOKEN)")
+    xp.add_argument("--include-replies", action="store_true", help="jangan buang replies & retweets")
+    xp.add_argument("--include-quote", action="store_true", help="jangan buang quote tweets")
+    xp.add_argument("--require-media", action="store_true", help="hanya tweet yang ada gambar")
+    xp.add_argument("--target-rows", type=int, default=None,
+                    help="hentikan tweet-harvest begitu N baris lolos filter")
+    xp.add_argument("--save-originals", action="store_true", help="simpan gambar original ke tweets-data/images")
+    xp.set_defaults(func=run_x)
+
+    bp = sub.add_parser("batch", help="banyak target lintas platform dari satu daftar (scraper_core.jobs)")
+    bp.add_argument("targets", help="daftar target .json / .jsonl / .csv")
+    bp.add_argument("--out-dir", required=True, help="folder hasil: <platform>/<akun>.<format> + summary.json")
+    bp.add_argument("--concurrency", action="append", default=None, metavar="PLATFORM=N",
+                    help="batas paralel per platform, boleh diulang (default: instagram=1,tiktok=2,youtube=2,x=1)")
+    bp.add_argument("--deadline", type=float, default=None, metavar="MENIT",
+                    help="target yang belum mulai setelah sekian menit dilewati")
+    bp.add_argument("--retries", type=int, default=1, help="ulangi target yang gagal sebanyak N kali")
+    bp.add_argument("--dataset", default=None, metavar="DIR",
+                    help="merge semua hasil ke dataset Parquet terpartisi di DIR")
+    bp.set_defaults(func=run_batch)
+    return p
+
+def _print_metrics(run):
+    tot = run.totals()
+    top = run.table()[:3]
+    print(f"Metrik: {run.wall_seconds:.1f}s, {tot['requests']} request, {tot['bytes'] / 1e6:.1f} MB, "
+          f"{tot['retries']} retry" + (" — terlama: " + ", ".join(f"{r['tahap']} {r['detik']:.1f}s" for r in top)
+                                       if top else ""), file=sys.stderr)
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.platform in ("x", "batch"):
+        from dotenv import load_dotenv
+        load_dotenv()
+    if args.platform == "batch":   # metrik per target masuk summary.json
+        n = args.func(args)
+    else:
+        from scraper_core.metrics import collect
+        with collect(args.platform, args.target) as run:
+            n = args.func(args)
+        if args.metrics:
+            run.write(args.metrics)
+        _print_metrics(run)
+    print(f"Selesai: {n} baris → {args.output}", file=sys.stderr)
+    if "scraper_core.thumbcache" in sys.modules:
+        from scraper_core.thumbcache import default_cache
+        cache = default_cache()
+        if cache is not None:
+            st = cache.stats()
+            print(f"Cache gambar: {st['hits']} hit / {st['misses']} miss, "
+                  f"{st['bytes'] / 1e6:.1f}/{st['max_bytes'] / 1e6:.0f} MB", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+# scraper_core/columnar.py
+# Ekspor kolumnar (Parquet terkompresi + Arrow IPC) dari frame terpadu (scraper_core.records).
+# Tipe kolom tetap: posted_at = timestamp UTC, angka = int64, sisanya string.
+# Opsional: dataset terpartisi  <root>/platform=<p>/account=<a>/month=<YYYY-MM WIB>/part-0.parquet
+# (nilai partisi di-URL-encode: akun YouTube = URL channel; pyarrow men-decode lagi saat baca)
+# (per bulan, bukan per hari: akun aktif 2 tahun = 24 file, bukan ratusan file kecil)
+#
+# pyarrow opsional: kalau belum terpasang, fungsi di sini raise RuntimeError dengan petunjuk install.
+
+import importlib.util
+import io
+import os
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+from urllib.parse import quote
+
+import pandas as pd
+
+from scraper_core.records import INT_COLUMNS, RECORD_COLUMNS
+
+COMPRESSION = os.getenv("SCRAPER_PARQUET_COMPRESSION", "zstd")
+PARTITION_COLS = ["platform", "account", "month"]
+KEY_COLS = ["platform", "post_id", "item"]
+WIB = "Asia/Jakarta"
+
+# Merge partisi = baca-gabung-tulis; serialkan antar-thread (mis. batch runner) supaya tidak saling timpa
+_WRITE_LOCK = threading.Lock()
+
+# Cukup cek terpasang (tanpa import): pyarrow baru dimuat saat ekspor/baca pertama lewat _pa()
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+def _pa():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.ipc as ipc
+        import pyarrow.parquet as pq
+    except Exception:
+        raise RuntimeError("Untuk ekspor Parquet/Arrow, install dulu: pip install pyarrow")
+    return pa, pq, ipc, ds
+
+def _schema(frame: pd.DataFrame):
+    pa = _pa()[0]
+    fields = []
+    for c in frame.columns:
+        if c == "posted_at":
+            fields.append(pa.field(c, pa.timestamp("us", tz="UTC")))
+        elif c in INT_COLUMNS:
+            fields.append(pa.field(c, pa.int64()))
+        else:
+            fields.append(pa.field(c, pa.string()))
+    return pa.schema(fields)
+
+def to_table(frame: pd.DataFrame):
+    """Frame terpadu → pyarrow.Table dengan skema tetap (kolom extra ikut sebagai string)."""
+    pa = _pa()[0]
+    frame = frame.copy()
+    for c in frame.columns:
+        if c not in RECORD_COLUMNS or (c not in INT_COLUMNS and c != "posted_at"):
+            frame[c] = frame[c].map(lambda v: None if v is None or (isinstance(v, float) and v != v) else str(v))
+    return pa.Table.from_pandas(frame, schema=_schema(frame), preserve_index=False)
+
+def to_parquet_bytes(frame: pd.DataFrame, compression: str = COMPRESSION) -> bytes:
+    _, pq, _, _ = _pa()
+    buf = io.BytesIO()
+    pq.write_table(to_table(frame), buf, compression=compression)
+    return buf.getvalue()
+
+def to_arrow_bytes(frame: pd.DataFrame, compression: Optional[str] = COMPRESSION) -> bytes:
+    """Arrow IPC (format file / Feather v2), dibaca cepat lewat pyarrow.ipc.open_file atau pd.read_feather."""
+    pa, _, ipc, _ = _pa()
+    table = to_table(frame)
+    sink = io.BytesIO()
+    opts = ipc.IpcWriteOptions(compression=compression) if compression else None
+    with ipc.new_file(sink, table.schema, options=opts) as w:
+        w.write_table(table)
+    return sink.getvalue()
+
+# ================== Dataset terpartisi ==================
+def _with_partition_cols(frame: pd.DataFrame) -> pd.DataFrame:
+    out = frame.copy()
+    out["month"] = out["posted_at"].dt.tz_convert(WIB).dt.strftime("%Y-%m").fillna("unknown")
+    out["account"] = out["account"].fillna("").replace("", "_")
+    return out
+
+def _segment(col: str, value) -> str:
+    """Satu level direktori hive. Nilai di-URL-encode ("/" dan ":" di URL channel tidak memecah path);
+    read_partitioned memakai segment_encoding="uri" → kolom partisi kembali ke nilai aslinya."""
+    return f"{col}={quote(str(value), safe='')}"
+
+def write_partitioned(frame: pd.DataFrame, root: str, compression: str = COMPRESSION) -> List[str]:
+    """
+    Tulis/merge ke dataset Parquet terpartisi platform/account/month (WIB). Partisi yang tersentuh
+    dibaca dulu lalu digabung (key platform+post_id+item, baris baru menang) → aman untuk run berulang
+    / sync inkremental. Return daftar direktori partisi yang ditulis.
+    """
+    pa, pq, _, ds = _pa()
+    if frame is None or frame.empty:
+        return []
+    new = _with_partition_cols(frame)
+    written = []
+    with _WRITE_LOCK:
+        for key, part in new.groupby(PARTITION_COLS, sort=False):
+            sub = os.path.join(root, *[_segment(c, v) for c, v in zip(PARTITION_COLS, key)])
+            part = part.drop(columns=["month"])
+            if os.path.isdir(sub):
+                old = ds.dataset(sub, format="parquet").to_table().to_pandas()
+                part = pd.concat([old, part], ignore_index=True)
+                part = part.drop_duplicates(KEY_COLS, keep="last")
+            part = part.sort_values("posted_at", ascending=False, na_position="last")
+            os.makedirs(sub, exist_ok=True)
+            tmp = os.path.join(sub, f".tmp-{uuid.uuid4().hex}.parquet")
+            pq.write_table(to_table(part.reset_index(drop=True)), tmp, compression=compression)
+            for fn in os.listdir(sub):
+                if fn.endswith(".parquet") and not fn.startswith(".tmp"):
+                    os.remove(os.path.join(sub, fn))
+            os.replace(tmp, os.path.join(sub, "part-0.parquet"))
+            written.append(sub)
+    return written
+
+def read_partitioned(root: str, platform: Optional[str] = None, account: Optional[str] = None,
+                     start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+    """
+    Baca dataset terpartisi. platform/account/bulan dipangkas di level partisi (file lain tidak dibuka),
+    rentang tanggal (WIB, inklusif) difilter di posted_at.
+    """
+    pa, _, _, ds = _pa()
+    part = ds.HivePartitioning(pa.schema([(c, pa.string()) for c in PARTITION_COLS]), segment_encoding="uri")
+    dataset = ds.dataset(root, format="parquet", partitioning=part)
+    conds = []
+    if platform:
+        conds.append(ds.field("platform") == platform)
+    if account:
+        conds.append(ds.field("account") == account)
+    if start:
+        lo = pd.Timestamp(datetime.combine(start, time.min)).tz_localize(WIB).tz_convert("UTC")
+        conds.append(ds.field("month") >= start.strftime("%Y-%m"))
+        conds.append(ds.field("posted_at") >= pa.scalar(lo.to_pydatetime(), pa.timestamp("us", tz="UTC")))
+    if end:
+        hi = pd.Timestamp(datetime.combine(end + timedelta(days=1), time.min)).tz_localize(WIB).tz_convert("UTC")
+        conds.append(ds.field("month") <= end.strftime("%Y-%m"))
+        conds.append(ds.field("posted_at") < pa.scalar(hi.to_pydatetime(), pa.timestamp("us", tz="UTC")))
+    flt = None
+    for c in conds:
+        flt = c if flt is None else (flt & c)
+    df = dataset.to_table(filter=flt).to_pandas()
+    return df.drop(columns=["month"], errors="ignore")
@@ -0,0 +1,47 @@
+# scraper_core/concurrency.py
+# Helper worker pool: map paralel yang tetap urut & menarik input secara malas.
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Callable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def ordered_map(fn: Callable[[T], R], items: Iterable[T], workers: int,
+                max_pending: Optional[int] = None, thread_name_prefix: str = "worker") -> Iterator[Tuple[T, R]]:
+    """
+    Jalankan fn(item) di pool berukuran `workers`, yield (item, hasil) sesuai urutan input.
+    Input ditarik seperlunya (maks. `max_pending` tugas di udara, default workers*2),
+    jadi iterator sumber (mis. paginasi) tetap jalan bersamaan dengan pekerjaan di pool.
+    Kalau konsumen berhenti lebih awal (break / close), tugas yang belum mulai dibatalkan.
+    Exception dari fn diteruskan saat hasil item itu diambil.
+    Tiap tugas jalan di salinan contextvars pemanggil (run metrik aktif ikut ke thread worker).
+    """
+    workers = max(1, int(workers))
+    if workers == 1:
+        for item in items:
+            yield item, fn(item)
+        return
+
+    max_pending = max(workers, int(max_pending or workers * 2))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix)
+    pending = deque()
+    it = iter(items)
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    item = next(it)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.append((item, pool.submit(contextvars.copy_context().run, fn, item)))
+            if not pending:
+                break
+            item, fut = pending.popleft()
+            yield item, fut.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
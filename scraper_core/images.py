@@ -0,0 +1,297 @@
+# scraper_core/images.py
+# Tahap unduh + resize gambar bersama untuk semua eksportir (Excel & preview).
+# Unduhan jalan paralel (dibatasi `workers`), hasil selalu urut sesuai baris input.
+
+import contextvars
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import requests
+
+from scraper_core.concurrency import ordered_map
+from scraper_core.metrics import span
+from scraper_core.ratelimit import mount as mount_rate_limit
+from scraper_core.thumbcache import ThumbnailCache, default_cache, static_cache, static_url
+
+# Default jumlah unduhan paralel; bisa diubah lewat ENV tanpa ubah kode
+IMAGE_WORKERS = int(os.getenv("SCRAPER_IMAGE_WORKERS", "8"))
+# Gambar bersifat opsional: kalau host/platform dijeda lebih lama dari ini, sel gambar dibiarkan kosong
+IMAGE_MAX_WAIT = 60.0
+# Sisi terpanjang thumbnail preview dashboard (JPEG di static/thumbs)
+PREVIEW_THUMB_PX = int(os.getenv("SCRAPER_PREVIEW_THUMB_PX", "320"))
+
+_local = threading.local()
+
+def _session() -> requests.Session:
+    """Satu Session per thread (keep-alive, tanpa berbagi state antar thread); laju dibatasi per host."""
+    s = getattr(_local, "session", None)
+    if s is None:
+        s = mount_rate_limit(requests.Session(), max_wait=IMAGE_MAX_WAIT)
+        _local.session = s
+    return s
+
+# ================== Transform (bytes mentah → PNG) ==================
+# Tiap transform punya atribut `.variant` (nama varian di cache disk).
+# Pillow di-import saat transform pertama jalan, bukan saat modul dimuat.
+def _open(raw: bytes):
+    from PIL import Image as PILImage
+    return PILImage.open(io.BytesIO(raw))
+
+def _to_rgb(img):
+    """Komposit alpha → putih, mode lain → RGB."""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        from PIL import Image as PILImage
+        bg = PILImage.new("RGB", img.size, (255, 255, 255))
+        bg.paste(img, mask=img.split()[3])
+        return bg
+    if img.mode != "RGB":
+        return img.convert("RGB")
+    return img
+
+def _png_bytes(img) -> bytes:
+    bio = io.BytesIO()
+    img.save(bio, format="PNG")
+    return bio.getvalue()
+
+def png_thumbnail(max_w: int, max_h: int) -> Callable[[bytes], bytes]:
+    """Perkecil proporsional agar muat di kotak max_w × max_h."""
+    def _t(raw: bytes) -> bytes:
+        img = _to_rgb(_open(raw))
+        img.thumbnail((max_w, max_h))
+        return _png_bytes(img)
+    _t.variant = f"thumb{max_w}x{max_h}"
+    return _t
+
+def png_fit_width(width: int, upscale: bool = False) -> Callable[[bytes], bytes]:
+    """Skala proporsional ke lebar `width` (upscale=False → hanya diperkecil)."""
+    def _t(raw: bytes) -> bytes:
+        img = _to_rgb(_open(raw))
+        w0, h0 = img.size
+        if w0 > 0 and width and (upscale or w0 > width):
+            scale = width / float(w0)
+            img = img.resize((int(w0 * scale), int(h0 * scale)))
+        return _png_bytes(img)
+    _t.variant = f"w{width}{'up' if upscale else ''}"
+    return _t
+
+def png_full() -> Callable[[bytes], bytes]:
+    """Resolusi asli, hanya dikonversi ke PNG RGB."""
+    def _t(raw: bytes) -> bytes:
+        return _png_bytes(_to_rgb(_open(raw)))
+    _t.variant = "fullpng"
+    return _t
+
+def jpeg_thumbnail(max_w: int, max_h: int, quality: int = 80) -> Callable[[bytes], bytes]:
+    """Perkecil proporsional ke kotak max_w × max_h → JPEG (untuk preview di browser, bukan Excel)."""
+    def _t(raw: bytes) -> bytes:
+        img = _to_rgb(_open(raw))
+        img.thumbnail((max_w, max_h))
+        bio = io.BytesIO()
+        img.save(bio, format="JPEG", quality=quality, optimize=True)
+        return bio.getvalue()
+    _t.variant = f"jpg{max_w}x{max_h}q{quality}"
+    return _t
+
+def image_size(img_bytes: bytes) -> Tuple[int, int]:
+    """(lebar, tinggi) tanpa decode pixel penuh."""
+    with _open(img_bytes) as im:
+        return im.size
+
+# ================== Fetch paralel ==================
+def _fetch_one(url: str, timeout: float, headers: Optional[Dict[str, str]],
+               cookies: Optional[Dict[str, str]], transform: Optional[Callable[[bytes], bytes]],
+               on_raw: Optional[Callable[[str, bytes], None]],
+               cache: Optional[ThumbnailCache]) -> Optional[bytes]:
+    # Varian hasil transform hanya di-cache kalau transform punya nama varian
+    variant = getattr(transform, "variant", None) if transform else None
+    try:
+        # 1) varian jadi sudah ada → tanpa request & tanpa resize
+        #    (dilewati kalau butuh bytes mentah untuk on_raw)
+        if cache is not None and variant and not on_raw:
+            hit = cache.get(url, variant)
+            if hit is not None:
+                return hit
+        # 2) original dari cache, kalau tidak ada baru unduh
+        raw = None
+        if cache is not None:
+            raw = cache.get(url, "orig", count=not (variant and not on_raw))
+        if raw is None:
+            with span("image_download"):
+                resp = _session().get(url, headers=headers, cookies=cookies, timeout=timeout)
+                resp.raise_for_status()
+                raw = resp.content
+            if cache is not None:
+                cache.put(url, raw, "orig")
+        if on_raw:
+            on_raw(url, raw)
+        if not transform:
+            return raw
+        out = cache.get(url, variant, count=False) if (cache is not None and variant and on_raw) else None
+        if out is None:
+            with span("image_resize"):
+                out = transform(raw)
+            if cache is not None and variant:
+                cache.put(url, out, variant)
+        return out
+    except Exception:
+        return None
+
+def fetch_images(
+    urls: Sequence[Optional[str]],
+    transform: Optional[Callable[[bytes], bytes]] = None,
+    workers: Optional[int] = None,
+    timeout: float = 20,
+    headers: Optional[Dict[str, str]] = None,
+    cookies: Optional[Dict[str, str]] = None,
+    referers: Optional[Sequence[Optional[str]]] = None,
+    on_raw: Optional[Callable[[str, bytes], None]] = None,
+    on_progress=None,
+    use_cache: bool = True,
+    cache: Optional[ThumbnailCache] = None,
+) -> List[Optional[bytes]]:
+    """
+    Unduh (dan transform) gambar secara paralel. Return list sepanjang `urls`,
+    urut sesuai input; None untuk URL kosong / gagal diunduh / gagal diproses.
+    URL yang sama (dengan referer yang sama) hanya diunduh sekali.
+    on_raw(url, bytes_mentah) dipanggil di thread worker sebelum transform (mis. simpan original).
+    on_progress(selesai, total) dipanggil dari thread pemanggil.
+    use_cache=True → original & varian disimpan/diambil dari cache disk (default_cache() bila cache=None).
+    """
+    if use_cache and cache is None:
+        cache = default_cache()
+    elif not use_cache:
+        cache = None
+    keys: List[Optional[Tuple[str, Optional[str]]]] = []
+    for i, u in enumerate(urls):
+        if isinstance(u, str) and u.startswith("http"):
+            keys.append((u, referers[i] if referers else None))
+        else:
+            keys.append(None)
+    unique = list(dict.fromkeys(k for k in keys if k is not None))
+    results: Dict[Tuple[str, Optional[str]], Optional[bytes]] = {}
+    total = len(unique)
+    if total:
+        n_workers = max(1, min(int(workers or IMAGE_WORKERS), total))
+        with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="img") as pool:
+            futs = {}
+            for key in unique:
+                url, ref = key
+                h = dict(headers or {})
+                if ref:
+                    h["Referer"] = ref
+                futs[pool.submit(contextvars.copy_context().run, _fetch_one, url, timeout, h or None, cookies, transform, on_raw, cache)] = key
+            for done, fut in enumerate(as_completed(futs), start=1):
+                results[futs[fut]] = fut.result()
+                if on_progress:
+                    on_progress(done, total)
+    return [results.get(k) if k is not None else None for k in keys]
+
+def iter_images(
+    urls: Sequence[Optional[str]],
+    transform: Optional[Callable[[bytes], bytes]] = None,
+    workers: Optional[int] = None,
+    timeout: float = 20,
+    headers: Optional[Dict[str, str]] = None,
+    cookies: Optional[Dict[str, str]] = None,
+    referers: Optional[Sequence[Optional[str]]] = None,
+    on_raw: Optional[Callable[[str, bytes], None]] = None,
+    on_progress=None,
+    use_cache: bool = True,
+    cache: Optional[ThumbnailCache] = None,
+) -> Iterator[Optional[bytes]]:
+    """
+    Versi streaming fetch_images: yield hasil per URL sesuai urutan, dengan paling banyak
+    workers*2 gambar di udara/di memori (untuk ekspor yang langsung menulis tiap baris).
+    URL berulang tidak di-dedupe di sini; pengambilan kedua dilayani cache disk.
+    on_progress(selesai, total) dipanggil dari thread pemanggil.
+    """
+    if use_cache and cache is None:
+        cache = default_cache()
+    elif not use_cache:
+        cache = None
+    total = len(urls)
+
+    def job(i: int) -> Optional[bytes]:
+        u = urls[i]
+        if not (isinstance(u, str) and u.startswith("http")):
+            return None
+        h = dict(headers or {})
+        ref = referers[i] if referers else None
+        if ref:
+            h["Referer"] = ref
+        return _fetch_one(u, timeout, h or None, cookies, transform, on_raw, cache)
+
+    n_workers = max(1, min(int(workers or IMAGE_WORKERS), total or 1))
+    for done, (_, out) in enumerate(ordered_map(job, range(total), n_workers, thread_name_prefix="img"), start=1):
+        if on_progress:
+            on_progress(done, total)
+        yield out
+
+# ================== Thumbnail preview (static/thumbs) ==================
+def static_thumbnail_saver(size: Optional[int] = None) -> Optional[Callable[[str, bytes], None]]:
+    """
+    on_raw untuk fetch_images/iter_images: varian preview static dibuat dari bytes yang sedang diunduh,
+    jadi static_thumbnails() untuk URL yang sama sesudahnya tidak mengunduh lagi (juga tanpa cache disk).
+    None kalau static cache nonaktif.
+    """
+    static = static_cache()
+    if static is None:
+        return None
+    transform = jpeg_thumbnail(size or PREVIEW_THUMB_PX, size or PREVIEW_THUMB_PX)
+
+    def _save(url: str, raw: bytes):
+        if static.locate(url, transform.variant) is None:
+            try:
+                with span("image_resize"):
+                    data = transform(raw)
+            except Exception:
+                return
+            static.put(url, data, transform.variant)
+    return _save
+
+def static_thumbnails(
+    urls: Sequence[Optional[str]],
+    size: Optional[int] = None,
+    workers: Optional[int] = None,
+    timeout: float = 20,
+    headers: Optional[Dict[str, str]] = None,
+    cookies: Optional[Dict[str, str]] = None,
+    referers: Optional[Sequence[Optional[str]]] = None,
+    on_progress=None,
+) -> List[Optional[str]]:
+    """
+    URL gambar CDN → URL thumbnail lokal (/app/static/thumbs/....jpg), urut sesuai input.
+    Varian JPEG kecil (sisi terpanjang `size`, default PREVIEW_THUMB_PX) dibuat sekali di server; URL yang
+    sudah punya varian cukup di-stat, jadi penonton berikutnya tidak memicu unduhan/resize apa pun.
+    Gagal diunduh → URL asli (browser mencoba hot-link seperti sebelumnya); URL kosong → None.
+    Tanpa static cache (SCRAPER_STATIC_THUMBS_MB=0) → URL asli apa adanya.
+    """
+    static = static_cache()
+    if static is None:
+        return [u if isinstance(u, str) and u.startswith("http") else None for u in urls]
+    transform = jpeg_thumbnail(size or PREVIEW_THUMB_PX, size or PREVIEW_THUMB_PX)
+    out: List[Optional[str]] = [None] * len(urls)
+    missing: List[int] = []
+    for i, u in enumerate(urls):
+        if not (isinstance(u, str) and u.startswith("http")):
+            continue
+        path = static.locate(u, transform.variant)
+        if path is not None:
+            out[i] = static_url(path)
+        else:
+            missing.append(i)
+    if missing:
+        made = fetch_images(
+            [urls[i] for i in missing], transform=transform, workers=workers, timeout=timeout,
+            headers=headers, cookies=cookies, referers=[referers[i] for i in missing] if referers else None,
+            on_progress=on_progress,
+        )
+        for i, data in zip(missing, made):
+            path = static.put(urls[i], data, transform.variant) if data else None
+            out[i] = static_url(path) if path else urls[i]
+    return out
+
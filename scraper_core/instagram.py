@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# scraper_core/instagram.py
+# Inti scraper Instagram (instaloader) tanpa Streamlit.
+# instaloader baru di-import saat sesi pertama dibuat (new_instaloader), bukan saat modul dimuat.
+
+import json, re, csv, io, os, tempfile, hashlib, threading, time
+from contextlib import contextmanager, suppress
+from datetime import datetime, date
+from typing import Dict, List, Optional
+from dateutil import tz
+
+from scraper_core.journal import CHECKPOINT_EVERY
+from scraper_core.metrics import count as count_metric, span, timed_iter
+from scraper_core.ratelimit import mount as mount_rate_limit
+
+HOMEPAGE = "https://www.instagram.com/"
+IG_COLUMNS = ["tanggal_post", "gambar", "link_post", "caption", "like", "tipe"]
+
+# ================== Utils ==================
+def ts_to_iso(dt_aware, tz_name="Asia/Jakarta"):
+    """Konversi datetime aware (UTC dari IG) ke zona WIB -> ISO8601."""
+    try:
+        return dt_aware.astimezone(tz.gettz(tz_name)).isoformat()
+    except Exception:
+        return dt_aware.isoformat()
+
+def load_cookies_any_from_text(json_text: str):
+    """Parse cookies JSON menjadi dict {name:value}."""
+    data = json.loads(json_text)
+    jar = {}
+    if isinstance(data, dict) and "cookies" not in data and "cookie" not in data:
+        jar = {k: str(v) for k, v in data.items()}
+    elif isinstance(data, dict) and "cookie" in data:
+        for part in str(data["cookie"]).split(";"):
+            part = part.strip()
+            if "=" in part:
+                k, v = part.split("=", 1)
+                jar[k.strip()] = v.strip()
+    elif isinstance(data, list):
+        for c in data:
+            name = c.get("name")
+            value = c.get("value")
+            if name and value is not None:
+                jar[name] = str(value)
+    elif isinstance(data, str):
+        for part in data.split(";"):
+            part = part.strip()
+            if "=" in part:
+                k, v = part.split("=", 1)
+                jar[k.strip()] = v.strip()
+    else:
+        raise ValueError("Format cookies tidak dikenali.")
+    return jar
+
+def mount_cookies_to_instaloader(L, cookies_dict):
+    s = L.context._session
+    s.cookies.clear()
+    for name, value in cookies_dict.items():
+        s.cookies.set(name, value, domain=".instagram.com", path="/")
+
+def get_lsd_and_prime_headers(L):
+    """Warm-up untuk LSD token & headers penting."""
+    s = L.context._session
+    ua = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"
+    s.headers["User-Agent"] = ua
+    try:
+        r = s.get(HOMEPAGE, timeout=30)
+    except Exception:
+        return
+    finally:
+        count_metric(requests=1)   # di luar RateController instaloader → hitung manual
+    if r.status_code != 200:
+        return
+    html = r.text
+    m = re.search(r'"LSD",\s*\{\s*"token"\s*:\s*"([^"]+)"', html) or re.search(r'name="lsd"\s+value="([^"]+)"', html)
+    if m:
+        s.headers["X-FB-LSD"] = m.group(1)
+    s.headers.setdefault("X-ASBD-ID", "129477")
+    s.headers.setdefault("Accept", "application/json")
+
+def whoami(L):
+    try:
+        return L.test_login()
+    except Exception:
+        return None
+
+_rate_controller_cls = None
+
+def _metered_rate_controller():
+    """
+    RateController instaloader + metrik. Semua query instaloader lewat sini, termasuk sesi anonim /
+    salinan sesi (halaman profil, GraphQL) yang tidak memakai adapter pembatas laju kita.
+    Kelasnya dibuat saat instaloader pertama dipakai (import instaloader ditunda sampai scrape).
+    """
+    global _rate_controller_cls
+    if _rate_controller_cls is None:
+        import instaloader
+
+        class _MeteredRateController(instaloader.RateController):
+            def wait_before_query(self, query_type: str):
+                super().wait_before_query(query_type)
+                count_metric(requests=1)
+
+            def handle_429(self, query_type: str):
+                count_metric(retries=1)
+                return super().handle_429(query_type)
+
+        _rate_controller_cls = _MeteredRateController
+    return _rate_controller_cls
+
+def new_instaloader():
+    """Instaloader tanpa unduhan file (hanya metadata); sesi HTTP-nya lewat pembatas laju bersama."""
+    import instaloader
+    L = instaloader.Instaloader(
+        download_pictures=False,
+        download_videos=False,
+        save_metadata=False,
+        compress_json=False,
+        post_metadata_txt_pattern=None,
+        max_connection_attempts=3,
+        request_timeout=30,
+        rate_controller=_metered_rate_controller(),
+    )
+    # request sudah dihitung RateController di atas; adapter cukup menghitung byte & retry
+    mount_rate_limit(L.context._session, count_requests=False)
+    return L
+
+def login_with_cookies(cookies_dict):
+    """Siapkan sesi dari cookies + warm-up. Return (L, username_login|None)."""
+    L = new_instaloader()
+    mount_cookies_to_instaloader(L, cookies_dict)
+    with span("login_warmup"):
+        get_lsd_and_prime_headers(L)
+    with span("whoami"):
+        return L, whoami(L)
+
+# ================== Pool sesi (warm, per cookies) ==================
+# Sesi yang sudah di-warm-up (cookies terpasang, LSD + header, hasil whoami) disimpan per sidik cookies
+# dan dipinjamkan lagi ke run berikutnya → scrape ulang mulai tanpa request warm-up.
+# Satu Instaloader hanya dipakai satu run sekaligus; run paralel dengan cookies sama dapat sesi sendiri.
+#   SCRAPER_IG_SESSION_TTL    umur maksimum sesi (detik, default 1800); 0 = pool nonaktif
+#   SCRAPER_IG_SESSION_CHECK  sesi yang menganggur lebih lama dari ini dicek dulu via whoami (default 300)
+#   SCRAPER_IG_LSD_TTL        token LSD di-refresh (fetch homepage) kalau lebih tua dari ini (default 1800)
+SESSION_TTL = float(os.getenv("SCRAPER_IG_SESSION_TTL", "1800"))
+SESSION_CHECK_AFTER = float(os.getenv("SCRAPER_IG_SESSION_CHECK", "300"))
+LSD_TTL = float(os.getenv("SCRAPER_IG_LSD_TTL", "1800"))
+
+def cookie_fingerprint(cookies_dict) -> str:
+    """Sidik set cookies (urutan tidak berpengaruh); nilai cookie tidak disimpan di pool."""
+    raw = "\n".join(f"{k}={v}" for k, v in sorted((cookies_dict or {}).items()))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:24]
+
+def _session_broken(exc: Optional[BaseException]) -> bool:
+    """Error yang berarti sesinya sendiri bermasalah (403/401/login/koneksi), bukan targetnya."""
+    if exc is None:
+        return False
+    import instaloader.exceptions as ie
+    if isinstance(exc, (ie.QueryReturnedNotFoundException, ie.ProfileNotExistsException,
+                        ie.PrivateProfileNotFollowedException)):
+        return False
+    return isinstance(exc, (ie.ConnectionException, ie.LoginRequiredException, ie.LoginException,
+                            ie.QueryReturnedForbiddenException, ie.QueryReturnedBadRequestException))
+
+class PooledSession:
+    """Satu Instaloader hangat milik pool. L dan username dipakai seperti hasil login_with_cookies."""
+
+    def __init__(self, key: str, L, username: Optional[str]):
+        now = time.monotonic()
+        self.key = key
+        self.L = L
+        self.username = username
+        self.created = now
+        self.last_ok = now
+        self.lsd_at = now
+        self.uses = 0
+        self.reused = False
+
+class SessionPool:
+    """Pool sesi Instagram satu proses (thread-safe)."""
+
+    def __init__(self, ttl: float = SESSION_TTL, check_after: float = SESSION_CHECK_AFTER,
+                 lsd_ttl: float = LSD_TTL, max_idle: int = 4):
+        self.ttl = ttl
+        self.check_after = check_after
+        self.lsd_ttl = lsd_ttl
+        self.max_idle = max_idle
+        self._idle: Dict[str, List[PooledSession]] = {}
+        self._lock = threading.Lock()
+        self.created = self.reused = self.discarded = 0
+
+    def _take_idle(self, key: str) -> Optional[PooledSession]:
+        now = time.monotonic()
+        with self._lock:
+            for k in list(self._idle):
+                fresh = [p for p in self._idle[k] if now - p.created < self.ttl]
+                self.discarded += len(self._idle[k]) - len(fresh)
+                if fresh:
+                    self._idle[k] = fresh
+                else:
+                    del self._idle[k]
+            stack = self._idle.get(key)
+            return stack.pop() if stack else None
+
+    def acquire(self, cookies_dict) -> PooledSession:
+        """Sesi siap pakai untuk cookies ini: dari pool kalau ada (cek/refresh seperlunya), kalau tidak login baru."""
+        key = cookie_fingerprint(cookies_dict)
+        while self.ttl > 0:
+            ps = self._take_idle(key)
+            if ps is None:
+                break
+            now = time.monotonic()
+            if now - ps.last_ok > self.check_after:
+                with span("whoami"):
+                    me = whoami(ps.L)
+                if me != ps.username:   # cookies kedaluwarsa / logout → buang, coba sesi lain atau login baru
+                    with self._lock:
+                        self.discarded += 1
+                    continue
+                ps.last_ok = now
+            if now - ps.lsd_at > self.lsd_ttl:
+                with span("login_warmup"):
+                    get_lsd_and_prime_headers(ps.L)
+                ps.lsd_at = now
+            ps.uses += 1
+            ps.reused = True
+            with self._lock:
+                self.reused += 1
+            return ps
+        L, me = login_with_cookies(cookies_dict)
+        ps = PooledSession(key, L, me)
+        ps.uses = 1
+        with self._lock:
+            self.created += 1
+        return ps
+
+    def release(self, ps: PooledSession, error: Optional[BaseException] = None):
+        """Kembalikan sesi setelah run. error = exception run (kalau ada); sesi rusak tidak dikembalikan."""
+        if self.ttl <= 0 or _session_broken(error) or time.monotonic() - ps.created >= self.ttl:
+            with self._lock:
+                self.discarded += 1
+            return
+        if error is None:
+            ps.last_ok = time.monotonic()
+        with self._lock:
+            stack = self._idle.setdefault(ps.key, [])
+            if len(stack) < self.max_idle:
+                stack.append(ps)
+            else:
+                self.discarded += 1
+
+    @contextmanager
+    def session(self, cookies_dict):
+        """with pool.session(cookies) as ps: scrape(ps.L, ...) — dikembalikan otomatis, dibuang kalau sesi rusak."""
+        ps = self.acquire(cookies_dict)
+        try:
+            yield ps
+        except BaseException as e:
+            self.release(ps, e)
+            raise
+        else:
+            self.release(ps)
+
+    def clear(self):
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"idle": sum(len(v) for v in self._idle.values()), "created": self.created,
+                    "reused": self.reused, "discarded": self.discarded}
+
+_pool: Optional[SessionPool] = None
+_pool_lock = threading.Lock()
+
+def session_pool() -> SessionPool:
+    """Pool bersama satu proses (hub Streamlit, batch runner)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SessionPool()
+        return _pool
+
+def is_post_pinned_safe(post) -> bool:
+    """Deteksi aman apakah post 'pinned' di berbagai versi instaloader."""
+    for attr in ("is_pinned", "pinned"):
+        try:
+            v = getattr(post, attr, None)
+            if isinstance(v, bool):
+                return v
+        except Exception:
+            pass
+    try:
+        node = getattr(post, "_node", None)
+        if isinstance(node, dict):
+            return bool(node.get("is_pinned") or node.get("pinned"))
+    except Exception:
+        pass
+    return False
+
+# ================== Export Helpers ==================
+def rows_to_csv_bytes(rows):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=IG_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue().encode("utf-8-sig")
+
+def rows_to_excel_with_images(rows, on_progress=None, workers=None):
+    """
+    Bangun file Excel (xlsx) dengan gambar embedded pada kolom terakhir.
+    Gambar diunduh paralel (workers) dan baris ditulis streaming (scraper_core.xlsx);
+    return file biner sementara (posisi 0) — baca dengan .read() atau salin ke disk.
+    on_progress(i, n) dipanggil per gambar yang selesai diunduh.
+    """
+    try:
+        from scraper_core.images import iter_images, png_thumbnail
+        from scraper_core.xlsx import XlsxStream
+    except Exception:
+        raise RuntimeError("Untuk ekspor Excel bergambar, install dulu: pip install openpyxl pillow")
+
+    xs = XlsxStream(
+        "IG Posts",
+        ["tanggal_post", "caption", "like", "link_post", "tipe", "gambar"],
+        widths={"A": 25, "B": 60, "C": 10, "D": 42, "E": 16, "F": 25},
+        bold_header=False,
+    )
+    thumbs = iter_images(
+        [r.get("gambar", "") for r in rows],
+        transform=png_thumbnail(320, 320),
+        workers=workers,
+        timeout=30,
+        on_progress=on_progress,
+    )
+    for r, png in zip(rows, thumbs):
+        link = r.get("link_post", "")
+        url = r.get("gambar", "")
+        xs.append([
+            r.get("tanggal_post", ""),
+            r.get("caption", ""),
+            r.get("like", 0),
+            xs.cell(link, hyperlink=link or None),
+            r.get("tipe", ""),
+            url if (url and not png) else None,
+        ], image=png, image_col="F", height=180 if png else None)
+    return xs.finish()
+
+# ================== Record terpadu ==================
+_SHORTCODE_RE = re.compile(r"/(?:p|reel|tv)/([^/?#]+)")
+
+def rows_to_records(rows, account: str):
+    """Rows scrape_posts_range → PostRecord (post_id = shortcode, item = urutan gambar di album)."""
+    from scraper_core.records import PostRecord, to_int, to_utc
+    out = []
+    for r in rows:
+        link = r.get("link_post", "") or ""
+        m = _SHORTCODE_RE.search(link)
+        tipe = r.get("tipe", "") or ""
+        item = to_int(tipe.rsplit("_", 1)[-1]) if tipe.startswith("album_gambar_") else 1
+        out.append(PostRecord(
+            "instagram", m.group(1) if m else link, item=item or 1, account=account,
+            posted_at=to_utc(r.get("tanggal_post")), url=link, image_url=r.get("gambar") or None,
+            caption=r.get("caption", "") or "", likes=to_int(r.get("like")), kind=tipe,
+        ))
+    return out
+
+# ================== Sync inkremental (high-water mark per profil) ==================
+# Satu file JSON per profil: post non-pinned terbaru yang sudah diambil (shortcode + timestamp),
+# daftar shortcode pinned yang sudah diambil (pinned bisa post lama, jadi dicatat terpisah), dan
+# "gaps": rentang waktu [atas, bawah] (eksklusif) di bawah high-water mark yang belum diambil karena
+# run sebelumnya berhenti lebih awal (limit / polite break) sebelum sampai ke mark lama.
+SYNC_DIR = os.getenv("SCRAPER_IG_SYNC_DIR", os.path.join(".cache", "ig_sync"))
+
+def _sync_path(username: str, root: str) -> str:
+    safe = re.sub(r"[^a-z0-9._-]", "_", username.strip().lstrip("@").lower())
+    return os.path.join(root, f"{safe}.json")
+
+def load_sync_state(username: str, root: str = SYNC_DIR) -> dict:
+    """State sync profil ({} kalau belum pernah sync / file rusak)."""
+    try:
+        with open(_sync_path(username, root), encoding="utf-8") as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_sync_state(username: str, state: dict, root: str = SYNC_DIR):
+    path = _sync_path(username, root)
+    os.makedirs(root, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp", dir=root)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+# ================== Core Scraper ==================
+def _timeline_children(post) -> Optional[List[str]]:
+    """display_url anak album dari node timeline yang sudah ada (tanpa request); None kalau node tidak membawanya."""
+    node = getattr(post, "_node", None) or {}
+    edges = (node.get("edge_sidecar_to_children") or {}).get("edges") or []
+    urls = [(e.get("node") or {}).get("display_url") for e in edges]
+    return urls if urls and all(urls) else None
+
+def _post_rows(post, dt_utc, album_all: bool):
+    """
+    Baris output untuk satu post (album → satu baris per gambar, atau hanya yang pertama).
+    Anak album diambil dari node timeline. post.get_sidecar_nodes() bisa memicu fetch full metadata per
+    album (mis. anak video tanpa video_url, padahal yang dipakai hanya display_url), jadi hanya dipanggil
+    kalau node timeline tidak membawa anaknya. Fetch tambahan itu tercatat sebagai tahap metrik `sidecar_fetch`.
+    """
+    caption = (post.caption or "").replace("\r", " ").replace("\n", " ").strip()
+    base = {
+        "tanggal_post": ts_to_iso(dt_utc),
+        "link_post": f"https://www.instagram.com/p/{post.shortcode}/",
+        "caption": caption,
+        "like": getattr(post, "likes", 0),
+    }
+
+    if getattr(post, "typename", "") == "GraphSidecar":
+        if not album_all:   # display_url album = gambar pertama → tidak perlu anak album sama sekali
+            yield {**base, "gambar": getattr(post, "url", "") or "", "tipe": "album_pertama"}
+            return
+        with span("sidecar"):
+            urls = _timeline_children(post)
+        if urls is None:
+            try:
+                with span("sidecar_fetch"):
+                    urls = [getattr(n, "display_url", "") or "" for n in post.get_sidecar_nodes()]
+            except Exception:
+                yield {**base, "gambar": getattr(post, "url", "") or "", "tipe": "album_fallback"}
+                return
+        for idx, url in enumerate(urls, start=1):
+            yield {**base, "gambar": url, "tipe": f"album_gambar_{idx}"}
+    elif getattr(post, "is_video", False):
+        yield {**base, "gambar": getattr(post, "url", "") or "", "tipe": "video"}  # cover video
+    else:
+        yield {**base, "gambar": getattr(post, "url", "") or "", "tipe": "foto"}
+
+def _thaw_journal(posts, journal) -> dict | None:
+    """Pasang cursor jurnal ke NodeIterator baru → state resume, atau None (tidak ada / tidak cocok lagi)."""
+    if journal is None or not journal.cursor:
+        return None
+    from instaloader.nodeiterator import FrozenNodeIterator
+    try:
+        posts.thaw(FrozenNodeIterator(**journal.cursor["it"]))
+    except Exception:
+        journal.discard()   # cursor basi / dari sesi lain / query berubah → mulai dari awal
+        return None
+    return journal.cursor
+
+def scrape_posts_range(
+    L,
+    target_username: str,
+    limit: int | None = 200,
+    d1: date | None = None,
+    d2: date | None = None,
+    album_all: bool = True,
+    polite_break_after_non_pinned_older: int | None = 20,
+    sync_state: dict | None = None,
+    journal=None,
+):
+    """
+    Ambil post newest → oldest dalam rentang tanggal (WIB, inklusif) → list rows (kolom IG_COLUMNS).
+    sync_state (dict dari load_sync_state) → mode inkremental: paginasi berhenti di post non-pinned
+    pertama yang sudah pernah di-sync (di bawah semua gap), pinned yang sudah pernah diambil dilewati,
+    dan dict itu di-update in-place dengan high-water mark + gap baru (simpan lagi via save_sync_state).
+    Run yang terpotong limit / polite break sebelum sampai ke mark lama mencatat sisa rentangnya sebagai
+    gap, jadi sync berikutnya mengambil post baru lalu melanjutkan mengisi gap itu.
+    journal (scraper_core.journal.open_journal) → rows + state NodeIterator (freeze/thaw) di-checkpoint
+    berkala; run berikutnya dengan jurnal yang sama melanjutkan dari checkpoint terakhir.
+    """
+    from instaloader import Profile
+
+    with span("profile"):
+        profile = Profile.from_username(L.context, target_username)
+        posts = profile.get_posts()   # metadata profil + halaman pertama timeline
+    wib = tz.gettz("Asia/Jakarta")
+
+    def day_start_wib(d: date | None):
+        if not d: return None
+        return datetime(d.year, d.month, d.day, 0, 0, 0, tzinfo=wib)
+
+    def day_end_wib(d: date | None):
+        if not d: return None
+        return datetime(d.year, d.month, d.day, 23, 59, 59, tzinfo=wib)
+
+    # Normalisasi rentang tanggal
+    lower_day = upper_day = None
+    if d1 and d2:
+        lower_day, upper_day = (min(d1, d2), max(d1, d2))
+    elif d1 or d2:
+        lower_day = d1 or d2
+        upper_day = d1 or d2
+
+    lower_start = day_start_wib(lower_day) if lower_day else None
+    upper_end   = day_end_wib(upper_day)   if upper_day else None
+
+    incremental = sync_state is not None
+    synced_sc = synced_ts = None
+    synced_pinned = set()
+    gaps: List[List[float]] = []   # [atas, bawah] belum diambil, terbaru dulu
+    newest = None  # (timestamp, shortcode) non-pinned terbaru yang diambil di run ini
+    oldest = None  # timestamp non-pinned tertua yang sudah dilewati walk (diambil / sudah ada / di luar rentang)
+    truncated = False
+    if incremental:
+        synced_sc = sync_state.get("shortcode")
+        synced_ts = sync_state.get("timestamp")
+        synced_pinned = set(sync_state.get("pinned") or [])
+        gaps = [list(g) for g in sync_state.get("gaps") or []]
+    # post non-pinned dengan timestamp <= floor sudah tercakup semua → paginasi berhenti di situ
+    floor = min([g[1] for g in gaps] + [synced_ts]) if synced_ts is not None else None
+
+    rows, kept = [], 0
+    resume = _thaw_journal(posts, journal)
+    if resume:
+        rows = list(journal.rows)
+        kept = len(rows)
+        polite_break_after_non_pinned_older = resume.get("polite", polite_break_after_non_pinned_older)
+        if incremental:
+            synced_pinned = set(resume.get("pinned") or [])
+            newest = tuple(resume["newest"]) if resume.get("newest") else None
+            oldest = resume.get("oldest")
+
+    def cursor(skip: int) -> dict:
+        # freeze() menunjuk post yang terakhir di-yield (di-yield ulang setelah thaw); skip=1 → lewati post itu
+        return {"it": posts.freeze()._asdict(), "skip": skip, "polite": polite_break_after_non_pinned_older,
+                "pinned": sorted(synced_pinned), "newest": newest, "oldest": oldest}
+
+    current = {"start": None, "seen": 0}   # start = len(rows) sebelum post yang sedang diproses
+
+    def walk():
+        skip, since = (resume or {}).get("skip", 0), 0
+        for post in timed_iter(posts, "pagination"):
+            if skip:
+                skip -= 1
+                continue
+            if journal is not None and since >= CHECKPOINT_EVERY:
+                journal.checkpoint(rows, cursor(0))
+                since = 0
+            since += 1
+            current["start"], current["seen"] = len(rows), current["seen"] + 1
+            yield post
+            current["start"] = None
+
+    try:
+        # progress dikelola dari luar (UI/CLI), kembalikan rows saja
+        for i, post in enumerate(walk(), start=1):  # newest → oldest (pinned bisa nongol di atas)
+            dt_utc = getattr(post, "date_utc", None) or getattr(post, "date", None)
+            if dt_utc is None:
+                continue
+            if dt_utc.tzinfo is None:
+                dt_utc = dt_utc.replace(tzinfo=tz.UTC)
+
+            dt_wib = dt_utc.astimezone(wib)
+            pinned = is_post_pinned_safe(post)
+
+            # --- Inkremental: pinned dicek per shortcode; non-pinned di bawah mark diambil hanya kalau
+            #     jatuh di gap, dan paginasi berhenti begitu lewat dari gap terbawah
+            if incremental:
+                if pinned:
+                    if post.shortcode in synced_pinned:
+                        continue
+                elif synced_ts is not None:
+                    ts = synced_ts if post.shortcode == synced_sc else dt_utc.timestamp()
+                    if ts <= synced_ts and not any(lo < ts < hi for hi, lo in gaps):
+                        if ts <= floor:
+                            break
+                        oldest = ts      # sudah diambil run sebelumnya (di antara gap)
+                        continue
+                if not pinned:
+                    oldest = dt_utc.timestamp()
+
+            # --- Filter tanggal: SELALU continue, TIDAK PERNAH break (kecuali limit) ---
+            if upper_end and dt_wib > upper_end:
+                continue
+            if lower_start and dt_wib < lower_start:
+                # optimasi sopan: hentikan setelah cukup banyak non-pinned yang lebih tua
+                if not pinned and polite_break_after_non_pinned_older:
+                    polite_break_after_non_pinned_older -= 1
+                    if polite_break_after_non_pinned_older <= 0:
+                        truncated = True
+                        break
+                continue
+
+            for row in _post_rows(post, dt_utc, album_all):
+                rows.append(row)
+                kept += 1
+                if (limit is not None) and (kept >= limit):
+                    break
+
+            if incremental:
+                if pinned:
+                    synced_pinned.add(post.shortcode)
+                elif newest is None or dt_utc.timestamp() > newest[0]:
+                    newest = (dt_utc.timestamp(), post.shortcode)
+
+            if (limit is not None) and (kept >= limit):
+                truncated = True
+                break
+    except BaseException:
+        if journal is not None and current["seen"]:
+            with suppress(OSError):
+                if current["start"] is None:     # gagal saat paginasi: post terakhir sudah selesai
+                    journal.checkpoint(rows, cursor(1))
+                else:                            # gagal di tengah post: ulangi post itu
+                    journal.checkpoint(rows, cursor(0), upto=current["start"])
+        raise
+    finally:
+        if journal is not None:
+            journal.close()
+    if journal is not None:
+        journal.finish()
+
+    if incremental:
+        if truncated and synced_ts is not None and oldest is not None:
+            # walk berhenti di `oldest`: semua yang lebih tua (sampai mark lama / sisa gap lama) belum diambil
+            left = [[oldest, synced_ts]] if oldest > synced_ts else []
+            left += [[min(hi, oldest), lo] for hi, lo in gaps if min(hi, oldest) > lo]
+            gaps = left
+        elif not truncated:
+            gaps = []   # walk sampai di bawah semua gap (atau timeline habis) → tidak ada yang tersisa
+        if newest is not None and (synced_ts is None or newest[0] > synced_ts):
+            sync_state["timestamp"], sync_state["shortcode"] = newest
+            sync_state["taken_at"] = ts_to_iso(datetime.fromtimestamp(newest[0], tz=tz.UTC))
+        sync_state["gaps"] = gaps
+        sync_state["pinned"] = sorted(synced_pinned)
+        sync_state["username"] = target_username
+        sync_state["synced_at"] = ts_to_iso(datetime.now(tz=tz.UTC))
+    return rows
+
+def sync_posts(L, target_username: str, limit: int | None = 200, d1: date | None = None,
+               d2: date | None = None, album_all: bool = True, root: str = SYNC_DIR, journal=None):
+    """scrape_posts_range mode inkremental + simpan high-water mark → rows baru saja."""
+    state = load_sync_state(target_username, root)
+    rows = scrape_posts_range(L, target_username, limit=limit, d1=d1, d2=d2,
+                              album_all=album_all, sync_state=state, journal=journal)
+    save_sync_state(target_username, state, root)
+    return rows
@@ -0,0 +1,241 @@
+# scraper_core/jobs.py
+# Batch runner banyak akun lintas platform: satu daftar target → satu file hasil per target + summary.json.
+# Tiap target dijalankan lewat fungsi CLI yang sama (cli.run_instagram / run_tiktok / ...), jadi opsinya identik
+# dengan `python -m scraper_core <platform> ...`. Konkurensi dibatasi per platform (satu thread pool per
+# platform seukuran batasnya), tenggat wall-clock opsional: target yang belum mulai saat tenggat lewat
+# ditandai "skipped".
+#
+# Format daftar target (.json):
+#   {
+#     "defaults": {"all": {"format": "csv", "days": 7}, "instagram": {"cookies": "ig.json"}},
+#     "targets": [
+#       {"platform": "instagram", "target": "bpskabupatenpasuruan", "limit": 100},
+#       {"platform": "x", "target": "namaakun", "start": "2025-01-01", "end": "2025-01-31", "token": "..."}
+#     ]
+#   }
+# atau .jsonl (satu target per baris) / .csv (kolom platform,target,... ; kolom lain = opsi).
+# Opsi = nama flag CLI platform tanpa "--" (first_image_only: true → --first-image-only).
+# "days": N → start = hari ini - N, end = hari ini (untuk refresh harian).
+
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from scraper_core.records import PLATFORMS
+
+# Default konkurensi per platform. X = 1: biasanya satu auth_token dipakai bersama (tiap run tweet-harvest
+# sudah punya folder sendiri, jadi menaikkannya aman dari sisi file).
+DEFAULT_LIMITS = {"instagram": 1, "tiktok": 2, "youtube": 2, "x": 1}
+FORMATS = ("csv", "xlsx", "parquet", "arrow")
+
+# Kunci target yang bukan flag CLI
+_META_KEYS = ("platform", "target", "format", "days", "output", "name")
+
+# ================== Daftar target ==================
+def _platform(v: str) -> str:
+    p = str(v or "").strip().lower()
+    aliases = {"ig": "instagram", "tt": "tiktok", "yt": "youtube", "twitter": "x"}
+    p = aliases.get(p, p)
+    if p not in PLATFORMS:
+        raise ValueError(f"Platform tidak dikenal: {v!r} (pilih: {', '.join(PLATFORMS)})")
+    return p
+
+def load_targets(path: str) -> List[Dict[str, Any]]:
+    """Baca daftar target (.json / .jsonl / .csv) → list dict dengan defaults sudah digabung."""
+    ext = os.path.splitext(path)[1].lower()
+    defaults: Dict[str, Dict[str, Any]] = {}
+    if ext == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            raw = [{k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+                   for row in csv.DictReader(f)]
+    elif ext == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            raw = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            defaults = data.get("defaults") or {}
+            raw = data.get("targets") or []
+        else:
+            raw = data
+
+    targets = []
+    for i, t in enumerate(raw, start=1):
+        if not t.get("target"):
+            raise ValueError(f"Target #{i} tanpa 'target'")
+        p = _platform(t.get("platform"))
+        merged = {**(defaults.get("all") or {}), **(defaults.get(p) or {}), **t, "platform": p}
+        fmt = str(merged.get("format") or "csv").lower().lstrip(".")
+        if fmt not in FORMATS:
+            raise ValueError(f"Target #{i}: format {fmt!r} tidak didukung (pilih: {', '.join(FORMATS)})")
+        merged["format"] = fmt
+        targets.append(merged)
+    return targets
+
+def _safe_name(s: str) -> str:
+    s = re.sub(r"^(https?://(www\.)?|@)", "", str(s).strip())
+    return re.sub(r"[^\w.@-]+", "_", s).strip("_.") or "target"
+
+def target_argv(t: Dict[str, Any], output: str, today: Optional[date] = None) -> List[str]:
+    """Target → argv CLI platform (tanpa nama program)."""
+    argv = [t["platform"], str(t["target"]), "-o", output]
+    opts = {k: v for k, v in t.items() if k not in _META_KEYS}
+    if t.get("days") not in (None, ""):
+        today = today or date.today()
+        opts.setdefault("start", (today - timedelta(days=int(t["days"]))).isoformat())
+        opts.setdefault("end", today.isoformat())
+    for k, v in opts.items():
+        flag = "--" + k.replace("_", "-")
+        if isinstance(v, str) and v.lower() in ("true", "false"):
+            v = v.lower() == "true"
+        if v is None or v is False or v == "":
+            continue
+        if v is True:
+            argv.append(flag)
+        else:
+            argv += [flag, str(v)]
+    return argv
+
+# ================== Runner ==================
+def _run_one(t: Dict[str, Any], output: str, dataset: Optional[str], retries: int) -> Dict[str, Any]:
+    from scraper_core import cli
+    from scraper_core.metrics import collect
+
+    res = {"platform": t["platform"], "target": str(t["target"]), "output": output,
+           "status": "failed", "rows": 0, "attempts": 0, "seconds": 0.0, "error": None}
+    argv = target_argv(t, output)
+    if dataset:
+        argv += ["--dataset", dataset]
+    t0 = time.monotonic()
+    with collect(t["platform"], str(t["target"])) as run:
+        for attempt in range(1, retries + 2):
+            res["attempts"] = attempt
+            try:
+                args = cli.build_parser().parse_args(argv)
+            except SystemExit:
+                res["error"] = "opsi tidak valid: " + " ".join(argv[1:])
+                break
+            try:
+                res["rows"] = int(args.func(args) or 0)
+                res["status"], res["error"] = "ok", None
+                break
+            except (Exception, SystemExit) as e:
+                res["error"] = f"{type(e).__name__}: {e}"
+                if attempt <= retries:
+                    time.sleep(min(30, 2 ** attempt))
+    m = run.to_dict()
+    res["metrics"] = {"totals": m["totals"], "stages": m["stages"]}
+    res["seconds"] = round(time.monotonic() - t0, 3)
+    return res
+
+def _summarize(results: List[Dict[str, Any]], wall: float) -> Dict[str, Any]:
+    per = {}
+    for r in results:
+        p = per.setdefault(r["platform"], {"targets": 0, "ok": 0, "failed": 0, "skipped": 0,
+                                           "rows": 0, "busy_seconds": 0.0})
+        p["targets"] += 1
+        p[r["status"]] += 1
+        p["rows"] += r["rows"]
+        p["busy_seconds"] = round(p["busy_seconds"] + r["seconds"], 3)
+    for p in per.values():
+        p["rows_per_sec"] = round(p["rows"] / p["busy_seconds"], 2) if p["busy_seconds"] else 0.0
+    rows = sum(r["rows"] for r in results)
+    return {
+        "targets": len(results),
+        "ok": sum(r["status"] == "ok" for r in results),
+        "failed": sum(r["status"] == "failed" for r in results),
+        "skipped": sum(r["status"] == "skipped" for r in results),
+        "rows": rows,
+        "wall_seconds": round(wall, 3),
+        "rows_per_sec": round(rows / wall, 2) if wall else 0.0,
+        "platforms": per,
+    }
+
+def run_batch(targets: List[Dict[str, Any]], out_dir: str, limits: Optional[Dict[str, int]] = None,
+              deadline_s: Optional[float] = None, retries: int = 1, dataset: Optional[str] = None,
+              on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Jalankan semua target. Hasil per target ke <out_dir>/<platform>/<nama>.<format>,
+    ringkasan (per target + per platform: ok/failed/skipped, rows, rows/detik) ke <out_dir>/summary.json.
+    limits: konkurensi maksimum per platform (default DEFAULT_LIMITS).
+    deadline_s: target yang belum mulai setelah sekian detik tidak dijalankan (status "skipped").
+    Return dict ringkasan yang sama dengan isi summary.json.
+    """
+    limits = {**DEFAULT_LIMITS, **(limits or {})}
+    started_at = datetime.now().astimezone()
+    t0 = time.monotonic()
+
+    # Path output unik per target (handle yang sama di dua baris tidak saling timpa)
+    used, planned = set(), []
+    for t in targets:
+        base = os.path.join(out_dir, t["platform"], _safe_name(t.get("name") or t["target"]))
+        path, n = f"{base}.{t['format']}", 1
+        while path in used:
+            n += 1
+            path = f"{base}-{n}.{t['format']}"
+        used.add(path)
+        planned.append((t, t.get("output") or path))
+
+    def job(item):
+        t, output = item
+        if deadline_s is not None and time.monotonic() - t0 > deadline_s:
+            res = {"platform": t["platform"], "target": str(t["target"]), "output": output,
+                   "status": "skipped", "rows": 0, "attempts": 0, "seconds": 0.0,
+                   "error": "tenggat waktu batch terlewati"}
+        else:
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            res = _run_one(t, output, dataset, retries)
+        if on_result:
+            on_result(res)
+        return res
+
+    from scraper_core import cli
+    cli.set_quiet(True)
+    try:
+        # Satu pool per platform (ukuran = batas konkurensinya) → antrean IG yang panjang tidak
+        # menahan target TikTok/YouTube/X yang slotnya masih kosong
+        with ExitStack() as stack:
+            pools = {p: stack.enter_context(ThreadPoolExecutor(max_workers=max(1, int(limits[p])),
+                                                               thread_name_prefix=f"batch-{p}"))
+                     for p in {t["platform"] for t, _ in planned}}
+            futures = [pools[item[0]["platform"]].submit(job, item) for item in planned]
+            results = [f.result() for f in futures]
+    finally:
+        cli.set_quiet(False)
+
+    summary = _summarize(results, time.monotonic() - t0)
+    summary["started_at"] = started_at.isoformat(timespec="seconds")
+    summary["finished_at"] = datetime.now().astimezone().isoformat(timespec="seconds")
+    summary["results"] = results
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+def parse_limits(items: Optional[List[str]]) -> Dict[str, int]:
+    """["instagram=2", "x=1"] → {"instagram": 2, "x": 1}"""
+    out = {}
+    for item in items or []:
+        for part in item.split(","):
+            if not part.strip():
+                continue
+            k, sep, v = part.partition("=")
+            if not sep:
+                raise ValueError(f"Format konkurensi harus platform=N: {part!r}")
+            out[_platform(k)] = int(v)
+    return out
+
+def print_result(res: Dict[str, Any]):
+    msg = f"[{res['status']:>7}] {res['platform']:<9} {res['target']} — {res['rows']} baris, {res['seconds']:.1f}s"
+    if res.get("error"):
+        msg += f" ({res['error']})"
+    sys.stderr.write(msg + "\n")   # satu write: baris dari thread lain tidak terselip
+    sys.stderr.flush()
@@ -0,0 +1,158 @@
+# scraper_core/journal.py
+# Jurnal checkpoint append-only (NDJSON) untuk run scrape panjang, supaya run yang mati di tengah
+# (403, tab browser ditutup, container restart) bisa dilanjutkan, bukan diulang dari nol.
+# Satu file per (platform, akun, parameter scrape) di SCRAPER_JOURNAL_DIR (default .cache/journal):
+#   {"v": 1, "platform": ..., "account": ..., "params": {...}, "created": <epoch>}   ← header
+#   {"meta": {...}}                                  ← data sekali catat (mis. daftar entri TikTok)
+#   {"rows": [...], "cursor": {...}}                 ← checkpoint: baris baru + posisi paginasi
+# Baris dan cursor ditulis dalam SATU baris JSON, jadi checkpoint selalu konsisten; baris terakhir
+# yang terpotong (proses mati saat menulis) diabaikan dan dipotong saat jurnal dibuka lagi.
+# Cursor per platform:
+#   instagram → FrozenNodeIterator instaloader (NodeIterator.freeze/thaw) + state filter
+#   youtube   → token continuation scrapetube + posisi di halaman
+#   tiktok    → indeks berikutnya di daftar entri flat
+# Run yang selesai menghapus jurnalnya; jurnal lebih tua dari SCRAPER_JOURNAL_MAX_AGE dibuang.
+#
+#   journal = open_journal("tiktok", "viralkan.id", limit=60)
+#   entries, errors = fetch_user_videos_parallel("viralkan.id", 60, journal=journal)
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from scraper_core.metrics import span
+
+JOURNAL_DIR = os.getenv("SCRAPER_JOURNAL_DIR", os.path.join(".cache", "journal"))
+JOURNAL_MAX_AGE = float(os.getenv("SCRAPER_JOURNAL_MAX_AGE", str(24 * 3600)))
+# Checkpoint ditulis tiap sekian item (post / video) yang diproses, plus saat run berhenti karena error
+CHECKPOINT_EVERY = max(1, int(os.getenv("SCRAPER_JOURNAL_EVERY", "12")))
+
+_VERSION = 1
+
+class Journal:
+    """
+    Jurnal satu run. Saat dibuka, isi lama dimuat: `rows` (semua baris yang sudah di-checkpoint),
+    `cursor` (posisi terakhir, None kalau belum ada) dan `meta`. `resumed` True kalau ada yang dilanjutkan.
+    """
+
+    def __init__(self, path: str, header: Dict[str, Any], max_age: float = JOURNAL_MAX_AGE):
+        self.path = path
+        self.header = header
+        self.rows: List[Any] = []
+        self.cursor: Optional[Dict[str, Any]] = None
+        self.meta: Dict[str, Any] = {}
+        self._f = None
+        self._load(max_age)
+        self.resumed = bool(self.rows or self.cursor is not None or self.meta)
+
+    # ---------- baca ----------
+    def _load(self, max_age: float):
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return
+        good = 0
+        with f:
+            head = _parse(f.readline())
+            stale = (not isinstance(head, dict) or head.get("v") != _VERSION
+                     or head.get("params") != self.header.get("params")
+                     or (max_age > 0 and time.time() - float(head.get("created") or 0) > max_age))
+            if stale:
+                f.close()
+                self.discard()
+                return
+            self.header = head
+            good = f.tell()
+            for line in f:
+                rec = _parse(line)
+                if not isinstance(rec, dict) or not line.endswith(b"\n"):
+                    break   # baris terpotong → sisanya diabaikan
+                if "meta" in rec:
+                    self.meta.update(rec["meta"] or {})
+                if "rows" in rec:
+                    self.rows.extend(rec["rows"] or [])
+                    self.cursor = rec.get("cursor")
+                good += len(line)
+        if good < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(good)
+
+    # ---------- tulis ----------
+    def _write(self, rec: dict):
+        with span("journal"):
+            if self._f is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                fresh = not os.path.exists(self.path)
+                self._f = open(self.path, "ab")
+                if fresh:
+                    self._f.write(_dump(self.header))
+            self._f.write(_dump(rec))
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def note(self, **meta):
+        """Catat data sekali-jalan (dimuat lagi ke `meta` saat resume)."""
+        self.meta.update(meta)
+        self._write({"meta": meta})
+
+    def checkpoint(self, rows: List[Any], cursor: Dict[str, Any], upto: Optional[int] = None):
+        """
+        `rows` = SEMUA baris run sejauh ini (termasuk yang dimuat dari jurnal); hanya rows[len(self.rows):upto]
+        yang ditulis, bersama `cursor` = posisi untuk melanjutkan tepat setelah baris-baris itu.
+        """
+        upto = len(rows) if upto is None else upto
+        new = rows[len(self.rows):upto]
+        self._write({"rows": new, "cursor": cursor})
+        self.rows.extend(new)
+        self.cursor = cursor
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def discard(self):
+        """Hapus jurnal (run selesai, atau isinya tidak bisa dipakai) dan mulai kosong."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.rows, self.cursor, self.meta, self.resumed = [], None, {}, False
+
+    finish = discard
+
+def _dump(rec: dict) -> bytes:
+    return (json.dumps(rec, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+def _parse(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+def journal_path(platform: str, account: str, params: Dict[str, Any], root: str = JOURNAL_DIR) -> str:
+    safe = re.sub(r"[^a-z0-9._-]", "_", str(account).strip().lstrip("@").lower())[-80:] or "_"
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(root, platform, f"{safe}-{digest}.ndjson")
+
+def open_journal(platform: str, account: str, fresh: bool = False, root: Optional[str] = None,
+                 **params) -> Optional[Journal]:
+    """
+    Jurnal untuk run (platform, akun, params); params = semua opsi yang mengubah hasil (limit, rentang
+    tanggal, dst.), jadi run dengan opsi lain tidak melanjutkan jurnal ini. `fresh` → buang jurnal lama.
+    None kalau SCRAPER_JOURNAL_DIR=off.
+    """
+    root = root or JOURNAL_DIR
+    if root.lower() in ("off", "0", "none", ""):
+        return None
+    params = json.loads(json.dumps(params, sort_keys=True, default=str))
+    header = {"v": _VERSION, "platform": platform, "account": str(account).lstrip("@"),
+              "params": params, "created": time.time()}
+    journal = Journal(journal_path(platform, account, params, root), header)
+    if fresh:
+        journal.discard()
+    return journal
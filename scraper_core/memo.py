@@ -0,0 +1,46 @@
+# scraper_core/memo.py
+# Memo hasil ekspor (CSV/XLSX/preview) berdasarkan sidik DataFrame + opsi ekspor.
+# `store` cukup dict-like (mis. st.session_state), jadi modul ini tetap bebas Streamlit.
+
+import hashlib
+from typing import Any, Callable, MutableMapping
+
+import pandas as pd
+
+def frame_fingerprint(df: pd.DataFrame | None, **options) -> str:
+    """Sidik isi DataFrame (nilai + index + kolom) dan opsi ekspor, stabil antar rerun."""
+    h = hashlib.sha1()
+    if df is not None:
+        h.update(repr(list(df.columns)).encode("utf-8"))
+        h.update(repr(df.shape).encode("utf-8"))
+        try:
+            row_hash = pd.util.hash_pandas_object(df, index=True)
+        except TypeError:
+            # kolom berisi list/dict/bytes → hash representasi string
+            row_hash = pd.util.hash_pandas_object(df.astype(str), index=True)
+        h.update(row_hash.values.tobytes())
+    for k in sorted(options):
+        v = options[k]
+        if isinstance(v, (bytes, bytearray)):
+            v = hashlib.sha1(v).hexdigest()
+        h.update(f"{k}={v!r};".encode("utf-8"))
+    return h.hexdigest()
+
+def memoized(store: MutableMapping[str, Any], name: str, fingerprint: str, build: Callable[[], Any]) -> Any:
+    """
+    Ambil store[name] kalau sidiknya sama; kalau beda, panggil build() dan simpan.
+    Hanya satu versi per nama yang disimpan (hasil lama langsung diganti).
+    """
+    slot = store.get(name)
+    if slot is not None and slot[0] == fingerprint:
+        return slot[1]
+    value = build()
+    store[name] = (fingerprint, value)
+    return value
+
+def peek(store: MutableMapping[str, Any], name: str, fingerprint: str) -> Any:
+    """Hasil memo untuk sidik ini tanpa membangun ulang (None kalau belum ada / sudah basi)."""
+    slot = store.get(name)
+    if slot is not None and slot[0] == fingerprint:
+        return slot[1]
+    return None
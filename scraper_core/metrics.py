@@ -0,0 +1,189 @@
+# scraper_core/metrics.py
+# Instrumentasi ringan per tahap untuk satu run scrape: wall time, jumlah request HTTP, byte, retry.
+# Run aktif dibawa lewat contextvars, jadi tidak perlu dioper ke tiap fungsi. Pool worker
+# (concurrency.ordered_map, images.fetch_images, thread HarvestRun) menjalankan tugas di salinan konteks
+# pemanggil, sehingga hitungan dari thread worker ikut masuk ke run yang sama.
+# Tanpa run aktif semua fungsi di sini no-op (satu lookup contextvar).
+#
+#   with collect("instagram", "bpskabupatenpasuruan") as run:
+#       rows = scrape_posts_range(L, "bpskabupatenpasuruan")
+#   run.to_json() / run.to_prometheus() / run.table()
+#
+# Tahap yang dipakai modul lain:
+#   login_warmup, whoami, profile, pagination, sidecar,
+#   sidecar_fetch (album yang terpaksa fetch full metadata) → Instagram
+#   ytdlp_list, ytdlp_extract                            → TikTok / YouTube (yt-dlp)
+#   channel_pages                                        → YouTube (scrapetube)
+#   harvest, csv_parse                                   → X (subproses tweet-harvest, parsing CSV)
+#   image_download, image_resize, xlsx_write, xlsx_save  → ekspor
+#   journal                                              → checkpoint scraper_core.journal
+# Detik tahap = jumlah di semua thread (tahap paralel bisa melebihi wall time run).
+# Request dihitung di RateLimitedAdapter (byte = ukuran di kabel), RateController instaloader
+# (sesi anonim/salinan instaloader) dan per extract_info yt-dlp; request internal scrapetube tidak terlihat.
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+@dataclass
+class StageStats:
+    seconds: float = 0.0
+    calls: int = 0
+    requests: int = 0
+    bytes: int = 0
+    retries: int = 0
+    errors: int = 0
+
+_FIELDS = ("seconds", "calls", "requests", "bytes", "retries", "errors")
+
+class RunMetrics:
+    """Hitungan per tahap satu run (thread-safe)."""
+
+    def __init__(self, platform: str = "", account: str = ""):
+        self.platform = platform
+        self.account = (account or "").lstrip("@")
+        self.started_at = datetime.now().astimezone()
+        self.stages: Dict[str, StageStats] = {}
+        self._t0 = time.monotonic()
+        self._wall = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, **values):
+        with self._lock:
+            st = self.stages.get(stage)
+            if st is None:
+                st = self.stages[stage] = StageStats()
+            for k, v in values.items():
+                setattr(st, k, getattr(st, k) + v)
+
+    def finish(self):
+        self._wall = max(self._wall, time.monotonic() - self._t0)
+
+    @property
+    def wall_seconds(self) -> float:
+        return self._wall or (time.monotonic() - self._t0)
+
+    def totals(self) -> Dict[str, int]:
+        with self._lock:
+            return {k: sum(getattr(s, k) for s in self.stages.values()) for k in ("requests", "bytes", "retries")}
+
+    # ---------- ekspor ----------
+    def to_dict(self) -> dict:
+        with self._lock:
+            stages = {name: {**asdict(s), "seconds": round(s.seconds, 4)} for name, s in self.stages.items()}
+        return {
+            "platform": self.platform,
+            "account": self.account,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_seconds": round(self.wall_seconds, 3),
+            "totals": self.totals(),
+            "stages": stages,
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self, prefix: str = "scraper") -> str:
+        """Format teks Prometheus (untuk node_exporter textfile collector / pushgateway)."""
+        def esc(v: str) -> str:
+            return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        base = f'platform="{esc(self.platform)}",account="{esc(self.account)}"'
+        out = [f"# HELP {prefix}_run_wall_seconds Wall time run scrape.",
+               f"# TYPE {prefix}_run_wall_seconds gauge",
+               f"{prefix}_run_wall_seconds{{{base}}} {self.wall_seconds:.3f}"]
+        helps = {"seconds": "Detik per tahap (jumlah semua thread).", "calls": "Jumlah span per tahap.",
+                 "requests": "Request HTTP per tahap.", "bytes": "Byte diterima per tahap.",
+                 "retries": "Retry (429/503) per tahap.", "errors": "Span yang berakhir dengan exception."}
+        with self._lock:
+            stages = list(self.stages.items())
+        for field in _FIELDS:
+            name = f"{prefix}_stage_{field}_total"
+            out += [f"# HELP {name} {helps[field]}", f"# TYPE {name} counter"]
+            for stage, s in stages:
+                v = getattr(s, field)
+                out.append(f'{name}{{{base},stage="{esc(stage)}"}} {v:.4f}' if field == "seconds"
+                           else f'{name}{{{base},stage="{esc(stage)}"}} {v}')
+        return "\n".join(out) + "\n"
+
+    def table(self) -> List[dict]:
+        """Baris siap tampil (st.dataframe): tahap, detik, % wall, request, KB, retry, error."""
+        wall = self.wall_seconds or 1.0
+        with self._lock:
+            stages = list(self.stages.items())
+        return [{
+            "tahap": name, "detik": round(s.seconds, 2), "% wall": round(100.0 * s.seconds / wall, 1),
+            "panggilan": s.calls, "request": s.requests, "KB": round(s.bytes / 1024, 1),
+            "retry": s.retries, "error": s.errors,
+        } for name, s in sorted(stages, key=lambda kv: -kv[1].seconds)]
+
+    def write(self, path: str):
+        """Simpan ke file: .prom/.txt → teks Prometheus, selain itu JSON."""
+        text = self.to_prometheus() if path.lower().endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+# ================== Konteks aktif ==================
+_RUN: ContextVar[Optional[RunMetrics]] = ContextVar("scraper_run", default=None)
+_STAGE: ContextVar[Optional[str]] = ContextVar("scraper_stage", default=None)
+
+def current() -> Optional[RunMetrics]:
+    return _RUN.get()
+
+@contextmanager
+def collect(platform: str = "", account: str = "", run: Optional[RunMetrics] = None) -> Iterator[RunMetrics]:
+    """Aktifkan run (baru, atau `run` lama untuk melanjutkan mis. ekspor setelah scrape) selama blok."""
+    run = run or RunMetrics(platform, account)
+    t0 = time.monotonic()
+    token = _RUN.set(run)
+    try:
+        yield run
+    finally:
+        _RUN.reset(token)
+        if run._wall:
+            run._wall += time.monotonic() - t0   # blok lanjutan: wall = jumlah blok
+        else:
+            run.finish()
+
+@contextmanager
+def span(stage: str):
+    """Ukur satu blok sebagai tahap `stage`; request/byte di dalamnya dihitung ke tahap ini."""
+    run = _RUN.get()
+    if run is None:
+        yield
+        return
+    token = _STAGE.set(stage)
+    t0 = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        _STAGE.reset(token)
+        run.add(stage, seconds=time.perf_counter() - t0, calls=1, errors=int(failed))
+
+def count(requests: int = 0, bytes: int = 0, retries: int = 0, stage: Optional[str] = None):
+    """Tambah hitungan ke tahap aktif (atau `stage`); tanpa run aktif → no-op."""
+    run = _RUN.get()
+    if run is not None:
+        run.add(stage or _STAGE.get() or "other", requests=requests, bytes=bytes, retries=retries)
+
+def timed_iter(items: Iterable[T], stage: str) -> Iterator[T]:
+    """Iterator yang tiap next()-nya diukur sebagai `stage` (mis. paginasi yang jalan saat diiterasi)."""
+    it = iter(items)
+    while True:
+        with span(stage):
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+        yield item
@@ -0,0 +1,380 @@
+# scraper_core/ratelimit.py
+# Pembatas laju bersama untuk semua request keluar, per host:
+#   - token bucket (laju/detik + burst) per grup host, laju turun otomatis saat kena 429/403 dan pulih pelan
+#     saat sukses (AIMD) → tetap di laju tertinggi yang masih diterima server
+#   - backoff eksponensial per host (menghormati Retry-After)
+#   - circuit breaker per platform: kalau rasio error di jendela terakhir melonjak, platform itu dijeda
+#
+# Dipakai lewat:
+#   mount(session)                    → requests.Session (unduh gambar, sesi instaloader)
+#   with throttled(url): ...          → pemanggilan tanpa akses ke Session (yt-dlp, tweet-harvest)
+#
+# Konfigurasi ENV:
+#   SCRAPER_RATE_LIMITS = "instagram.com=0.5/5,tiktok.com=1/4"   (host=laju_per_detik[/burst], menimpa default)
+#                         "off" → nonaktif
+#   SCRAPER_CIRCUIT_COOLDOWN = detik jeda pertama saat breaker terbuka (default 60, berlipat tiap trip berikutnya)
+
+import email.utils
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+from scraper_core.metrics import count as count_metric, current as current_metrics
+
+# host (akhiran) → (laju/detik, burst)
+DEFAULT_RATES: Dict[str, Tuple[float, float]] = {
+    "instagram.com": (0.5, 5),
+    "cdninstagram.com": (8, 16),
+    "fbcdn.net": (8, 16),
+    "tiktok.com": (1, 4),
+    "tiktokcdn.com": (8, 16),
+    "tiktokcdn-us.com": (8, 16),
+    "youtube.com": (2, 6),
+    "ytimg.com": (10, 20),
+    "x.com": (0.2, 1),
+    "twitter.com": (0.2, 1),
+    "twimg.com": (8, 16),
+    "*": (20, 40),
+}
+
+# host (akhiran) → platform untuk circuit breaker
+PLATFORM_HOSTS = {
+    "instagram": ("instagram.com", "cdninstagram.com", "fbcdn.net"),
+    "tiktok": ("tiktok.com", "tiktokcdn.com", "tiktokcdn-us.com", "tiktokv.com"),
+    "youtube": ("youtube.com", "ytimg.com", "googlevideo.com", "youtu.be"),
+    "x": ("x.com", "twitter.com", "twimg.com"),
+}
+
+THROTTLE_STATUS = (429, 403, 503)
+ERROR_STATUS = (429, 403, 500, 502, 503, 504)
+
+BACKOFF_BASE = 2.0          # detik, backoff pertama setelah 429/403
+BACKOFF_MAX = 300.0
+MIN_RATE_FRACTION = 0.05    # laju tidak turun di bawah 5% laju dasar
+RECOVER_STEP = 0.05         # tiap sukses naik 5% laju dasar
+
+BREAKER_WINDOW = 20         # jumlah hasil terakhir yang dinilai
+BREAKER_MIN_CALLS = 8
+BREAKER_RATIO = 0.5
+BREAKER_COOLDOWN = float(os.getenv("SCRAPER_CIRCUIT_COOLDOWN", "60"))
+BREAKER_COOLDOWN_MAX = 900.0
+
+class CircuitOpenError(RuntimeError):
+    """Platform sedang dijeda circuit breaker (terlalu banyak 429/403/5xx)."""
+
+def _parse_rates(spec: str) -> Dict[str, Tuple[float, float]]:
+    out = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part or "=" not in part:
+            continue
+        host, val = part.split("=", 1)
+        rate, _, burst = val.partition("/")
+        rate = float(rate)
+        out[host.strip().lower()] = (rate, float(burst) if burst else max(1.0, rate))
+    return out
+
+def host_of(url_or_host: str) -> str:
+    s = url_or_host.strip().lower()
+    if "://" in s:
+        s = urlsplit(s).hostname or ""
+    return s.split(":")[0]
+
+def _suffix_match(host: str, suffixes) -> Optional[str]:
+    for suf in suffixes:
+        if host == suf or host.endswith("." + suf):
+            return suf
+    return None
+
+def platform_of(host: str) -> Optional[str]:
+    for p, suffixes in PLATFORM_HOSTS.items():
+        if _suffix_match(host, suffixes):
+            return p
+    return None
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Header Retry-After (detik atau tanggal HTTP) → detik."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        ts = email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, ts - time.time())
+
+# ================== Token bucket + backoff per host ==================
+class HostBucket:
+    def __init__(self, key: str, rate: float, burst: float):
+        self.key = key
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.strikes = 0
+        self.waited = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, deadline: Optional[float] = None):
+        """Ambil satu token; blok sampai tersedia (dan sampai backoff host selesai)."""
+        t0 = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self.requests += 1
+                        self.waited += now - t0
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise TimeoutError(f"Rate limit {self.key}: menunggu {wait:.0f}s melebihi batas")
+            time.sleep(min(wait, 1.0))
+
+    def report(self, status: Optional[int], retry_after: Optional[float] = None):
+        with self._lock:
+            if status in THROTTLE_STATUS:
+                self.throttled += 1
+                self.strikes += 1
+                self.rate = max(self.base_rate * MIN_RATE_FRACTION, self.rate * 0.5)
+                delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self.strikes - 1)) * random.uniform(0.8, 1.2)
+                if retry_after is not None:
+                    delay = max(delay, min(retry_after, BACKOFF_MAX * 4))
+                self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+                self.tokens = 0.0
+            elif status is not None and status < 400:
+                self.strikes = 0
+                self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVER_STEP)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"rate": round(self.rate, 3), "base_rate": self.base_rate, "requests": self.requests,
+                    "throttled": self.throttled, "waited_s": round(self.waited, 2),
+                    "blocked_for_s": round(max(0.0, self.blocked_until - time.monotonic()), 1)}
+
+# ================== Circuit breaker per platform ==================
+class CircuitBreaker:
+    def __init__(self, name: str, window: int = BREAKER_WINDOW, min_calls: int = BREAKER_MIN_CALLS,
+                 ratio: float = BREAKER_RATIO, cooldown: float = BREAKER_COOLDOWN):
+        self.name = name
+        self.window = deque(maxlen=window)
+        self.min_calls = min_calls
+        self.ratio = ratio
+        self.cooldown = cooldown
+        self.trips = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        with self._lock:
+            return max(0.0, self.open_until - time.monotonic())
+
+    def _trip(self, now: float):
+        self.trips += 1
+        self.open_until = now + min(BREAKER_COOLDOWN_MAX, self.cooldown * 2 ** (self.trips - 1))
+        self.window.clear()
+
+    def record(self, error: bool):
+        with self._lock:
+            now = time.monotonic()
+            if self.open_until:
+                if now < self.open_until:
+                    return   # hasil request yang sudah di udara sebelum jeda
+                # half-open: hasil pertama setelah jeda menentukan (error → jeda lagi, lebih lama)
+                self.open_until = 0.0
+                if error:
+                    self._trip(now)
+                    return
+                self.trips = 0
+            self.window.append(error)
+            n = len(self.window)
+            if n >= self.min_calls and sum(self.window) / n >= self.ratio:
+                self._trip(now)
+
+    def state(self) -> str:
+        return "open" if self.remaining() > 0 else "closed"
+
+# ================== Registry ==================
+class RateLimiter:
+    def __init__(self, rates: Optional[Dict[str, Tuple[float, float]]] = None, enabled: bool = True):
+        self.rates = dict(rates or DEFAULT_RATES)
+        self.enabled = enabled
+        self._buckets: Dict[str, HostBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> HostBucket:
+        key = _suffix_match(host, [k for k in self.rates if k != "*"]) or host or "*"
+        with self._lock:
+            b = self._buckets.get(key)
+            if b is None:
+                rate, burst = self.rates.get(key, self.rates.get("*", DEFAULT_RATES["*"]))
+                b = self._buckets[key] = HostBucket(key, rate, burst)
+            return b
+
+    def breaker(self, host: str) -> Optional[CircuitBreaker]:
+        p = platform_of(host)
+        if p is None:
+            return None
+        with self._lock:
+            br = self._breakers.get(p)
+            if br is None:
+                br = self._breakers[p] = CircuitBreaker(p)
+            return br
+
+    def acquire(self, url_or_host: str, max_wait: Optional[float] = None):
+        """
+        Tunggu giliran untuk host ini. max_wait (detik) = batas total menunggu (breaker terbuka / token);
+        None = tunggu sampai bisa. Lewat batas → CircuitOpenError / TimeoutError.
+        """
+        if not self.enabled:
+            return
+        host = host_of(url_or_host)
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        br = self.breaker(host)
+        while br is not None:
+            rem = br.remaining()
+            if rem <= 0:
+                break
+            if deadline is not None and time.monotonic() + rem > deadline:
+                raise CircuitOpenError(f"{br.name} dijeda {rem:.0f}s (terlalu banyak 429/403/5xx)")
+            time.sleep(min(rem, 1.0))
+        self.bucket(host).acquire(deadline)
+
+    def report(self, url_or_host: str, status: Optional[int], retry_after: Optional[float] = None):
+        """status = kode HTTP, atau None untuk gagal koneksi."""
+        if not self.enabled:
+            return
+        host = host_of(url_or_host)
+        self.bucket(host).report(status, retry_after)
+        br = self.breaker(host)
+        if br is not None:
+            br.record(status is None or status in ERROR_STATUS)
+
+    def stats(self) -> dict:
+        with self._lock:
+            buckets, breakers = dict(self._buckets), dict(self._breakers)
+        return {
+            "hosts": {k: b.stats() for k, b in buckets.items()},
+            "platforms": {k: {"state": br.state(), "trips": br.trips, "paused_for_s": round(br.remaining(), 1)}
+                          for k, br in breakers.items()},
+        }
+
+_default: Optional[RateLimiter] = None
+_default_lock = threading.Lock()
+
+def limiter() -> RateLimiter:
+    """Limiter bersama satu proses (dipakai semua modul & semua thread)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            spec = os.getenv("SCRAPER_RATE_LIMITS", "").strip()
+            if spec.lower() == "off":
+                _default = RateLimiter(enabled=False)
+            else:
+                _default = RateLimiter({**DEFAULT_RATES, **_parse_rates(spec)})
+        return _default
+
+# ================== Integrasi requests ==================
+def _wire_bytes(resp, stream: bool) -> int:
+    """Byte respons di kabel (sebelum dekompresi) untuk metrik; body non-stream dibaca di sini."""
+    if stream:
+        return int(resp.headers.get("Content-Length") or 0)
+    try:
+        body = resp.content
+        return int(resp.raw.tell()) or len(body)
+    except Exception:
+        return 0
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter: ambil token sebelum kirim, laporkan status, ulangi 429/503 setelah backoff (maks. `retries`).
+    Dengan run metrik aktif, request/byte/retry dihitung ke tahap aktif (count_requests=False → byte & retry saja,
+    untuk sesi yang request-nya sudah dihitung di tempat lain).
+    """
+
+    def __init__(self, rl: Optional[RateLimiter] = None, retries: int = 2, max_wait: Optional[float] = None,
+                 count_requests: bool = True, **kwargs):
+        self.rl = rl
+        self.throttle_retries = retries
+        self.max_wait = max_wait
+        self.count_requests = count_requests
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        rl = self.rl or limiter()
+        n_req = int(self.count_requests)
+        for attempt in range(self.throttle_retries + 1):
+            if attempt:
+                count_metric(retries=1)
+            rl.acquire(request.url, self.max_wait)
+            try:
+                resp = super().send(request, **kwargs)
+            except Exception:
+                rl.report(request.url, None)
+                count_metric(requests=n_req)
+                raise
+            ra = retry_after_seconds(resp.headers.get("Retry-After"))
+            rl.report(request.url, resp.status_code, ra)
+            if current_metrics() is not None:
+                count_metric(requests=n_req, bytes=_wire_bytes(resp, kwargs.get("stream", False)))
+            if resp.status_code not in (429, 503) or attempt == self.throttle_retries:
+                return resp
+            resp.close()   # acquire berikutnya menunggu backoff host
+        return resp
+
+def mount(session, retries: int = 2, max_wait: Optional[float] = None, count_requests: bool = True):
+    """Pasang RateLimitedAdapter ke requests.Session (http & https). Return session yang sama."""
+    adapter = RateLimitedAdapter(retries=retries, max_wait=max_wait, count_requests=count_requests)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# ================== Pemanggilan non-requests ==================
+_STATUS_IN_TEXT = re.compile(r"(?:HTTP Error |status(?: code)?:? ?)(429|403)\b|too many requests|rate.?limit", re.I)
+
+def status_from_error(text: str) -> Optional[int]:
+    """Tebak status throttle dari pesan error (yt-dlp / log tweet-harvest)."""
+    m = _STATUS_IN_TEXT.search(text or "")
+    if not m:
+        return None
+    return int(m.group(1)) if m.group(1) else 429
+
+@contextmanager
+def throttled(url_or_host: str, max_wait: Optional[float] = None):
+    """
+    Bungkus satu pemanggilan tanpa Session (mis. ydl.extract_info): ambil token dulu, lalu laporkan
+    hasil. Exception berisi 429/403 dihitung sebagai throttle; exception lain tidak dilaporkan.
+    """
+    rl = limiter()
+    rl.acquire(url_or_host, max_wait)
+    count_metric(requests=1)   # satu pemanggilan = satu request di metrik (request internal tidak terlihat)
+    try:
+        yield
+    except Exception as e:
+        status = status_from_error(str(e))
+        if status is not None:   # error lain (video privat, dsb.) bukan sinyal throttle
+            rl.report(url_or_host, status)
+        raise
+    rl.report(url_or_host, 200)
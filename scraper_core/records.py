@@ -0,0 +1,264 @@
+# scraper_core/records.py
+# Satu tipe record post untuk keempat platform + konversi kolumnar ke/dari DataFrame.
+# Konverter per platform ada di modul platformnya (rows_to_records / entries_to_records / mini_to_records);
+# layout kolom lama tiap halaman tetap bisa dibentuk ulang lewat to_legacy_frame.
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from dateutil import tz
+
+PLATFORMS = ("instagram", "tiktok", "youtube", "x")
+
+# Urutan kolom frame terpadu (sama dengan urutan slot, tanpa `extra`)
+RECORD_COLUMNS = [
+    "platform", "post_id", "item", "account", "posted_at", "url", "image_url",
+    "caption", "likes", "views", "comments", "shares", "kind",
+]
+INT_COLUMNS = ("item", "likes", "views", "comments", "shares")
+
+class PostRecord:
+    """
+    Satu baris post (untuk album: satu gambar = satu record, dibedakan `item`).
+    posted_at = datetime aware UTC; angka = int atau None; extra = dict kolom khusus platform (opsional).
+    """
+    __slots__ = tuple(RECORD_COLUMNS) + ("extra",)
+
+    def __init__(self, platform: str, post_id: str, item: int = 1, account: str = "",
+                 posted_at: Optional[datetime] = None, url: str = "", image_url: Optional[str] = None,
+                 caption: str = "", likes: Optional[int] = None, views: Optional[int] = None,
+                 comments: Optional[int] = None, shares: Optional[int] = None, kind: str = "",
+                 extra: Optional[Dict[str, Any]] = None):
+        self.platform = platform
+        self.post_id = post_id
+        self.item = item
+        self.account = account
+        self.posted_at = posted_at
+        self.url = url
+        self.image_url = image_url
+        self.caption = caption
+        self.likes = likes
+        self.views = views
+        self.comments = comments
+        self.shares = shares
+        self.kind = kind
+        self.extra = extra
+
+    def __repr__(self):
+        return f"PostRecord({self.platform}:{self.post_id}#{self.item} @{self.account} {self.posted_at})"
+
+    def __eq__(self, other):
+        if not isinstance(other, PostRecord):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def as_dict(self) -> Dict[str, Any]:
+        d = {k: getattr(self, k) for k in RECORD_COLUMNS}
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+# ================== Helper konversi nilai ==================
+def to_int(v) -> Optional[int]:
+    """Angka dari int/float/str ("1,234") → int; kosong/NaN/tidak valid → None."""
+    if v is None or isinstance(v, bool):
+        return None
+    if isinstance(v, int):
+        return v
+    try:
+        f = float(str(v).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+    return None if f != f else int(f)
+
+def to_utc(v) -> Optional[datetime]:
+    """datetime / epoch / string ISO → datetime aware UTC (naive dianggap UTC)."""
+    if v is None or v == "":
+        return None
+    if isinstance(v, (int, float)):
+        if v != v:
+            return None
+        return datetime.fromtimestamp(float(v), tz=timezone.utc)
+    if isinstance(v, str):
+        try:
+            v = datetime.fromisoformat(v.strip())
+        except ValueError:
+            pass
+    if not isinstance(v, datetime):
+        ts = pd.to_datetime(v, errors="coerce", utc=True)
+        return None if pd.isna(ts) else ts.to_pydatetime()
+    if v.tzinfo is None:
+        return v.replace(tzinfo=timezone.utc)
+    return v.astimezone(timezone.utc)
+
+# ================== Kolumnar ==================
+def records_to_frame(records: Iterable[PostRecord]) -> pd.DataFrame:
+    """
+    List record → DataFrame bertipe (Int64 untuk angka, datetime64 UTC untuk posted_at).
+    Dibangun per kolom (satu list per slot), tanpa dict per baris.
+    """
+    records = records if isinstance(records, list) else list(records)
+    cols = {k: [getattr(r, k) for r in records] for k in RECORD_COLUMNS}
+    df = pd.DataFrame({
+        k: (pd.array(v, dtype="Int64") if k in INT_COLUMNS
+            else pd.to_datetime(pd.Series(v, dtype=object), utc=True) if k == "posted_at"
+            else pd.Series(v, dtype=object))
+        for k, v in cols.items()
+    }, columns=RECORD_COLUMNS)
+    extra_keys = list(dict.fromkeys(k for r in records if r.extra for k in r.extra))
+    for k in extra_keys:
+        df[k] = pd.Series([(r.extra or {}).get(k) for r in records], dtype=object)
+    return df
+
+def frame_to_records(df: pd.DataFrame) -> List[PostRecord]:
+    """Kebalikan records_to_frame (kolom di luar RECORD_COLUMNS masuk ke `extra`)."""
+    extra_cols = [c for c in df.columns if c not in RECORD_COLUMNS]
+    out = []
+    for row in df.to_dict("records"):
+        kw = {}
+        for k in RECORD_COLUMNS:
+            v = row.get(k)
+            if v is pd.NA or v is pd.NaT or (isinstance(v, float) and v != v):
+                v = None
+            elif k in INT_COLUMNS:
+                v = to_int(v)
+            elif k == "posted_at":
+                v = to_utc(v)
+            kw[k] = v
+        extra = {c: row[c] for c in extra_cols if row.get(c) is not None}
+        out.append(PostRecord(extra=extra or None, **kw))
+    return out
+
+# ================== Layout lama per halaman ==================
+_WIB = tz.gettz("Asia/Jakarta")
+
+def _fmt_time(s: pd.Series, zone, fmt: Optional[str]) -> pd.Series:
+    t = pd.to_datetime(s, utc=True).dt.tz_convert(zone)
+    if fmt is None:
+        return t.map(lambda x: x.isoformat() if pd.notna(x) else None)
+    return t.dt.strftime(fmt).where(t.notna(), None)
+
+def to_legacy_frame(df: pd.DataFrame, platform: str) -> pd.DataFrame:
+    """Frame terpadu → kolom lama halaman platform (untuk ekspor & tampilan yang sudah ada)."""
+    if platform == "instagram":
+        return pd.DataFrame({
+            "tanggal_post": _fmt_time(df["posted_at"], _WIB, None),
+            "gambar": df["image_url"],
+            "link_post": df["url"],
+            "caption": df["caption"],
+            "like": df["likes"],
+            "tipe": df["kind"],
+        })
+    if platform == "tiktok":
+        return pd.DataFrame({
+            "Tanggal Post": _fmt_time(df["posted_at"], tz.tzlocal(), "%Y-%m-%d %H:%M"),
+            "Gambar": df["image_url"],
+            "Link Post": df["url"],
+            "Caption": df["caption"],
+            "Like": df["likes"],
+            "Views": df["views"],
+            "Comments": df["comments"],
+            "Shares": df["shares"],
+        })
+    if platform == "youtube":
+        return pd.DataFrame({
+            "thumbnail_url": df["image_url"],
+            "title": df["caption"],
+            "published_date": _fmt_time(df["posted_at"], timezone.utc, "%Y-%m-%d"),
+            "published_text": df.get("published_text"),
+            "duration_text": df.get("duration_text"),
+            "like_count": df["likes"],
+            "video_url": df["url"],
+            "video_id": df["post_id"],
+            "description": df.get("description"),
+        })
+    if platform == "x":
+        return pd.DataFrame({
+            "Tanggal": df.get("date_raw", _fmt_time(df["posted_at"], timezone.utc, None)),
+            "Gambar": df["image_url"],
+            "Link": df["url"],
+            "Caption": df["caption"],
+            "Like": df["likes"],
+        })
+    raise ValueError(f"Platform tidak dikenal: {platform!r} (pilih: {', '.join(PLATFORMS)})")
+
+def _ints(s: pd.Series) -> pd.Series:
+    return pd.Series(np.trunc(pd.to_numeric(s, errors="coerce")), index=s.index).astype("Int64")
+
+def _strs(s) -> pd.Series:
+    return pd.Series(s, dtype=object).where(pd.notna(s), None)
+
+def legacy_to_frame(df: pd.DataFrame, platform: str, account: str = "") -> pd.DataFrame:
+    """
+    Kebalikan to_legacy_frame: frame kolom lama halaman → frame terpadu (RECORD_COLUMNS + extra),
+    dikonversi per kolom. Dipakai untuk ekspor kolumnar dari data yang sudah ada di sesi.
+    """
+    n = len(df)
+    idx = df.index
+    if platform == "instagram":
+        link = _strs(df["link_post"])
+        tipe = df["tipe"].fillna("").astype(str)
+        item = tipe.str.extract(r"^album_gambar_(\d+)$", expand=False)
+        out = {
+            "post_id": link.str.extract(r"/(?:p|reel|tv)/([^/?#]+)", expand=False).fillna(link),
+            "item": _ints(item).fillna(1),
+            "posted_at": pd.to_datetime(df["tanggal_post"], errors="coerce", utc=True, format="ISO8601"),
+            "url": link, "image_url": _strs(df["gambar"]), "caption": _strs(df["caption"]),
+            "likes": _ints(df["like"]), "kind": tipe,
+        }
+    elif platform == "tiktok":
+        link = _strs(df["Link Post"])
+        local = pd.to_datetime(df["Tanggal Post"], errors="coerce", format="%Y-%m-%d %H:%M")
+        out = {
+            "post_id": link.str.extract(r"/video/(\d+)", expand=False).fillna(link),
+            "posted_at": local.dt.tz_localize(tz.tzlocal(), ambiguous="NaT", nonexistent="NaT").dt.tz_convert("UTC"),
+            "url": link, "image_url": _strs(df["Gambar"]), "caption": _strs(df["Caption"]),
+            "likes": _ints(df["Like"]), "views": _ints(df["Views"]),
+            "comments": _ints(df["Comments"]), "shares": _ints(df["Shares"]), "kind": "video",
+        }
+    elif platform == "youtube":
+        out = {
+            "post_id": _strs(df["video_id"]),
+            "posted_at": pd.to_datetime(df["published_date"], errors="coerce", utc=True, format="%Y-%m-%d"),
+            "url": _strs(df["video_url"]), "image_url": _strs(df["thumbnail_url"]), "caption": _strs(df["title"]),
+            "likes": _ints(df["like_count"]) if "like_count" in df.columns else None, "kind": "video",
+        }
+        for c in ("published_text", "duration_text", "description"):
+            if c in df.columns:
+                out[c] = _strs(df[c])
+    elif platform == "x":
+        link = _strs(df["Link"])
+        out = {
+            "post_id": link.str.extract(r"/status(?:es)?/(\d+)", expand=False).fillna(link),
+            "posted_at": pd.to_datetime(df["Tanggal"], errors="coerce", utc=True, format="mixed"),
+            "url": link, "image_url": _strs(df["Gambar"]), "caption": _strs(df["Caption"]),
+            "likes": _ints(df["Like"]), "kind": "tweet", "date_raw": _strs(df["Tanggal"].astype(str)),
+        }
+    else:
+        raise ValueError(f"Platform tidak dikenal: {platform!r} (pilih: {', '.join(PLATFORMS)})")
+
+    frame = pd.DataFrame(index=idx)
+    for k in RECORD_COLUMNS:
+        v = out.pop(k, None)
+        if k == "platform":
+            v = platform
+        elif k == "account":
+            v = account
+        if v is None:
+            if k == "item":
+                v = pd.array([1] * n, dtype="Int64")
+            else:
+                v = pd.array([None] * n, dtype="Int64") if k in INT_COLUMNS else None
+        frame[k] = v
+    for k in RECORD_COLUMNS:
+        if k in INT_COLUMNS:
+            frame[k] = frame[k].astype("Int64")
+        elif k != "posted_at":
+            frame[k] = _strs(frame[k])
+    frame["posted_at"] = pd.to_datetime(frame["posted_at"], utc=True)
+    frame["image_url"] = frame["image_url"].where(frame["image_url"].astype(bool), None)
+    for k, v in out.items():
+        frame[k] = v
+    return frame.reset_index(drop=True)
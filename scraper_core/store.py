@@ -0,0 +1,226 @@
+# scraper_core/store.py
+# Penyimpanan hasil lokal (SQLite): satu tabel `posts` untuk keempat platform, skema = frame terpadu
+# (scraper_core.records). Upsert per ID post stabil (platform + post_id + item):
+#   Instagram = shortcode, TikTok/YouTube = video ID, X = tweet ID.
+# Index (platform, account, posted_at) → potongan rentang tanggal satu akun dibaca dalam milidetik, tanpa jaringan.
+#
+# Lokasi file: ENV SCRAPER_STORE (default .cache/results.sqlite3); SCRAPER_STORE=off → nonaktif.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from scraper_core.records import INT_COLUMNS, RECORD_COLUMNS, PostRecord, records_to_frame
+
+STORE_PATH = os.getenv("SCRAPER_STORE", os.path.join(".cache", "results.sqlite3"))
+WIB = "Asia/Jakarta"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    platform   TEXT NOT NULL,
+    post_id    TEXT NOT NULL,
+    item       INTEGER NOT NULL DEFAULT 1,
+    account    TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    posted_at  INTEGER,            -- epoch detik UTC
+    url        TEXT,
+    image_url  TEXT,
+    caption    TEXT,
+    likes      INTEGER,
+    views      INTEGER,
+    comments   INTEGER,
+    shares     INTEGER,
+    kind       TEXT,
+    extra      TEXT,               -- JSON kolom khusus platform
+    fetched_at INTEGER NOT NULL,   -- epoch detik upsert terakhir
+    PRIMARY KEY (platform, post_id, item)
+);
+CREATE INDEX IF NOT EXISTS ix_posts_account_time ON posts (platform, account, posted_at);
+"""
+
+_COLS = RECORD_COLUMNS + ["extra", "fetched_at"]
+# Nilai kosong dari scrape baru tidak menimpa nilai lama (mis. YouTube tanpa enrichment → like_count None)
+_KEEP_OLD = ("posted_at", "url", "image_url", "caption", "likes", "views", "comments", "shares", "kind", "extra")
+_UPSERT = (
+    f"INSERT INTO posts ({', '.join(_COLS)}) VALUES ({', '.join('?' * len(_COLS))}) "
+    "ON CONFLICT (platform, post_id, item) DO UPDATE SET account = excluded.account, "
+    + ", ".join(f"{c} = COALESCE(excluded.{c}, posts.{c})" for c in _KEEP_OLD)
+    + ", fetched_at = excluded.fetched_at"
+)
+
+def _day_bounds(start: Optional[date], end: Optional[date]):
+    """Rentang hari WIB inklusif → (epoch_awal, epoch_akhir_eksklusif)."""
+    lo = hi = None
+    if start:
+        lo = int(pd.Timestamp(datetime.combine(start, datetime.min.time())).tz_localize(WIB).timestamp())
+    if end:
+        hi = int(pd.Timestamp(datetime.combine(end + timedelta(days=1), datetime.min.time())).tz_localize(WIB).timestamp())
+    return lo, hi
+
+def _py(v):
+    """NaN/NA/NaT → None, numpy scalar → python."""
+    if v is None or v is pd.NA or v is pd.NaT:
+        return None
+    if isinstance(v, float) and v != v:
+        return None
+    return v.item() if hasattr(v, "item") else v
+
+class ResultStore:
+    """Store SQLite thread-safe (satu koneksi per thread, WAL → baca tidak menunggu tulis)."""
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with self._conn() as con:
+            con.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=30)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con = con
+        return con
+
+    # ---------- tulis ----------
+    def upsert_frame(self, frame: pd.DataFrame) -> int:
+        """Upsert frame terpadu (RECORD_COLUMNS + kolom extra). Return jumlah baris yang ditulis."""
+        if frame is None or frame.empty:
+            return 0
+        n = len(frame)
+        posted = pd.to_datetime(frame["posted_at"], utc=True)
+        secs = (posted - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+        cols = {c: [_py(v) for v in frame[c].tolist()] for c in RECORD_COLUMNS if c != "posted_at"}
+        cols["posted_at"] = [None if v is None or v != v else int(v) for v in secs.tolist()]
+        cols["item"] = [v if v is not None else 1 for v in cols["item"]]
+        cols["account"] = [v or "" for v in cols["account"]]
+        extra_cols = [c for c in frame.columns if c not in RECORD_COLUMNS]
+        if extra_cols:
+            ex = [{k: _py(v) for k, v in zip(extra_cols, vals) if _py(v) is not None}
+                  for vals in zip(*(frame[c].tolist() for c in extra_cols))]
+            cols["extra"] = [json.dumps(e, ensure_ascii=False, default=str) if e else None for e in ex]
+        else:
+            cols["extra"] = [None] * n
+        cols["fetched_at"] = [int(time.time())] * n
+        rows = list(zip(*(cols[c] for c in _COLS)))
+        con = self._conn()
+        with con:
+            con.executemany(_UPSERT, rows)
+        return n
+
+    def upsert_records(self, records: Iterable[PostRecord]) -> int:
+        return self.upsert_frame(records_to_frame(records))
+
+    # ---------- baca ----------
+    def query(self, platform: Optional[str] = None, account: Optional[str] = None,
+              start: Optional[date] = None, end: Optional[date] = None,
+              limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Frame terpadu (tipe sama dengan records_to_frame), terbaru dulu.
+        start/end = hari WIB inklusif; platform/account/rentang memakai index (platform, account, posted_at).
+        """
+        where, params = [], []
+        if platform:
+            where.append("platform = ?")
+            params.append(platform)
+        if account is not None:
+            where.append("account = ?")
+            params.append(account.lstrip("@"))
+        lo, hi = _day_bounds(start, end)
+        if lo is not None:
+            where.append("posted_at >= ?")
+            params.append(lo)
+        if hi is not None:
+            where.append("posted_at < ?")
+            params.append(hi)
+        sql = f"SELECT {', '.join(RECORD_COLUMNS)}, extra FROM posts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY posted_at DESC, post_id, item"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        cur = self._conn().execute(sql, params)
+        data = cur.fetchall()
+        cols = list(zip(*data)) if data else [()] * (len(RECORD_COLUMNS) + 1)
+        df = pd.DataFrame({
+            c: (pd.array(v, dtype="Int64") if c in INT_COLUMNS
+                else pd.to_datetime(pd.Series(v, dtype="float64"), unit="s", utc=True).dt.as_unit("us") if c == "posted_at"
+                else pd.Series(v, dtype=object))
+            for c, v in zip(RECORD_COLUMNS, cols)
+        }, columns=RECORD_COLUMNS)
+        extras = cols[-1]
+        if any(extras):
+            ex = pd.DataFrame.from_records([json.loads(e) if e else {} for e in extras], index=df.index)
+            for c in ex.columns:
+                df[c] = ex[c].astype(object).where(ex[c].notna(), None)
+        return df
+
+    def accounts(self, platform: Optional[str] = None) -> pd.DataFrame:
+        """Ringkasan per akun: jumlah baris, post terlama/terbaru, upsert terakhir."""
+        sql = ("SELECT platform, account, COUNT(*) AS rows, MIN(posted_at) AS first_post, "
+               "MAX(posted_at) AS last_post, MAX(fetched_at) AS fetched_at FROM posts")
+        params = []
+        if platform:
+            sql += " WHERE platform = ?"
+            params.append(platform)
+        sql += " GROUP BY platform, account ORDER BY platform, account"
+        df = pd.read_sql_query(sql, self._conn(), params=params)
+        for c in ("first_post", "last_post", "fetched_at"):
+            df[c] = pd.to_datetime(df[c], unit="s", utc=True)
+        return df
+
+    def delete(self, platform: str, account: Optional[str] = None) -> int:
+        where, params = "platform = ?", [platform]
+        if account is not None:
+            where += " AND account = ?"
+            params.append(account.lstrip("@"))
+        con = self._conn()
+        with con:
+            return con.execute(f"DELETE FROM posts WHERE {where}", params).rowcount
+
+    def close(self):
+        con = getattr(self._local, "con", None)
+        if con is not None:
+            con.close()
+            self._local.con = None
+
+_default_store: Optional[ResultStore] = None
+_default_lock = threading.Lock()
+
+def default_store() -> Optional[ResultStore]:
+    """Store bersama satu proses (None kalau SCRAPER_STORE=off)."""
+    global _default_store
+    if STORE_PATH.strip().lower() in ("", "off", "0"):
+        return None
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ResultStore()
+        return _default_store
+
+# ================== Layout lama per halaman ==================
+def save_legacy(df: pd.DataFrame, platform: str, account: str, store: Optional[ResultStore] = None) -> int:
+    """Upsert frame kolom lama halaman (IG_COLUMNS, TT_COLUMNS, ...) ke store. 0 kalau store nonaktif/kosong."""
+    from scraper_core.records import legacy_to_frame
+    store = store or default_store()
+    if store is None or df is None or df.empty:
+        return 0
+    return store.upsert_frame(legacy_to_frame(df, platform, (account or "").lstrip("@")))
+
+def load_legacy(platform: str, account: str, start: Optional[date] = None, end: Optional[date] = None,
+                limit: Optional[int] = None, store: Optional[ResultStore] = None) -> pd.DataFrame:
+    """Potongan store → frame kolom lama halaman (nilai kosong = None, siap untuk eksportir yang ada)."""
+    from scraper_core.records import to_legacy_frame
+    store = store or default_store()
+    if store is None:
+        raise RuntimeError("Store lokal nonaktif (SCRAPER_STORE=off).")
+    df = to_legacy_frame(store.query(platform, (account or "").lstrip("@"), start, end, limit), platform)
+    return df.astype(object).where(df.notna(), None)
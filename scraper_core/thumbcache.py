@@ -0,0 +1,226 @@
+# scraper_core/thumbcache.py
+# Cache gambar di disk, key = URL kanonik (sha256), simpan original + varian resize.
+# Dibatasi total byte (LRU: file yang paling lama tidak dipakai dibuang duluan).
+#
+# Layout:  <root>/<sha[:2]>/<sha>.<varian>   (varian "orig" = bytes mentah dari CDN)
+#
+# static_cache(): cache kedua khusus thumbnail preview dashboard, di <repo>/static/thumbs (berkas .jpg) yang
+# dilayani Streamlit sendiri di /app/static/thumbs/... (server.enableStaticServing di .streamlit/config.toml).
+# Browser tiap penonton mengambil JPEG kecil dari server app, bukan gambar penuh dari CDN pihak ketiga.
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+CACHE_DIR = os.getenv("SCRAPER_THUMB_CACHE", os.path.join(".cache", "thumbs"))
+CACHE_MAX_BYTES = int(float(os.getenv("SCRAPER_THUMB_CACHE_MB", "512")) * 1024 * 1024)
+
+# Streamlit hanya melayani folder `static/` di samping skrip utama (app.py / halaman di root repo),
+# dan mematikan static serving kalau folder itu > 1 GB saat start → anggaran jauh di bawahnya.
+STATIC_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+STATIC_DIR = os.path.join(STATIC_ROOT, "thumbs")
+STATIC_MAX_BYTES = int(float(os.getenv("SCRAPER_STATIC_THUMBS_MB", "256")) * 1024 * 1024)
+# Prefix URL folder static (ubah kalau app jalan di bawah server.baseUrlPath / reverse proxy)
+STATIC_URL = os.getenv("SCRAPER_STATIC_URL", "/app/static").rstrip("/")
+
+# CDN dengan query bertanda tangan (berubah tiap fetch, isi gambar sama) → parameter tanda tangan,
+# kedaluwarsa & token sesi CDN dibuang dari key. Parameter lain tetap (mis. stp= di cdninstagram/fbcdn
+# memilih ukuran & crop → rendisi berbeda = key berbeda).
+SIGNED_CDN_SUFFIXES = (
+    "cdninstagram.com", "fbcdn.net",
+    "tiktokcdn.com", "tiktokcdn-us.com", "tiktokcdn-eu.com", "byteimg.com", "ibyteimg.com",
+)
+SIGNED_QUERY_PARAMS = {"oh", "oe", "x-expires", "x-signature", "signature", "expires", "policy"}
+SIGNED_QUERY_PREFIXES = ("_nc_",)   # _nc_ht, _nc_ohc, _nc_gid, ... (routing/sesi CDN Meta)
+
+def canonical_url(url: str) -> str:
+    """Normalisasi URL: host lowercase, tanpa fragment, query terurut (tanpa tanda tangan untuk CDN bertanda tangan)."""
+    sp = urlsplit(url.strip())
+    host = sp.netloc.lower()
+    params = parse_qsl(sp.query, keep_blank_values=True)
+    if host.endswith(SIGNED_CDN_SUFFIXES):
+        params = [(k, v) for k, v in params
+                  if k.lower() not in SIGNED_QUERY_PARAMS and not k.lower().startswith(SIGNED_QUERY_PREFIXES)]
+    query = urlencode(sorted(params))
+    return urlunsplit((sp.scheme.lower(), host, sp.path, query, ""))
+
+def _safe_variant(variant: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in variant) or "orig"
+
+class ThumbnailCache:
+    """Cache disk thread-safe dengan anggaran byte & LRU. Counter: hits / misses / evictions."""
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES, suffix: str = ""):
+        self.root = root
+        self.max_bytes = int(max_bytes)
+        self.suffix = suffix   # ekstensi file (mis. ".jpg" supaya dilayani dengan MIME yang benar)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, int]"] = None   # path → size, urut LRU (lama → baru)
+        self._total = 0
+
+    # ---------- index ----------
+    def _load_index(self):
+        if self._index is not None:
+            return
+        entries = []
+        if os.path.isdir(self.root):
+            for dirpath, _, files in os.walk(self.root):
+                for fn in files:
+                    if fn.startswith(".tmp"):
+                        continue
+                    p = os.path.join(dirpath, fn)
+                    try:
+                        st = os.stat(p)
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, p, st.st_size))
+        entries.sort()
+        self._index = OrderedDict((p, size) for _, p, size in entries)
+        self._total = sum(size for _, _, size in entries)
+
+    def _path(self, url: str, variant: str) -> str:
+        h = hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, h[:2], f"{h}.{_safe_variant(variant)}{self.suffix}")
+
+    def _evict(self):
+        while self._total > self.max_bytes and self._index:
+            p, size = self._index.popitem(last=False)
+            self._total -= size
+            self.evictions += 1
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+    # ---------- API ----------
+    def get(self, url: str, variant: str = "orig", count: bool = True) -> Optional[bytes]:
+        """Bytes dari cache atau None. count=False → tidak dihitung ke hits/misses."""
+        p = self._path(url, variant)
+        with self._lock:
+            self._load_index()
+            try:
+                with open(p, "rb") as f:
+                    data = f.read()
+            except OSError:
+                size = self._index.pop(p, None)
+                if size is not None:
+                    self._total -= size
+                if count:
+                    self.misses += 1
+                return None
+            if count:
+                self.hits += 1
+            # tandai baru dipakai (mtime dipakai sebagai urutan LRU saat index dibangun ulang)
+            if p in self._index:
+                self._index.move_to_end(p)
+            else:
+                self._index[p] = len(data)
+                self._total += len(data)
+        try:
+            os.utime(p)
+        except OSError:
+            pass
+        return data
+
+    def locate(self, url: str, variant: str = "orig") -> Optional[str]:
+        """Path file di cache tanpa membacanya (None kalau belum ada); ditandai baru dipakai."""
+        p = self._path(url, variant)
+        try:
+            os.utime(p)
+        except OSError:
+            with self._lock:
+                size = self._index.pop(p, None) if self._index is not None else None
+                if size is not None:
+                    self._total -= size
+                self.misses += 1
+            return None
+        with self._lock:
+            self._load_index()
+            self.hits += 1
+            if p in self._index:
+                self._index.move_to_end(p)
+            else:
+                try:
+                    size = os.path.getsize(p)
+                except OSError:
+                    size = 0
+                self._index[p] = size
+                self._total += size
+        return p
+
+    def put(self, url: str, data: bytes, variant: str = "orig") -> Optional[str]:
+        """Simpan (atomik) → path file, atau None kalau tidak disimpan."""
+        if not data or len(data) > self.max_bytes:
+            return None
+        p = self._path(url, variant)
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        # tulis atomik: file sementara → rename
+        fd, tmp = tempfile.mkstemp(prefix=".tmp", dir=os.path.dirname(p))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, p)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return None
+        with self._lock:
+            self._load_index()
+            old = self._index.pop(p, None)
+            if old is not None:
+                self._total -= old
+            self._index[p] = len(data)
+            self._total += len(data)
+            self._evict()
+        return p
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._load_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "files": len(self._index),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+            }
+
+_default_cache: Optional[ThumbnailCache] = None
+_default_lock = threading.Lock()
+
+def default_cache() -> Optional[ThumbnailCache]:
+    """Cache bersama satu proses (None kalau SCRAPER_THUMB_CACHE_MB=0)."""
+    global _default_cache
+    if CACHE_MAX_BYTES <= 0:
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ThumbnailCache()
+        return _default_cache
+
+_static_cache: Optional[ThumbnailCache] = None
+
+def static_cache() -> Optional[ThumbnailCache]:
+    """Cache thumbnail preview di static/thumbs (None kalau SCRAPER_STATIC_THUMBS_MB=0 → preview hot-link CDN)."""
+    global _static_cache
+    if STATIC_MAX_BYTES <= 0:
+        return None
+    with _default_lock:
+        if _static_cache is None:
+            _static_cache = ThumbnailCache(STATIC_DIR, STATIC_MAX_BYTES, suffix=".jpg")
+        return _static_cache
+
+def static_url(path: str) -> str:
+    """Path file di bawah static/ → URL yang dilayani Streamlit (/app/static/...)."""
+    rel = os.path.relpath(path, STATIC_ROOT).replace(os.sep, "/")
+    return f"{STATIC_URL}/{rel}"
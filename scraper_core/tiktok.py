@@ -0,0 +1,409 @@
+# scraper_core/tiktok.py
+# Inti scraper TikTok (yt-dlp) tanpa Streamlit.
+# yt-dlp (ratusan extractor, ±0,3 s import) baru dimuat di fungsi yang memanggilnya.
+
+import base64
+import os
+import json
+import tempfile
+import threading
+from contextlib import suppress
+from datetime import datetime, date
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from scraper_core.concurrency import ordered_map
+from scraper_core.journal import CHECKPOINT_EVERY
+from scraper_core.images import (
+    fetch_images, image_size, iter_images, png_fit_width, static_thumbnail_saver, static_thumbnails,
+)
+from scraper_core.metrics import span
+from scraper_core.ratelimit import throttled
+from scraper_core.xlsx import XlsxStream
+
+# Jumlah ekstraksi video paralel (bisa diubah lewat ENV)
+TT_WORKERS = int(os.getenv("SCRAPER_TIKTOK_WORKERS", "4"))
+
+TT_COLUMNS = ["Tanggal Post", "Gambar", "Link Post", "Caption", "Like", "Views", "Comments", "Shares"]
+
+UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# --------------------- Helpers umum ---------------------
+def _parse_date(entry: Dict[str, Any]) -> Optional[str]:
+    ts = entry.get("timestamp")
+    if ts is not None:
+        try:
+            return datetime.fromtimestamp(int(float(ts))).strftime("%Y-%m-%d %H:%M")
+        except Exception:
+            pass
+    up = entry.get("upload_date")
+    if up:
+        try:
+            dt = datetime.strptime(str(up), "%Y%m%d")
+            return dt.strftime("%Y-%m-%d 00:00")
+        except Exception:
+            pass
+    return None
+
+def _get_thumb_url(entry: Dict[str, Any]) -> Optional[str]:
+    if entry.get("thumbnail"):
+        return entry["thumbnail"]
+    thumbs = entry.get("thumbnails") or []
+    if isinstance(thumbs, list) and thumbs:
+        return (thumbs[-1] or {}).get("url")
+    return None
+
+def _get_int(entry: Dict[str, Any], *keys: str) -> Optional[int]:
+    for k in keys:
+        v = entry.get(k)
+        if isinstance(v, (int, float)) and not pd.isna(v):
+            return int(v)
+    return None
+
+def _normalize_row(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "Tanggal Post": _parse_date(entry),
+        "Gambar": _get_thumb_url(entry),     # URL (nanti diubah ke bytes utk preview)
+        "Link Post": entry.get("webpage_url") or entry.get("url"),
+        "Caption": entry.get("title") or entry.get("description"),
+        "Like": _get_int(entry, "like_count", "likes"),
+        "Views": _get_int(entry, "view_count", "views", "play_count"),
+        "Comments": _get_int(entry, "comment_count", "comments"),
+        "Shares": _get_int(entry, "repost_count", "share_count", "shares"),
+    }
+
+def build_dataframe(entries: List[Dict[str, Any]]) -> pd.DataFrame:
+    rows = [_normalize_row(e) for e in entries]
+    df = pd.DataFrame(rows, columns=TT_COLUMNS)
+    if df["Tanggal Post"].notna().any():
+        df["__dt"] = pd.to_datetime(df["Tanggal Post"], errors="coerce")
+        df = df.sort_values("__dt", ascending=False)
+        df["Tanggal Post"] = df["__dt"].dt.strftime("%Y-%m-%d %H:%M")
+        df = df.drop(columns="__dt")
+    return df
+
+def entries_to_records(entries: List[Dict[str, Any]], account: str):
+    """Entry yt-dlp → PostRecord (posted_at dari timestamp, fallback upload_date)."""
+    from scraper_core.records import PostRecord, to_utc
+    out = []
+    for e in entries:
+        posted = to_utc(e.get("timestamp"))
+        if posted is None and e.get("upload_date"):
+            try:
+                posted = to_utc(datetime.strptime(str(e["upload_date"]), "%Y%m%d"))
+            except ValueError:
+                pass
+        link = e.get("webpage_url") or e.get("url") or ""
+        out.append(PostRecord(
+            "tiktok", str(e.get("id") or link), account=e.get("uploader") or account,
+            posted_at=posted, url=link, image_url=_get_thumb_url(e),
+            caption=e.get("title") or e.get("description") or "",
+            likes=_get_int(e, "like_count", "likes"),
+            views=_get_int(e, "view_count", "views", "play_count"),
+            comments=_get_int(e, "comment_count", "comments"),
+            shares=_get_int(e, "repost_count", "share_count", "shares"),
+            kind="video",
+        ))
+    return out
+
+def write_netscape_from_json(json_bytes: bytes) -> str:
+    data = json.loads(json_bytes.decode("utf-8"))
+    if not isinstance(data, list):
+        raise ValueError("Format cookies JSON tidak valid: harus list of objects")
+    fd, path = tempfile.mkstemp(prefix="tiktok_cookies_", suffix=".txt")
+    os.close(fd)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# Netscape HTTP Cookie File\n")
+        f.write("# Generated by scraper_core (TikTok).\n")
+        for c in data:
+            domain = c.get("domain") or c.get("host") or ""
+            if not domain:
+                continue
+            include_subdomains = "TRUE" if (domain.startswith(".") or (c.get("hostOnly") is False)) else "FALSE"
+            path_cookie = c.get("path") or "/"
+            secure = "TRUE" if c.get("secure") else "FALSE"
+            exp_raw = c.get("expirationDate")
+            if exp_raw is None or c.get("session"):
+                expires = 0
+            else:
+                try:
+                    expires = int(float(exp_raw))
+                except Exception:
+                    expires = 0
+            name = str(c.get("name", ""))
+            value = str(c.get("value", ""))
+            f.write(f"{domain}\t{include_subdomains}\t{path_cookie}\t{secure}\t{expires}\t{name}\t{value}\n")
+    return path
+
+def _cookies_dict_from_json_bytes(cookie_json_bytes: Optional[bytes]) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    if not cookie_json_bytes:
+        return out
+    try:
+        arr = json.loads(cookie_json_bytes.decode("utf-8"))
+        if isinstance(arr, list):
+            for c in arr:
+                name, value = c.get("name"), c.get("value")
+                if name and value:
+                    out[name] = value
+    except Exception:
+        pass
+    return out
+
+THUMB_HEADERS = {
+    "User-Agent": UA,
+    "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
+    "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+def build_preview_df_and_images(df_url: pd.DataFrame, cookie_json_bytes: Optional[bytes],
+                                workers: Optional[int] = None, on_progress=None) -> Tuple[pd.DataFrame, List[bytes]]:
+    """
+    Thumbnail server-side (Referer + cookies, paralel) → bytes PNG lebar 120px (untuk Excel), urut sesuai baris.
+    Kolom Gambar di df preview = URL /app/static/thumbs/... (atau bytes PNG kalau static cache dimatikan).
+    """
+    df_prev = df_url.copy()
+    # varian static/thumbs dibuat dari unduhan yang sama → static_thumbnails di bawah cukup stat file
+    save_static = static_thumbnail_saver()
+    pngs = fetch_images(
+        df_url["Gambar"].tolist(),
+        transform=png_fit_width(120, upscale=True),   # Resize kecil untuk preview (komposit alpha → putih)
+        workers=workers,
+        headers=THUMB_HEADERS,
+        cookies=_cookies_dict_from_json_bytes(cookie_json_bytes),
+        referers=[ref or "https://www.tiktok.com/" for ref in df_url["Link Post"].tolist()],
+        on_raw=save_static,
+        on_progress=on_progress,
+    )
+    imgs: List[bytes] = [png if png is not None else b"" for png in pngs]
+    if save_static is None:
+        df_prev["Gambar"] = imgs  # bytes → tampil di ImageColumn tanpa hotlink
+        return df_prev, imgs
+    # JPEG kecil di static/thumbs (sudah dibuat saat unduhan di atas) → browser memuat
+    # /app/static/... alih-alih PNG base64 di payload tabel; gagal → data URI dari PNG (tetap tanpa hotlink)
+    thumbs = static_thumbnails(
+        [u if png else None for u, png in zip(df_url["Gambar"].tolist(), imgs)],   # gagal tadi → tidak dicoba lagi
+        workers=workers,
+        headers=THUMB_HEADERS,
+        cookies=_cookies_dict_from_json_bytes(cookie_json_bytes),
+        referers=[ref or "https://www.tiktok.com/" for ref in df_url["Link Post"].tolist()],
+    )
+    df_prev["Gambar"] = [
+        t if t and not t.startswith("http")
+        else ("data:image/png;base64," + base64.b64encode(png).decode("ascii") if png else None)
+        for t, png in zip(thumbs, imgs)
+    ]
+    return df_prev, imgs
+
+def iter_preview_images(df_url: pd.DataFrame, cookie_json_bytes: Optional[bytes],
+                        workers: Optional[int] = None, on_progress=None):
+    """Sama dengan build_preview_df_and_images tapi streaming (urut baris) — untuk ekspor Excel tanpa preview."""
+    return iter_images(
+        df_url["Gambar"].tolist(),
+        transform=png_fit_width(120, upscale=True),
+        workers=workers,
+        headers=THUMB_HEADERS,
+        cookies=_cookies_dict_from_json_bytes(cookie_json_bytes),
+        referers=[ref or "https://www.tiktok.com/" for ref in df_url["Link Post"].tolist()],
+        on_progress=on_progress,
+    )
+
+def make_excel_with_images(df_meta: pd.DataFrame, preloaded_images: Optional[Iterable[Optional[bytes]]]):
+    """
+    Excel dengan thumbnail di kolom B, ditulis streaming (scraper_core.xlsx) → file biner sementara (posisi 0).
+    preloaded_images: list bytes preview, atau iterator (mis. iter_images) supaya gambar tidak ditumpuk di RAM.
+    """
+    xs = XlsxStream("TikTok", TT_COLUMNS,
+                    widths={chr(64 + i): w for i, w in enumerate([18, 20, 45, 60, 12, 12, 12, 12], start=1)})
+    images = iter(preloaded_images or ())
+    for row_dict in df_meta.to_dict("records"):
+        # Pakai image bytes yang sama dengan preview (konsisten; anti putih)
+        png_bytes = next(images, None)
+        height = None
+        if png_bytes:
+            try:
+                height = image_size(png_bytes)[1] * 0.75
+            except Exception:
+                height = 90
+        link_url = row_dict.get("Link Post")
+        xs.append([
+            row_dict.get("Tanggal Post"),
+            None,
+            xs.cell("Buka", hyperlink=link_url or None),
+            xs.cell(row_dict.get("Caption"), wrap=True, vertical="top"),
+            row_dict.get("Like"),
+            row_dict.get("Views"),
+            row_dict.get("Comments"),
+            row_dict.get("Shares"),
+        ], image=png_bytes, image_col="B", height=height)
+    return xs.finish()
+
+def fetch_user_videos(user: str, limit: int, cookies_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    profile_url = f"https://www.tiktok.com/@{user}"
+    ydl_opts = {
+        "quiet": True,
+        "skip_download": True,
+        "extract_flat": False,
+        "ignoreerrors": True,
+        "playlistend": limit,
+        "http_headers": {"User-Agent": UA},
+    }
+    if cookies_path:
+        ydl_opts["cookiefile"] = cookies_path
+
+    from yt_dlp import YoutubeDL
+
+    entries: List[Dict[str, Any]] = []
+    with YoutubeDL(ydl_opts) as ydl:
+        with span("ytdlp_list"), throttled(profile_url):
+            info = ydl.extract_info(profile_url, download=False)
+        if not info:
+            return []
+        if isinstance(info, dict) and "entries" in info and isinstance(info["entries"], list):
+            for ent in info["entries"]:
+                if len(entries) >= limit:
+                    break
+                if ent is None:
+                    continue
+                if ent.get("_type") == "url" and ent.get("url"):
+                    try:
+                        with span("ytdlp_extract"), throttled(ent["url"]):
+                            vinfo = ydl.extract_info(ent["url"], download=False)
+                        if vinfo:
+                            entries.append(vinfo)
+                    except Exception:
+                        continue
+                else:
+                    entries.append(ent)
+        else:
+            entries.append(info)
+    return entries[:limit]
+
+def list_user_entries(user: str, limit: int, cookies_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Daftar video profil secara flat (tanpa detail per video) → entri {_type: url, url, id, ...}."""
+    profile_url = f"https://www.tiktok.com/@{user}"
+    ydl_opts = {
+        "quiet": True,
+        "skip_download": True,
+        "extract_flat": "in_playlist",
+        "ignoreerrors": True,
+        "playlistend": limit,
+        "http_headers": {"User-Agent": UA},
+    }
+    if cookies_path:
+        ydl_opts["cookiefile"] = cookies_path
+    from yt_dlp import YoutubeDL
+    with YoutubeDL(ydl_opts) as ydl, span("ytdlp_list"), throttled(profile_url):
+        info = ydl.extract_info(profile_url, download=False)
+    if not info:
+        return []
+    if isinstance(info, dict) and isinstance(info.get("entries"), list):
+        return [ent for ent in info["entries"] if ent is not None][:limit]
+    return [info]
+
+# Field entri yt-dlp yang dipakai build_dataframe / entries_to_records — hanya ini yang masuk jurnal
+# (info lengkap satu video bisa puluhan KB karena daftar formats).
+_JOURNAL_KEYS = (
+    "id", "url", "webpage_url", "title", "description", "uploader", "timestamp", "upload_date",
+    "thumbnail", "like_count", "likes", "view_count", "views", "play_count",
+    "comment_count", "comments", "repost_count", "share_count", "shares",
+)
+
+def _journal_entry(info: Dict[str, Any]) -> Dict[str, Any]:
+    out = {k: info[k] for k in _JOURNAL_KEYS if info.get(k) is not None}
+    if not out.get("thumbnail") and info.get("thumbnails"):
+        out["thumbnails"] = info["thumbnails"][-1:]
+    return out
+
+def fetch_user_videos_parallel(user: str, limit: int, cookies_path: Optional[str] = None,
+                               workers: Optional[int] = None, on_progress=None,
+                               journal=None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Listing flat dulu, lalu ekstraksi detail tiap video di pool `workers` thread
+    (default TT_WORKERS). Urutan hasil = urutan profil.
+    Return (entries, errors); errors = [{"index", "url", "error"}] per video yang gagal.
+    on_progress(selesai, total) dipanggil per video.
+    journal (scraper_core.journal.open_journal) → daftar flat dicatat sekali, entri (field _JOURNAL_KEYS)
+    + indeks berikutnya di daftar itu di-checkpoint berkala; resume melewati listing & video yang sudah selesai.
+    """
+    flat = journal.meta.get("flat") if journal is not None else None
+    if flat is None:
+        flat = list_user_entries(user, limit, cookies_path)
+        if journal is not None:
+            journal.note(flat=[_journal_entry(ent) | {"_type": ent.get("_type")} for ent in flat])
+    ydl_opts = {
+        "quiet": True,
+        "skip_download": True,
+        "http_headers": {"User-Agent": UA},
+    }
+    if cookies_path:
+        ydl_opts["cookiefile"] = cookies_path
+    from yt_dlp import YoutubeDL
+    local = threading.local()
+
+    def extract(item):
+        idx, ent = item
+        if not (ent.get("_type") == "url" and ent.get("url")):
+            return ent, None
+        ydl = getattr(local, "ydl", None)
+        if ydl is None:
+            ydl = local.ydl = YoutubeDL(ydl_opts)
+        try:
+            with span("ytdlp_extract"), throttled(ent["url"]):
+                vinfo = ydl.extract_info(ent["url"], download=False)
+        except Exception as e:
+            return None, str(e)
+        return (vinfo, None) if vinfo else (None, "yt-dlp tidak mengembalikan data")
+
+    resume = journal.cursor if journal is not None else None
+    entries: List[Dict[str, Any]] = list(journal.rows) if resume else []
+    slim = list(entries)    # versi jurnal dari entries (field _JOURNAL_KEYS saja)
+    errors: List[Dict[str, Any]] = list(resume.get("errors") or []) if resume else []
+    start = int(resume["index"]) if resume else 0
+    total = len(flat)
+    mark, since = None, 0   # mark = (cursor, len(slim)) sebelum video yang sedang diproses
+    try:
+        for done, ((idx, ent), (vinfo, err)) in enumerate(
+                ordered_map(extract, list(enumerate(flat))[start:], workers or TT_WORKERS, thread_name_prefix="tiktok"),
+                start=start + 1):
+            if journal is not None:
+                mark = ({"index": idx, "errors": list(errors)}, len(slim))
+                if since >= CHECKPOINT_EVERY:
+                    journal.checkpoint(slim, mark[0])
+                    since = 0
+                since += 1
+            if vinfo is not None:
+                entries.append(vinfo)
+                if journal is not None:
+                    slim.append(_journal_entry(vinfo))
+            else:
+                errors.append({"index": idx, "url": ent.get("url") or ent.get("webpage_url"), "error": err})
+            if on_progress:
+                on_progress(done, total)
+    except BaseException:
+        if journal is not None and mark is not None:
+            with suppress(OSError):
+                journal.checkpoint(slim, mark[0], upto=mark[1])
+        raise
+    finally:
+        if journal is not None:
+            journal.close()
+    if journal is not None:
+        journal.finish()
+    return entries[:limit], errors
+
+def apply_date_filter(df: pd.DataFrame, start_d: Optional[date], end_d: Optional[date]) -> pd.DataFrame:
+    if start_d is None or end_d is None or df.empty:
+        return df
+    sdt = pd.to_datetime(start_d.strftime("%Y-%m-%d") + " 00:00")
+    edt = pd.to_datetime(end_d.strftime("%Y-%m-%d") + " 23:59:59")
+    tmp = df.copy()
+    tmp["__dt"] = pd.to_datetime(tmp["Tanggal Post"], errors="coerce")
+    tmp = tmp[(tmp["__dt"] >= sdt) & (tmp["__dt"] <= edt)]
+    tmp = tmp.drop(columns="__dt")
+    return tmp
@@ -0,0 +1,746 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# scraper_core/x.py
+# Inti scraper X (tweet-harvest) tanpa Streamlit.
+
+import os, re, hashlib, json, secrets, subprocess, shlex, signal, threading, time, queue
+import contextvars
+from io import BytesIO
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import pandas as pd
+from pandas.errors import EmptyDataError, ParserError
+
+from scraper_core.images import image_size, iter_images, png_full, png_thumbnail
+from scraper_core.metrics import current as current_metrics, span
+from scraper_core.ratelimit import CircuitOpenError, limiter, status_from_error
+from scraper_core.xlsx import XlsxStream
+
+# =========================
+# Lokasi output (SATU folder, konsisten)
+# =========================
+CSV_DIR = "tweets-data"
+IMG_DIR = os.path.join(CSV_DIR, "images")
+# Satu folder per run tweet-harvest: tweets-data/runs/<YYYYmmdd-HHMMSS>-<akun>-<id>/ berisi CSV + manifest.json.
+# Subproses jalan dengan cwd = folder run, jadi lokasi CSV sudah pasti (tanpa scan folder) dan
+# beberapa harvest paralel tidak saling mengambil CSV.
+RUNS_DIR = os.path.join(CSV_DIR, "runs")
+MANIFEST_NAME = "manifest.json"
+# tweet-harvest selalu menulis -o <nama> ke ./tweets-data/<nama> relatif terhadap cwd-nya
+HARVEST_SUBDIR = "tweets-data"
+
+# ====== Kolom umum dari tweet-harvest ======
+DATE_COLS  = ["date", "created_at", "time", "timestamp", "published_at"]
+TEXT_COLS  = ["text", "full_text", "content", "caption", "body"]
+LIKES_COLS = ["likes", "favorite_count", "like_count", "likes_count", "favoriteCount"]
+LINK_COLS  = ["url", "link", "tweet_url", "status_url", "permalink"]
+ID_COLS    = ["id", "tweetId", "status_id", "conversation_id", "conversationId"]
+MEDIA_COLS = ["photos", "media", "media_urls", "images", "image_urls", "media_url", "media_url_https"]
+# URL gambar pertama dalam satu sel (twimg.com/media di mana saja, atau token berakhiran ekstensi gambar)
+IMAGE_URL_REGEX = re.compile(
+    r'(https?://(?:[^\s,"]*twimg\.com/media[^\s,"]*|[^\s,"]*\.(?:jpe?g|png|webp)(?![^\s,"])))',
+    re.IGNORECASE,
+)
+# Kolom turunan (URL gambar terpilih, sudah to_orig_url); nama sengaja beda dari kolom CSV tweet-harvest
+MEDIA_URL_COL = "_image_url"
+
+# Perintah tweet-harvest bisa diganti (mis. stub untuk benchmark): SCRAPER_HARVEST_CMD="python stub.py"
+HARVEST_CMD = os.getenv("SCRAPER_HARVEST_CMD", "")
+HARVEST_HOST = "https://x.com/"
+HARVEST_MAX_WAIT = 60.0   # X dijeda circuit breaker lebih lama dari ini → HarvestError
+
+# ====== Helper umum ======
+def pick_first_col(df: pd.DataFrame, cands):
+    for c in cands:
+        if c in df.columns:
+            return c
+    return None
+
+def to_orig_url(u: str) -> str:
+    """Naikkan ke resolusi penuh (name=orig / :orig)."""
+    try:
+        sp = urlsplit(u)
+        if sp.netloc.endswith("pbs.twimg.com") and "/media/" in sp.path:
+            path = sp.path
+            if ":" in path:
+                path = path.split(":")[0] + ":orig"
+            qs = dict(parse_qsl(sp.query, keep_blank_values=True))
+            qs["name"] = "orig"
+            return urlunsplit((sp.scheme, sp.netloc, path, urlencode(qs), sp.fragment))
+        if "pbs.twimg.com" in u and "name=" in u:
+            return re.sub(r"name=[^&]+", "name=orig", u)
+    except Exception:
+        pass
+    return u
+
+def to_thumb_url(u: str) -> str:
+    """Turunkan ke thumbnail (kecil) untuk PREVIEW saja."""
+    try:
+        sp = urlsplit(u)
+        if sp.netloc.endswith("pbs.twimg.com") and "/media/" in sp.path:
+            path = sp.path.split(":")[0]  # buang :orig kalau ada
+            qs = dict(parse_qsl(sp.query, keep_blank_values=True))
+            qs["name"] = "small"
+            return urlunsplit((sp.scheme, sp.netloc, path, urlencode(qs), sp.fragment))
+    except Exception:
+        pass
+    return u
+
+def build_tweet_link(row: pd.Series, link_col: str | None, id_col: str | None) -> str:
+    if link_col:
+        val = row.get(link_col, None)
+        if isinstance(val, str) and val.startswith("http"):
+            return val
+    if id_col and not pd.isna(row.get(id_col, None)):
+        tid = str(row[id_col]).strip()
+        if tid:
+            return f"https://x.com/i/web/status/{tid}"
+    return ""
+
+def keep_only_original(df: pd.DataFrame) -> pd.DataFrame:
+    mask = pd.Series(True, index=df.index)
+    for c in ["is_retweet", "retweeted"]:
+        if c in df.columns:
+            mask &= ~df[c].fillna(False)
+    for c in ["in_reply_to_status_id", "in_reply_to_tweet_id", "in_reply_to_user_id", "reply_to"]:
+        if c in df.columns:
+            mask &= df[c].isna() | (df[c] == 0) | (df[c] == "")
+    text_col = pick_first_col(df, TEXT_COLS)
+    if text_col:
+        mask &= ~df[text_col].fillna("").str.startswith("RT @")
+    if "referenced_tweets" in df.columns:
+        mask &= ~df["referenced_tweets"].astype(str).str.contains("replied_to|retweeted", case=False, na=False)
+    return df[mask].reset_index(drop=True)
+
+def add_media_url_column(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    URL gambar pertama per baris → kolom MEDIA_URL_COL (sudah to_orig_url, None kalau tidak ada gambar).
+    Dicari per kolom (satu pass regex per kolom): kolom MEDIA_COLS dulu, lalu kolom teks lainnya.
+    """
+    out = df.copy()
+    media = pd.Series(None, index=df.index, dtype=object)
+    cols = [c for c in MEDIA_COLS if c in df.columns]
+    cols += [c for c in df.columns if c not in cols and c != MEDIA_URL_COL]
+    for c in cols:
+        col = df[c]
+        if not (pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col)):
+            continue  # angka / tanggal / bool tidak mungkin berisi URL
+        need = media.isna()
+        if not need.any():
+            break
+        vals = col[need].dropna().astype(str)
+        vals = vals[vals.str.contains("http", regex=False)]
+        if vals.empty:
+            continue
+        found = vals.str.extract(IMAGE_URL_REGEX, expand=False).dropna()
+        media.loc[found.index] = found
+    # upgrade ke resolusi penuh sekali per URL unik
+    upgraded = {u: to_orig_url(u) for u in media.dropna().unique()}
+    out[MEDIA_URL_COL] = media.map(upgraded).astype(object).where(media.notna(), None)
+    return out
+
+# ====== Helper I/O CSV aman & konsisten ======
+def _peek_file(path: str, nbytes: int = 2048) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            return f.read(nbytes)
+    except Exception:
+        return b""
+
+def _looks_like_csv(path: str) -> bool:
+    try:
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return False
+        head = _peek_file(path)
+        if head.strip().startswith(b"<") and b"<html" in head.lower():
+            # HTML error page → bukan CSV
+            return False
+        return True
+    except Exception:
+        return False
+
+def _read_csv_safely(path: str) -> pd.DataFrame:
+    """
+    Baca CSV dengan guard:
+    - error kalau 0 byte / HTML
+    - fallback encoding & autodetect delimiter
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"CSV tidak ditemukan: {path}")
+    size = os.path.getsize(path)
+    if size == 0:
+        raise EmptyDataError("CSV kosong (0 byte).")
+    head = _peek_file(path)
+    if head.strip().startswith(b"<") and b"<html" in head.lower():
+        raise ValueError("File bukan CSV (terdeteksi HTML). Cek token/hasil scrape.")
+
+    try:
+        return pd.read_csv(path)
+    except (EmptyDataError, ParserError):
+        try:
+            return pd.read_csv(path, encoding="utf-8-sig", engine="python")
+        except (EmptyDataError, ParserError):
+            return pd.read_csv(path, encoding="utf-8-sig", engine="python", sep=None)
+
+# =========================
+# Query & filter
+# =========================
+def build_query(handle: str, start_date_str: str, end_date_str: str,
+                only_original: bool, exclude_quote: bool,
+                require_media: bool) -> str:
+    """Selalu terapkan HARI AKHIR INKLUSIF WIB (auto until+1)."""
+    parts = [f"from:{handle}"]
+    if only_original:
+        parts += ["-filter:replies", "-filter:retweets"]
+    if exclude_quote:
+        parts += ["-filter:quote"]
+    if require_media:
+        parts += ["filter:images"]
+    if start_date_str:
+        parts.append(f"since:{start_date_str}")
+    if end_date_str:
+        until_plus = (datetime.strptime(end_date_str, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        parts.append(f"until:{until_plus}")
+    return " ".join(parts)
+
+def postfilter_wib(df: pd.DataFrame, start_date_str: str, end_date_str: str) -> pd.DataFrame:
+    """Filter 00:00–23:59 WIB sesuai rentang terpilih (selalu)."""
+    date_col = pick_first_col(df, DATE_COLS)
+    if not date_col or not (start_date_str or end_date_str):
+        return df
+    dt_utc = pd.to_datetime(df[date_col], errors="coerce", utc=True)
+    tz = "Asia/Pontianak"  # UTC+7 (WIB)
+    start_utc = pd.NaT
+    end_utc   = pd.NaT
+    if start_date_str:
+        start_utc = (pd.Timestamp(start_date_str + " 00:00:00", tz=tz).tz_convert("UTC"))
+    if end_date_str:
+        end_utc   = (pd.Timestamp(end_date_str + " 23:59:59", tz=tz).tz_convert("UTC"))
+    mask = pd.Series(True, index=df.index)
+    if start_date_str:
+        mask &= dt_utc >= start_utc
+    if end_date_str:
+        mask &= dt_utc <= end_utc
+    return df[mask].reset_index(drop=True)
+
+# =========================
+# Tweet-harvest runner
+# =========================
+def harvest_command(output_dir_or_file: str, search_query: str, limit: int, token: str) -> list[str] | None:
+    """Argumen tweet-harvest (None kalau npx tidak ada dan tidak ada override SCRAPER_HARVEST_CMD)."""
+    if HARVEST_CMD:
+        base = shlex.split(HARVEST_CMD)
+    else:
+        from shutil import which
+        npx_path = which("npx") or which("npx.cmd") or which("npx.exe")
+        if not npx_path:
+            return None
+        base = [npx_path, "--yes", "tweet-harvest"]
+    cmd = base + ["-o", output_dir_or_file, "-s", search_query, "-l", str(limit)]
+    if token:
+        cmd += ["--token", token]
+    return cmd
+
+def _ensure_output_dir(output_dir_or_file: str):
+    if output_dir_or_file.lower().endswith(".csv"):
+        os.makedirs(os.path.dirname(os.path.abspath(output_dir_or_file)), exist_ok=True)
+    else:
+        os.makedirs(os.path.abspath(output_dir_or_file), exist_ok=True)
+
+def run_tweet_harvest(output_dir_or_file: str, search_query: str, limit: int, token: str, cwd: str | None = None):
+    """
+    Kirim FOLDER ke -o agar kompatibel dengan perilaku umum tweet-harvest.
+    (Jika output_dir_or_file berakhiran .csv, tetap didukung.) cwd → folder kerja subproses (folder run).
+    Versi blocking; untuk log live, berhenti lebih awal & manifest pakai HarvestRun.
+    """
+    cmd = harvest_command(output_dir_or_file, search_query, limit, token)
+    if not cmd:
+        return False, "npx tidak ditemukan. Install Node.js 20+."
+    _ensure_output_dir(os.path.join(cwd or "", output_dir_or_file))
+    try:
+        res = subprocess.run(cmd, capture_output=True, text=True, check=True, cwd=cwd)
+        logs = (res.stdout or "") + ("\n" + res.stderr if res.stderr else "")
+        return True, logs
+    except subprocess.CalledProcessError as e:
+        logs = (e.stdout or "") + ("\n" + e.stderr if e.stderr else "")
+        return False, logs
+
+# =========================
+# Folder run + manifest
+# =========================
+def new_run_dir(username: str, root: str = RUNS_DIR) -> str:
+    """Buat folder run baru yang unik: <root>/<YYYYmmdd-HHMMSS>-<akun>-<6 hex>."""
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", username.strip().lstrip("@"))[:40] or "_"
+    path = os.path.join(root, f"{datetime.now():%Y%m%d-%H%M%S}-{safe}-{secrets.token_hex(3)}")
+    os.makedirs(path)   # exist_ok=False: dua run tidak pernah berbagi folder
+    return path
+
+def harvest_csv_candidates(run_dir: str, filename: str) -> list[str]:
+    """Lokasi CSV yang mungkin untuk `-o filename` dengan cwd = run_dir (cukup di-stat, tanpa glob)."""
+    return [os.path.join(run_dir, HARVEST_SUBDIR, filename), os.path.join(run_dir, filename)]
+
+def write_manifest(run_dir: str, manifest: dict):
+    """Tulis manifest.json secara atomik (file sementara → rename)."""
+    path = os.path.join(run_dir, MANIFEST_NAME)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+def read_manifest(run_dir: str) -> dict:
+    with open(os.path.join(run_dir, MANIFEST_NAME), encoding="utf-8") as f:
+        return json.load(f)
+
+# =========================
+# Ekspor Excel: Tanggal | Gambar | Link | Caption | Like
+# =========================
+def export_excel_5cols(mini: pd.DataFrame, username: str,
+                       keep_full_image_in_excel: bool,
+                       save_originals_to_disk: bool,
+                       img_max_w_px: int = 320,
+                       img_max_h_px: int = 320,
+                       timeout_sec: int = 15,
+                       on_progress=None,
+                       workers: int | None = None):
+    """
+    on_progress(i, n) dipanggil per gambar yang selesai diunduh.
+    Gambar diunduh paralel (workers) lewat scraper_core.images; baris & gambar ditulis streaming
+    (scraper_core.xlsx), jadi full-res pun tidak menumpuk di RAM. Return file biner sementara (posisi 0).
+    """
+    if save_originals_to_disk:
+        os.makedirs(IMG_DIR, exist_ok=True)
+
+    def save_original(img_url: str, raw: bytes):
+        h = hashlib.md5(img_url.encode("utf-8")).hexdigest()
+        ext = os.path.splitext(urlsplit(img_url).path)[1].lower() or ".jpg"
+        if ext not in [".jpg",".jpeg",".png",".webp"]:
+            ext = ".jpg"
+        with open(os.path.join(IMG_DIR, f"{h}{ext}"), "wb") as f:
+            f.write(raw)
+
+    pngs = iter_images(
+        mini["Gambar"].tolist() if len(mini) else [],
+        transform=png_full() if keep_full_image_in_excel else png_thumbnail(img_max_w_px, img_max_h_px),
+        workers=workers,
+        timeout=timeout_sec,
+        on_raw=save_original if save_originals_to_disk else None,
+        on_progress=on_progress,
+    )
+
+    xs = XlsxStream("Tweets", ["Tanggal", "Gambar", "Link", "Caption", "Like"],
+                    widths={"A": 18, "B": 45, "C": 55, "D": 80, "E": 10})
+    for r, png in zip(mini.to_dict("records"), pngs):
+        link_val = r["Link"] or ""
+        try: like_num = int(r["Like"])
+        except Exception: like_num = r["Like"]
+        height = None
+        if png:
+            try:
+                height = int(max(image_size(png)[1], 28) * 0.75)
+            except Exception:
+                png = None
+        xs.append([
+            xs.cell(str(r["Tanggal"]), wrap=True, vertical="top"),
+            None,
+            xs.cell(link_val, hyperlink=link_val if link_val.startswith("http") else None, wrap=True, vertical="top"),
+            xs.cell(str(r["Caption"]), wrap=True, vertical="top"),
+            xs.cell(like_num, wrap=True, vertical="top"),
+        ], image=png, image_col="B", height=height)
+    return xs.finish()
+
+# =========================
+# Pipeline headless: harvest → CSV → filter → tabel 5 kolom
+# =========================
+class HarvestError(RuntimeError):
+    """Gagal menjalankan/membaca hasil tweet-harvest. Log npx ada di .logs"""
+    def __init__(self, message: str, logs: str = ""):
+        super().__init__(message)
+        self.logs = logs
+
+def filter_harvest(df: pd.DataFrame, start_date_str: str, end_date_str: str,
+                   only_original: bool, exclude_quote: bool, require_media: bool) -> pd.DataFrame:
+    """Filter WIB + original + quote + media (setelah CSV dibaca)."""
+    df = postfilter_wib(df, start_date_str, end_date_str)
+    if only_original or exclude_quote:
+        df = keep_only_original(df)
+        if exclude_quote and "referenced_tweets" in df.columns:
+            df = df[~df["referenced_tweets"].astype(str).str.contains("quoted", case=False, na=False)].reset_index(drop=True)
+    df = add_media_url_column(df)
+    if require_media and len(df):
+        df = df[df[MEDIA_URL_COL].notna()].reset_index(drop=True)
+    return df
+
+def build_mini_table(df: pd.DataFrame, on_progress=None) -> pd.DataFrame:
+    """Tabel 5 kolom: Tanggal | Gambar | Link | Caption | Like. on_progress(i, n)"""
+    date_col  = pick_first_col(df, DATE_COLS)
+    text_col  = pick_first_col(df, TEXT_COLS)
+    likes_col = pick_first_col(df, LIKES_COLS)
+    link_col  = pick_first_col(df, LINK_COLS)
+    id_col    = pick_first_col(df, ID_COLS)
+
+    if MEDIA_URL_COL not in df.columns:
+        df = add_media_url_column(df)
+    n = len(df)
+    idx = df.index
+
+    # Link: kolom URL kalau berupa http…, selain itu dari ID tweet (sama dengan build_tweet_link)
+    link = pd.Series("", index=idx, dtype=object)
+    if id_col:
+        ids = df[id_col]
+        tid = ids.astype(str).str.strip()
+        ok = ids.notna() & (tid != "")
+        link[ok] = "https://x.com/i/web/status/" + tid[ok]
+    if link_col:
+        lv = df[link_col]
+        is_http = lv.map(lambda v: isinstance(v, str) and v.startswith("http")).astype(bool)
+        link[is_http] = lv[is_http]
+
+    mini = pd.DataFrame({
+        "Tanggal": df[date_col] if date_col else "",
+        "Gambar":  df[MEDIA_URL_COL],
+        "Link":    link,
+        "Caption": df[text_col] if text_col else "",
+        "Like":    df[likes_col] if likes_col else 0,
+    }, index=idx).reset_index(drop=True)
+    if on_progress:
+        on_progress(max(n, 1), max(n, 1))
+    return mini
+
+_STATUS_ID_RE = r"/status(?:es)?/(\d+)"
+
+def mini_to_records(mini: pd.DataFrame, account: str):
+    """Tabel 5 kolom → PostRecord. Tanggal di-parse per kolom; teks aslinya disimpan di extra["date_raw"]."""
+    from scraper_core.records import PostRecord, to_int
+    posted = pd.to_datetime(mini["Tanggal"], errors="coerce", utc=True, format="mixed")
+    ids = mini["Link"].astype(str).str.extract(_STATUS_ID_RE, expand=False)
+    out = []
+    for tanggal, ts, tid, link, img, cap, like in zip(mini["Tanggal"], posted, ids, mini["Link"],
+                                                       mini["Gambar"], mini["Caption"], mini["Like"]):
+        out.append(PostRecord(
+            "x", tid if isinstance(tid, str) else (link or ""), account=account,
+            posted_at=None if pd.isna(ts) else ts.to_pydatetime(), url=link or "",
+            image_url=img if isinstance(img, str) else None,
+            caption=cap if isinstance(cap, str) else "", likes=to_int(like), kind="tweet",
+            extra={"date_raw": tanggal},
+        ))
+    return out
+
+# =========================
+# Runner non-blocking: log live + tail CSV + filter bertahap + berhenti di target
+# =========================
+def _split_complete_records(buf: bytes, final: bool = False) -> tuple[bytes, bytes]:
+    """
+    Pisah bytes CSV → (record utuh, sisa belum lengkap). Newline di dalam tanda kutip
+    (caption multi-baris) bukan akhir record. final=True → sisa dengan kutip seimbang ikut dianggap utuh.
+    """
+    start = pos = 0
+    quoted = False
+    while True:
+        nl = buf.find(b"\n", pos)
+        if nl < 0:
+            break
+        if buf.count(b'"', pos, nl) % 2:
+            quoted = not quoted
+        pos = nl + 1
+        if not quoted:
+            start = pos
+    rest = buf[start:]
+    if final and rest.strip() and rest.count(b'"') % 2 == 0:
+        return buf + b"\n", b""
+    return buf[:start], rest
+
+class HarvestRun:
+    """
+    tweet-harvest tanpa blocking. stdout/stderr dibaca thread sendiri (poll() → baris log baru),
+    CSV di-tail selagi tumbuh, dan tiap potongan record baru langsung lewat filter_harvest.
+    target_rows → proses anak dihentikan begitu baris lolos filter sudah cukup.
+    Tiap run punya folder sendiri di out_dir (run_dir) berisi CSV + manifest.json (query, limit, waktu
+    mulai/selesai, jumlah baris, path CSV) → run paralel aman dan CSV ditemukan tanpa scan folder.
+
+        run = HarvestRun(username, "2025-01-01", "2025-01-31", 500, token, target_rows=100).start()
+        df, logs, csv_path = run.wait(on_update=lambda r: print(r.rows_so_far))
+    """
+
+    def __init__(self, username: str, start_date_str: str, end_date_str: str, limit: int, token: str,
+                 only_original: bool = True, exclude_quote: bool = True, require_media: bool = False,
+                 target_rows: int | None = None, out_dir: str = RUNS_DIR, poll_interval: float = 0.5):
+        self.username = username
+        self.start_date_str = start_date_str
+        self.end_date_str = end_date_str
+        self.limit = int(limit)
+        self.token = token
+        self.filters = (only_original, exclude_quote, require_media)
+        self.target_rows = int(target_rows) if target_rows else None
+        self.out_dir = out_dir
+        self.poll_interval = poll_interval
+        self.query = build_query(username, start_date_str, end_date_str, only_original, exclude_quote, require_media)
+
+        self.run_dir: str | None = None
+        self.csv_path: str | None = None
+        self._csv_candidates: list[str] = []
+        self._manifest: dict = {}
+        self.returncode: int | None = None
+        self.stopped_early = False
+        self.raw_rows = 0
+        self.error: Exception | None = None
+        self._proc: subprocess.Popen | None = None
+        self._started_ts = 0.0
+        self._log_q: "queue.Queue[str]" = queue.Queue()
+        self._log_lines: list[str] = []
+        self._offset = 0
+        self._buf = b""
+        self._header: bytes | None = None
+        self._bodies: list[bytes] = []
+        self._chunks: list[pd.DataFrame] = []
+        self._n_rows = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._throttled = False
+
+    # ---------- proses anak ----------
+    def start(self) -> "HarvestRun":
+        filename = f"{self.username}.csv"
+        cmd = harvest_command(filename, self.query, self.limit, self.token)
+        if not cmd:
+            raise HarvestError("npx tidak ditemukan. Install Node.js 20+.")
+        # satu run = satu "request" ke x.com di pembatas laju bersama; X yang sedang dijeda → gagal cepat
+        try:
+            limiter().acquire(HARVEST_HOST, max_wait=HARVEST_MAX_WAIT)
+        except (CircuitOpenError, TimeoutError) as e:
+            raise HarvestError(str(e))
+        self._started_ts = datetime.now().timestamp()
+        self.run_dir = new_run_dir(self.username, self.out_dir)
+        self._csv_candidates = harvest_csv_candidates(self.run_dir, filename)
+        only_original, exclude_quote, require_media = self.filters
+        self._manifest = {
+            "username": self.username, "query": self.query, "limit": self.limit, "target_rows": self.target_rows,
+            "start_date": self.start_date_str, "end_date": self.end_date_str,
+            "filters": {"only_original": only_original, "exclude_quote": exclude_quote,
+                        "require_media": require_media},
+            "started": datetime.fromtimestamp(self._started_ts).isoformat(timespec="seconds"),
+            "finished": None, "status": "running", "returncode": None,
+            "raw_rows": 0, "rows": 0, "csv": None,
+        }
+        write_manifest(self.run_dir, self._manifest)
+        # grup proses sendiri → npx beserta node turunannya bisa dihentikan sekaligus
+        group = {"start_new_session": True} if os.name == "posix" else \
+                {"creationflags": getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)}
+        try:
+            self._proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                          stderr=subprocess.PIPE, text=True, encoding="utf-8", errors="replace",
+                                          bufsize=1, cwd=self.run_dir, **group)
+        except OSError as e:
+            self._manifest.update(finished=datetime.now().isoformat(timespec="seconds"), status="failed")
+            write_manifest(self.run_dir, self._manifest)
+            raise HarvestError(f"Gagal menjalankan tweet-harvest: {e}")
+        # thread log & tail jalan di salinan konteks pemanggil → metrik run aktif ikut tercatat
+        for stream in (self._proc.stdout, self._proc.stderr):
+            threading.Thread(target=contextvars.copy_context().run, args=(self._pump, stream),
+                             daemon=True, name="harvest-log").start()
+        threading.Thread(target=contextvars.copy_context().run, args=(self._tail_loop,),
+                         daemon=True, name="harvest-tail").start()
+        return self
+
+    def _pump(self, stream):
+        for line in iter(stream.readline, ""):
+            if not self._throttled and status_from_error(line):
+                self._throttled = True
+            self._log_q.put(line.rstrip("\n"))
+        stream.close()
+
+    def _terminate(self):
+        p = self._proc
+        if p is None or p.poll() is not None:
+            return
+        try:
+            if os.name == "posix":
+                os.killpg(p.pid, signal.SIGTERM)
+            else:
+                p.terminate()
+            p.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            if os.name == "posix":
+                os.killpg(p.pid, signal.SIGKILL)
+            else:
+                p.kill()
+        except OSError:
+            pass
+
+    def stop(self):
+        """Hentikan lebih awal (hasil yang sudah masuk tetap dipakai)."""
+        self.stopped_early = True
+        self._terminate()
+
+    # ---------- tail CSV ----------
+    def _tail_loop(self):
+        try:
+            while self._proc.poll() is None:
+                self._tail_once()
+                if self.target_rows and self._n_rows >= self.target_rows:
+                    self.stopped_early = True
+                    self._terminate()
+                    break
+                time.sleep(self.poll_interval)
+            self._proc.wait()
+            self._tail_once(final=True)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.returncode = self._proc.returncode
+            run = current_metrics()
+            if run is not None:   # umur subproses tweet-harvest (start → keluar)
+                run.add("harvest", seconds=datetime.now().timestamp() - self._started_ts, calls=1,
+                        errors=int(self.returncode not in (0, None) and not self.stopped_early))
+            if self._throttled:
+                limiter().report(HARVEST_HOST, 429)
+            elif self.returncode == 0 or self.stopped_early:
+                limiter().report(HARVEST_HOST, 200)
+            self._finish_manifest()
+            self._done.set()
+
+    def _finish_manifest(self):
+        ok = self.error is None and (self.returncode == 0 or self.stopped_early) and self.csv_path is not None
+        self._manifest.update(
+            finished=datetime.now().isoformat(timespec="seconds"),
+            status=("stopped" if self.stopped_early else "ok") if ok else "failed",
+            returncode=self.returncode, raw_rows=self.raw_rows,
+            rows=min(self._n_rows, self.target_rows) if self.target_rows else self._n_rows,
+            csv=os.path.relpath(self.csv_path, self.run_dir) if self.csv_path else None,
+        )
+        try:
+            write_manifest(self.run_dir, self._manifest)
+        except OSError as e:
+            self._log_q.put(f"[manifest] gagal menulis {MANIFEST_NAME}: {e}")
+
+    def _tail_once(self, final: bool = False):
+        if self.csv_path is None:
+            self.csv_path = next((p for p in self._csv_candidates if _looks_like_csv(p)), None)
+            if self.csv_path is None:
+                return
+        try:
+            size = os.path.getsize(self.csv_path)
+        except OSError:
+            return
+        if size < self._offset:
+            # file ditulis ulang dari awal → ulang tail
+            self._offset, self._buf, self._header = 0, b"", None
+            with self._lock:
+                self._bodies, self._chunks, self._n_rows, self.raw_rows = [], [], 0, 0
+        if size > self._offset:
+            with open(self.csv_path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read(size - self._offset)
+            self._offset += len(data)
+            self._buf += data
+        complete, self._buf = _split_complete_records(self._buf, final=final)
+        if self._header is None:
+            complete = complete.lstrip(b"\r\n")
+            head, sep, complete = complete.partition(b"\n")
+            if not sep:
+                self._buf = head + self._buf
+                return
+            self._header = head + b"\n"
+        if not complete.strip():
+            return
+        with self._lock:
+            self._bodies.append(complete)
+        try:
+            with span("csv_parse"):
+                chunk = pd.read_csv(BytesIO(self._header + complete), encoding="utf-8-sig")
+                part = filter_harvest(chunk, self.start_date_str, self.end_date_str, *self.filters)
+        except (EmptyDataError, ParserError) as e:
+            self._log_q.put(f"[tail] potongan CSV belum bisa dipreview: {e}")
+            return
+        with self._lock:
+            self._chunks.append(part)
+            self.raw_rows += len(chunk)
+            self._n_rows += len(part)
+
+    # ---------- status untuk pemanggil ----------
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def rows_so_far(self) -> int:
+        """Jumlah baris lolos filter sejauh ini."""
+        return self._n_rows
+
+    def poll(self) -> list[str]:
+        """Baris log baru sejak poll() terakhir (non-blocking)."""
+        new = []
+        while True:
+            try:
+                new.append(self._log_q.get_nowait())
+            except queue.Empty:
+                break
+        self._log_lines.extend(new)
+        return new
+
+    @property
+    def logs(self) -> str:
+        self.poll()
+        return "\n".join(self._log_lines)
+
+    def log_tail(self, n: int = 15) -> list[str]:
+        self.poll()
+        return self._log_lines[-n:]
+
+    def partial(self) -> pd.DataFrame:
+        """Baris lolos filter yang sudah masuk (untuk preview selagi jalan)."""
+        with self._lock:
+            chunks = list(self._chunks)
+        if not chunks:
+            return pd.DataFrame()
+        df = pd.concat(chunks, ignore_index=True)
+        return df.head(self.target_rows) if self.target_rows else df
+
+    def wait(self, on_update=None) -> tuple[pd.DataFrame, str, str]:
+        """
+        Tunggu selesai → (df_terfilter, logs, csv_path). on_update(run) dipanggil tiap poll_interval.
+        Raise HarvestError kalau proses gagal / CSV tidak ditemukan / tidak terbaca.
+        """
+        while not self._done.wait(self.poll_interval):
+            if on_update:
+                on_update(self)
+        if on_update:
+            on_update(self)
+        return self.result()
+
+    def result(self) -> tuple[pd.DataFrame, str, str]:
+        logs = self.logs
+        if self.error is not None:
+            raise HarvestError(f"Gagal membaca CSV: {self.error}", logs) from self.error
+        if self.returncode not in (0, None) and not self.stopped_early:
+            raise HarvestError("Scraping gagal.", logs)
+        if not self.csv_path or self._header is None:
+            raise HarvestError("CSV tidak ditemukan.", logs)
+        # parse ulang semua record utuh sekaligus → tipe kolom konsisten (sama dengan baca CSV penuh)
+        with self._lock:
+            body = b"".join(self._bodies)
+        with span("csv_parse"):
+            try:
+                df = pd.read_csv(BytesIO(self._header + body), encoding="utf-8-sig")
+            except EmptyDataError:
+                df = pd.read_csv(BytesIO(self._header), encoding="utf-8-sig")
+            except ParserError as e:
+                raise HarvestError(f"Gagal membaca CSV: {e}", logs) from e
+            df = filter_harvest(df, self.start_date_str, self.end_date_str, *self.filters)
+        if self.target_rows:
+            df = df.head(self.target_rows)
+        return df, logs, self.csv_path
+
+def harvest_tweets(username: str, start_date_str: str, end_date_str: str, limit: int, token: str,
+                   only_original: bool = True, exclude_quote: bool = True, require_media: bool = False,
+                   target_rows: int | None = None, on_update=None):
+    """
+    Jalankan tweet-harvest lalu filter → (mini_df, logs, csv_path); csv_path ada di folder run-nya sendiri.
+    target_rows → berhenti begitu baris lolos filter cukup. on_update(HarvestRun) dipanggil berkala.
+    Raise HarvestError kalau scrape gagal / CSV tidak ditemukan / tidak terbaca.
+    """
+    run = HarvestRun(username, start_date_str, end_date_str, limit, token,
+                     only_original=only_original, exclude_quote=exclude_quote, require_media=require_media,
+                     target_rows=target_rows).start()
+    df, logs, csv_path = run.wait(on_update=on_update)
+    return build_mini_table(df), logs, csv_path
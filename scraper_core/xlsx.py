@@ -0,0 +1,111 @@
+# scraper_core/xlsx.py
+# Mesin ekspor Excel streaming: workbook openpyxl write-only (baris langsung ditulis ke XML sementara),
+# gambar di-spill ke file temp (openpyxl baru membacanya satu per satu saat save), hasil disimpan ke
+# SpooledTemporaryFile → memori puncak tidak tumbuh dengan jumlah baris / ukuran gambar.
+# openpyxl baru di-import saat workbook pertama dibuat (halaman tanpa ekspor tidak membayar biaya import-nya).
+
+import os
+import shutil
+import tempfile
+from typing import Any, BinaryIO, Dict, Optional, Sequence
+
+from scraper_core.metrics import span
+
+# File hasil tetap di RAM sampai ukuran ini, lebih besar → pindah ke disk otomatis
+SPOOL_MAX_BYTES = int(float(os.getenv("SCRAPER_XLSX_SPOOL_MB", "16")) * 1024 * 1024)
+
+class XlsxStream:
+    """
+    Satu sheet write-only. Urutan wajib: lebar kolom (konstruktor) → header → append baris.
+    Tinggi baris & gambar diberikan bersama append (write-only tidak bisa mengubah baris yang sudah lewat).
+
+        xs = XlsxStream("Tweets", ["Tanggal", "Gambar"], widths={"A": 18, "B": 45})
+        xs.append(["2025-01-01", None], image=png_bytes, image_col="B", height=120)
+        f = xs.finish()          # file biner, posisi 0
+    """
+
+    def __init__(self, title: str, headers: Sequence[str], widths: Optional[Dict[str, float]] = None,
+                 bold_header: bool = True):
+        from openpyxl import Workbook
+        from openpyxl.styles import Font
+
+        self._wb = Workbook(write_only=True)
+        self.ws = self._wb.create_sheet(title)
+        for col, w in (widths or {}).items():
+            self.ws.column_dimensions[col].width = w
+        self._img_dir = tempfile.mkdtemp(prefix="xlsx_img_")
+        self._n_img = 0
+        self.row = 1
+        header = []
+        for h in headers:
+            c = self._cell(self.ws, h)
+            if bold_header:
+                c.font = Font(bold=True)
+            header.append(c)
+        self.ws.append(header)
+
+    # ---------- sel ----------
+    @staticmethod
+    def _cell(ws, value: Any):
+        from openpyxl.cell import WriteOnlyCell
+        return WriteOnlyCell(ws, value)
+
+    def cell(self, value: Any, hyperlink: Optional[str] = None, wrap: bool = False,
+             vertical: Optional[str] = None):
+        c = self._cell(self.ws, value)
+        if hyperlink:
+            c.hyperlink = hyperlink
+            c.style = "Hyperlink"
+        if wrap or vertical:
+            from openpyxl.styles import Alignment
+            c.alignment = Alignment(wrap_text=wrap or None, vertical=vertical)
+        return c
+
+    def column_letter(self, idx: int) -> str:
+        from openpyxl.utils import get_column_letter
+        return get_column_letter(idx)
+
+    # ---------- baris ----------
+    def append(self, values: Sequence[Any], image: Optional[bytes] = None, image_col: Optional[str] = None,
+               height: Optional[float] = None):
+        """Tulis satu baris. image (PNG bytes) ditanam di image_col baris ini; bytes langsung ke disk."""
+        with span("xlsx_write"):
+            self.row += 1
+            if height:
+                self.ws.row_dimensions[self.row].height = height
+            if image and image_col:
+                self._n_img += 1
+                path = os.path.join(self._img_dir, f"{self._n_img}.png")
+                with open(path, "wb") as f:
+                    f.write(image)
+                try:
+                    from openpyxl.drawing.image import Image as XLImage
+                    self.ws.add_image(XLImage(path), f"{image_col}{self.row}")
+                except Exception:
+                    pass
+            self.ws.append(list(values))
+
+    def finish(self) -> BinaryIO:
+        """Simpan workbook → SpooledTemporaryFile (posisi 0). File gambar sementara dihapus."""
+        out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, suffix=".xlsx")
+        try:
+            with span("xlsx_save"):
+                self._wb.save(out)
+        finally:
+            shutil.rmtree(self._img_dir, ignore_errors=True)
+        out.seek(0)
+        return out
+
+    def close(self):
+        shutil.rmtree(self._img_dir, ignore_errors=True)
+
+def read_all(f: BinaryIO) -> bytes:
+    """Bytes penuh dari hasil finish() (untuk st.download_button yang butuh bytes)."""
+    f.seek(0)
+    return f.read()
+
+def copy_to_path(f: BinaryIO, path: str):
+    """Salin hasil finish() ke file tujuan per potongan (tanpa memuat semuanya ke RAM)."""
+    f.seek(0)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(f, out, 1024 * 1024)
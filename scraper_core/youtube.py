@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# scraper_core/youtube.py
+# Inti scraper YouTube (scrapetube + yt-dlp) tanpa Streamlit.
+# scrapetube & yt-dlp baru di-import saat walk channel / enrichment pertama, bukan saat modul dimuat.
+
+import importlib.util
+import json
+import math
+import os
+import re
+import threading
+import time
+from contextlib import suppress
+from datetime import datetime, date, timedelta
+from typing import Optional
+import pandas as pd
+
+from scraper_core.concurrency import ordered_map
+from scraper_core.journal import CHECKPOINT_EVERY
+from scraper_core.metrics import span, timed_iter
+from scraper_core.ratelimit import throttled
+
+# Jumlah panggilan yt-dlp paralel saat enrichment (bisa diubah lewat ENV)
+ENRICH_WORKERS = int(os.getenv("SCRAPER_YTDLP_WORKERS", "4"))
+# Walk berhenti setelah sekian video berturut-turut lebih tua dari tanggal awal (0 = tidak berhenti)
+STOP_AFTER_OLDER = 5
+
+# Enrichment wajib untuk tanggal pasti (recommended)
+YTDLP_AVAILABLE = importlib.util.find_spec("yt_dlp") is not None
+
+# ========= Helpers =========
+def extract_text(node, keys=("simpleText", "text")):
+    if not node:
+        return None
+    if isinstance(node, dict):
+        for k in keys:
+            if k in node and isinstance(node[k], str):
+                return node[k]
+        if "runs" in node and isinstance(node["runs"], list) and node["runs"]:
+            return "".join([r.get("text", "") for r in node["runs"]])
+    return None
+
+def safe_get(d, path, default=None):
+    cur = d
+    try:
+        for p in path:
+            if isinstance(p, int):
+                cur = cur[p]
+            else:
+                cur = cur.get(p, {})
+        return cur if cur not in ({}, []) else default
+    except Exception:
+        return default
+
+def build_thumb_url(video_id, quality="hq"):
+    fname = {
+        "mq": "mqdefault.jpg",
+        "hq": "hqdefault.jpg",
+        "sd": "sddefault.jpg",
+        "maxres": "maxresdefault.jpg",
+    }.get(quality, "hqdefault.jpg")
+    return f"https://i.ytimg.com/vi/{video_id}/{fname}"
+
+_local = threading.local()
+
+def _thread_ydl():
+    """Satu YoutubeDL per thread (dipakai ulang antar video, tidak dibagi antar thread)."""
+    ydl = getattr(_local, "ydl", None)
+    if ydl is None:
+        from yt_dlp import YoutubeDL
+        ydl = YoutubeDL({"quiet": True, "skip_download": True})
+        _local.ydl = ydl
+    return ydl
+
+def ytdlp_fetch(video_url: str) -> dict:
+    """
+    Ambil metadata pasti (upload_date YYYYMMDD, description, like_count) via yt_dlp.
+    Return dict minimal: {"published_date": "YYYY-MM-DD", "description": str|None, "like_count": int|None}
+    """
+    if not YTDLP_AVAILABLE:
+        return {"published_date": None, "description": None, "like_count": None}
+    try:
+        with span("ytdlp_extract"), throttled(video_url):
+            info = _thread_ydl().extract_info(video_url, download=False)
+        up = info.get("upload_date")  # 'YYYYMMDD'
+        pub_date = f"{up[0:4]}-{up[4:6]}-{up[6:8]}" if up else None
+        return {
+            "published_date": pub_date,
+            "description": info.get("description"),
+            "like_count": info.get("like_count"),
+        }
+    except Exception:
+        return {"published_date": None, "description": None, "like_count": None}
+
+def parse_date(s: Optional[str]) -> Optional[date]:
+    if not s:
+        return None
+    try:
+        return datetime.strptime(s, "%Y-%m-%d").date()
+    except Exception:
+        return None
+
+def in_date_range(pub: Optional[str], start_d: Optional[date], end_d: Optional[date]) -> bool:
+    if not start_d and not end_d:
+        return True
+    if not pub:
+        return False
+    p = parse_date(pub)
+    if not p:
+        return False
+    if start_d and p < start_d:
+        return False
+    if end_d and p > end_d:
+        return False
+    return True
+
+# ========= Perkiraan tanggal dari teks relatif scrapetube ("3 days ago", "2 minggu yang lalu") =========
+_REL_RE = re.compile(r"(\d+)\s*([a-z]+)", re.I)
+# satuan → (hari minimum per unit, hari maksimum per unit)
+_REL_UNITS = {
+    "second": (1 / 86400, 1 / 86400), "detik": (1 / 86400, 1 / 86400),
+    "minute": (1 / 1440, 1 / 1440), "menit": (1 / 1440, 1 / 1440),
+    "hour": (1 / 24, 1 / 24), "jam": (1 / 24, 1 / 24),
+    "day": (1, 1), "hari": (1, 1),
+    "week": (7, 7), "minggu": (7, 7),
+    "month": (28, 31), "bulan": (28, 31),
+    "year": (365, 366), "tahun": (365, 366),
+}
+
+def published_window(text: Optional[str], today: Optional[date] = None):
+    """
+    Rentang tanggal upload yang mungkin (paling_awal, paling_akhir) dari teks relatif,
+    atau None kalau tidak bisa diparse. "1 year ago" = umur antara 1 dan 2 tahun.
+    """
+    if not text:
+        return None
+    m = _REL_RE.search(text)
+    if not m:
+        return None
+    unit = m.group(2).lower().rstrip("s")
+    bounds = _REL_UNITS.get(unit)
+    if bounds is None:
+        return None
+    n = int(m.group(1))
+    today = today or date.today()
+    lo_days, hi_days = bounds
+    # +1 hari kelonggaran untuk beda zona waktu
+    latest = today - timedelta(days=max(int(n * lo_days) - 1, 0))
+    earliest = today - timedelta(days=math.ceil((n + 1) * hi_days) + 1)
+    return earliest, latest
+
+def create_excel_with_images(df: pd.DataFrame, img_col="thumbnail_url", max_img_width=160,
+                             workers=None, on_progress=None):
+    """
+    Buat file Excel dengan thumbnail di-embed → file biner sementara (posisi 0).
+    Thumbnail diunduh paralel (workers) lewat scraper_core.images, baris ditulis streaming (scraper_core.xlsx).
+    """
+    from scraper_core.images import iter_images, png_fit_width, image_size
+    from scraper_core.xlsx import XlsxStream
+
+    cols = df.columns.tolist()
+    if img_col in cols:
+        ordered_cols = [img_col] + [c for c in cols if c != img_col]
+    else:
+        ordered_cols = cols
+
+    xs = XlsxStream("videos", ordered_cols,
+                    widths={"A": 25 if ordered_cols and ordered_cols[0] == img_col else 20}, bold_header=False)
+    img_letter = xs.column_letter(ordered_cols.index(img_col) + 1) if img_col in ordered_cols else "A"
+    urls = df[img_col].tolist() if img_col in cols else [None] * len(df)
+    pngs = iter_images(urls, transform=png_fit_width(max_img_width), workers=workers, timeout=10,
+                       on_progress=on_progress)
+    for vals, png in zip(df[ordered_cols].itertuples(index=False, name=None), pngs):
+        height = None
+        if png:
+            try:
+                height = image_size(png)[1] * 0.75
+            except Exception:
+                png = None
+        xs.append(vals, image=png, image_col=img_letter, height=height)
+    return xs.finish()
+
+def iter_channel_videos(channel_url: str, resume: Optional[dict] = None, sleep: float = 1.0):
+    """
+    Walk tab video channel seperti scrapetube.get_channel, tapi yield (video, posisi) dengan posisi =
+    {"page": token continuation halaman video itu (None = halaman awal), "skip": indeks di halaman,
+    "api_key", "client"} — cukup untuk melanjutkan walk tepat di video itu (`resume`) tanpa mengulang
+    halaman sebelumnya. Memakai helper scrapetube sendiri, jadi request-nya sama persis.
+    """
+    from scrapetube import scrapetube as stt
+    url = f"{channel_url}/videos?view=0&flow=grid"
+    endpoint = "https://www.youtube.com/youtubei/v1/browse"
+    selector = stt.type_property_map["videos"]
+    resume = resume or {}
+    page, skip = resume.get("page"), int(resume.get("skip") or 0)
+    api_key, client = resume.get("api_key"), resume.get("client")
+    session = stt.get_session()
+    try:
+        if page is None or not (api_key and client):
+            page = None
+            html = stt.get_initial_data(session, url)
+            client = json.loads(stt.get_json_from_html(html, "INNERTUBE_CONTEXT", 2, '"}},') + '"}}')["client"]
+            api_key = stt.get_json_from_html(html, "innertubeApiKey", 3)
+            data = json.loads(stt.get_json_from_html(html, "var ytInitialData = ", 0, "};") + "}")
+            data = next(stt.search_dict(data, "contents"), None)
+        session.headers["X-YouTube-Client-Name"] = "1"
+        session.headers["X-YouTube-Client-Version"] = client["clientVersion"]
+        while True:
+            if page is not None:
+                data = stt.get_ajax_data(session, endpoint, api_key, page, client)
+            next_page = stt.get_next_data(data)
+            for i, video in enumerate(stt.get_videos_items(data, selector)):
+                if i >= skip:
+                    yield video, {"page": page, "skip": i, "api_key": api_key, "client": client}
+            if not next_page:
+                break
+            page, skip = next_page, 0
+            time.sleep(sleep)
+    finally:
+        session.close()
+
+PREFERRED_COLS = [
+    "thumbnail_url", "title", "published_date", "published_text",
+    "duration_text", "like_count", "video_url", "video_id", "description"
+]
+
+def iter_channel_rows(channel_url: str, limit: int, start_d: Optional[date] = None,
+                      end_d: Optional[date] = None, enrich: bool = True, on_progress=None,
+                      workers: Optional[int] = None, stop_after_older: int = STOP_AFTER_OLDER,
+                      journal=None):
+    """
+    Jalan di channel (scrapetube) + enrichment yt-dlp, yield baris yang lolos filter tanggal.
+    Enrichment jalan di pool `workers` thread (default ENRICH_WORKERS) bersamaan dengan paginasi
+    scrapetube; urutan hasil tetap sama dengan urutan channel.
+
+    Dengan filter tanggal (channel urut terbaru → terlama):
+    - video yang dari teks relatif pasti lebih baru dari end_d / lebih tua dari start_d tidak di-enrich;
+    - walk berhenti setelah `stop_after_older` video berturut-turut lebih tua dari start_d.
+    on_progress(counted, total) dipanggil per video yang diproses.
+    journal (scraper_core.journal.open_journal) → baris + continuation scrapetube di-checkpoint berkala;
+    kalau jurnal berisi checkpoint, baris lamanya di-yield dulu lalu walk dilanjutkan dari posisi itu.
+    """
+    resume = journal.cursor if journal is not None else None
+    rows = list(journal.rows) if resume else []
+    yield from rows
+    total_est = int(limit)
+    # Ambil tanggal/desc/like_count via yt_dlp jika diaktifkan atau diperlukan filter tanggal
+    need_date = bool(start_d or end_d)
+    do_enrich = enrich or need_date
+    today = date.today()
+
+    def classify(v) -> str:
+        """"newer" / "older" (pasti di luar rentang) atau "maybe"."""
+        if not need_date:
+            return "maybe"
+        win = published_window(extract_text(safe_get(v, ["publishedTimeText"], {})), today)
+        if win is None:
+            return "maybe"
+        earliest, latest = win
+        if end_d and earliest > end_d:
+            return "newer"
+        if start_d and latest < start_d:
+            return "older"
+        return "maybe"
+
+    offset = int(resume["counted"]) if resume else 0
+
+    def with_id(it):
+        n = offset
+        if n >= total_est:
+            return
+        for v, pos in it:
+            if not v.get("videoId"):
+                continue
+            yield v, classify(v), pos
+            n += 1
+            if n >= total_est:
+                break
+
+    def enrich_one(item):
+        v, cls, _ = item
+        if not do_enrich or cls != "maybe":
+            return {}
+        return ytdlp_fetch(f"https://www.youtube.com/watch?v={v['videoId']}")
+
+    n_workers = (workers or ENRICH_WORKERS) if do_enrich else 1
+    # paginasi scrapetube jalan saat diiterasi
+    pages = timed_iter(iter_channel_videos(channel_url, resume and resume.get("pos")), "channel_pages")
+    older_streak = int(resume.get("older") or 0) if resume else 0
+    mark, since = None, 0   # mark = (cursor, len(rows)) sebelum video yang sedang diproses
+    try:
+        for counted, ((v, cls, pos), fetched) in enumerate(
+                ordered_map(enrich_one, with_id(pages), n_workers, thread_name_prefix="ytdlp"), start=offset + 1):
+            if journal is not None:
+                mark = ({"pos": pos, "counted": counted - 1, "older": older_streak}, len(rows))
+                if since >= CHECKPOINT_EVERY:
+                    journal.checkpoint(rows, mark[0])
+                    since = 0
+                since += 1
+            if on_progress:
+                on_progress(counted, total_est)
+
+            if cls != "maybe":
+                older_streak = older_streak + 1 if cls == "older" else 0
+            else:
+                pub = parse_date(fetched.get("published_date"))
+                if pub and start_d and pub < start_d:
+                    older_streak += 1
+                elif pub:
+                    older_streak = 0
+            if stop_after_older and start_d and older_streak >= stop_after_older:
+                break
+            if cls != "maybe":
+                continue
+
+            vid = v["videoId"]
+            title = extract_text(safe_get(v, ["title"], {})) or "(Tanpa judul)"
+            length_text = extract_text(safe_get(v, ["lengthText"], {}))
+            thumb = build_thumb_url(vid, "hq")
+            url = f"https://www.youtube.com/watch?v={vid}"
+
+            meta = {"published_date": None, "description": None, "like_count": None}
+            meta.update(fetched)
+
+            row = {
+                "thumbnail_url": thumb,
+                "title": title,
+                "published_text": extract_text(safe_get(v, ["publishedTimeText"], {})),  # relatif
+                "published_date": meta["published_date"],  # YYYY-MM-DD
+                "duration_text": length_text,
+                "like_count": meta["like_count"],
+                "video_url": url,
+                "video_id": vid,
+                "description": meta["description"],
+            }
+
+            # Filter tanggal (inklusif)
+            if in_date_range(row["published_date"], start_d, end_d):
+                if journal is not None:
+                    rows.append(row)
+                yield row
+    except BaseException:
+        if journal is not None and mark is not None:
+            with suppress(OSError):
+                journal.checkpoint(rows, mark[0], upto=mark[1])   # video yang sedang diproses diulang
+        raise
+    finally:
+        if journal is not None:
+            journal.close()
+    if journal is not None:
+        journal.finish()
+
+def scrape_channel_rows(channel_url: str, limit: int, start_d: Optional[date] = None,
+                        end_d: Optional[date] = None, enrich: bool = True, on_progress=None,
+                        workers: Optional[int] = None, stop_after_older: int = STOP_AFTER_OLDER,
+                        journal=None) -> list:
+    return list(iter_channel_rows(channel_url, limit, start_d, end_d, enrich, on_progress,
+                                  workers, stop_after_older, journal))
+
+def rows_to_records(rows: list, account: str):
+    """Baris iter_channel_rows → PostRecord (teks relatif, durasi & deskripsi di `extra`)."""
+    from scraper_core.records import PostRecord, to_int, to_utc
+    out = []
+    for r in rows:
+        out.append(PostRecord(
+            "youtube", r.get("video_id") or r.get("video_url") or "", account=account,
+            posted_at=to_utc(r.get("published_date")), url=r.get("video_url") or "",
+            image_url=r.get("thumbnail_url"), caption=r.get("title") or "",
+            likes=to_int(r.get("like_count")), kind="video",
+            extra={k: r.get(k) for k in ("published_text", "duration_text", "description")},
+        ))
+    return out
+
+def rows_to_frame(rows: list) -> pd.DataFrame:
+    """DataFrame dengan urutan kolom yang konsisten (kolom lain di belakang); kosong → tetap punya kolomnya."""
+    df = pd.DataFrame(rows) if rows else pd.DataFrame(columns=PREFERRED_COLS)
+    existing = [c for c in PREFERRED_COLS if c in df.columns]
+    rest = [c for c in df.columns if c not in existing]
+    return df[existing + rest].copy()
@@ -0,0 +1,34 @@
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from scraper_core.columnar import read_partitioned, write_partitioned
+from scraper_core.records import legacy_to_frame
+
+def _youtube_frame(n: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "video_id": [f"v{i}" for i in range(n)],
+        "video_url": [f"https://www.youtube.com/watch?v=v{i}" for i in range(n)],
+        "thumbnail_url": [""] * n,
+        "title": [f"Video {i}" for i in range(n)],
+        "published_date": ["2025-03-0%d" % (i + 1) for i in range(n)],
+    })
+
+def test_url_account_round_trip(tmp_path):
+    foo = "https://www.youtube.com/@Foo"
+    bar = "https://www.youtube.com/@Bar"
+    write_partitioned(legacy_to_frame(_youtube_frame(3), "youtube", foo), str(tmp_path))
+    written = write_partitioned(legacy_to_frame(_youtube_frame(2), "youtube", bar), str(tmp_path))
+
+    # satu level direktori per kolom partisi, URL tidak memecah path
+    assert all(os.path.relpath(p, tmp_path).count(os.sep) == 2 for p in written)
+
+    got = read_partitioned(str(tmp_path), platform="youtube", account=foo)
+    assert len(got) == 3
+    assert set(got["account"]) == {foo}
+    assert set(read_partitioned(str(tmp_path))["account"]) == {foo, bar}
+    assert len(read_partitioned(str(tmp_path), account=bar, start=date(2025, 3, 2))) == 1
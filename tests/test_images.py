@@ -0,0 +1,22 @@
+import io
+
+from PIL import Image
+
+from scraper_core.images import image_size, png_full, png_thumbnail
+
+def _png(w: int, h: int, mode: str = "RGBA") -> bytes:
+    bio = io.BytesIO()
+    Image.new(mode, (w, h), (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)).save(bio, format="PNG")
+    return bio.getvalue()
+
+def test_png_thumbnail_fits_box():
+    out = png_thumbnail(50, 50)(_png(200, 100))
+    assert out.startswith(b"\x89PNG")
+    assert image_size(out) == (50, 25)
+    with Image.open(io.BytesIO(out)) as im:
+        assert im.mode == "RGB"   # alpha dikomposit ke putih
+
+def test_png_full_keeps_size():
+    out = png_full()(_png(64, 48, mode="RGB"))
+    assert out.startswith(b"\x89PNG")
+    assert image_size(out) == (64, 48)
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("instaloader")
+import instaloader
+
+from scraper_core.instagram import load_sync_state, sync_posts
+
+class _Post:
+    typename = "GraphImage"
+    is_video = False
+    caption = ""
+    likes = 0
+
+    def __init__(self, i: int, pinned: bool = False):
+        self.shortcode = f"P{i:03d}"
+        self.date_utc = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i)
+        self.url = f"https://example.com/{i}.jpg"
+        self.is_pinned = pinned
+
+class _Timeline:
+    """Timeline palsu: post 0..n-1, terbaru dulu (plus pinned opsional di atas)."""
+    def __init__(self):
+        self.n = 0
+        self.pinned = None
+
+    def get_posts(self):
+        posts = [_Post(i) for i in reversed(range(self.n))]
+        return iter(([_Post(self.pinned, pinned=True)] if self.pinned is not None else []) + posts)
+
+@pytest.fixture
+def timeline(monkeypatch):
+    tl = _Timeline()
+    monkeypatch.setattr(instaloader.Profile, "from_username", staticmethod(lambda ctx, name: tl))
+    return tl
+
+def _codes(rows):
+    return {r["link_post"].rstrip("/").rsplit("/", 1)[-1] for r in rows}
+
+class _L:
+    context = None
+
+def test_truncated_syncs_do_not_lose_posts(tmp_path, timeline):
+    root = str(tmp_path)
+    timeline.n = 5
+    got = _codes(sync_posts(_L(), "akun", limit=10, root=root))   # sync awal
+    assert got == {f"P{i:03d}" for i in range(5)}
+
+    timeline.n = 15                                                  # 10 post baru, limit 3 per sync
+    for _ in range(3):
+        got |= _codes(sync_posts(_L(), "akun", limit=3, root=root))
+    timeline.n = 17                                                  # post baru di tengah proses
+    while len(got) < 17:
+        before = len(got)
+        got |= _codes(sync_posts(_L(), "akun", limit=3, root=root))
+        assert len(got) > before   # tiap sync maju, tidak macet di post terbaru yang sama
+    assert got == {f"P{i:03d}" for i in range(17)}
+    # gap yang tersisa (kalau limit pas habis di post terakhir gap) kosong → ditutup tanpa baris baru
+    assert sync_posts(_L(), "akun", limit=3, root=root) == []
+    assert load_sync_state("akun", root)["gaps"] == []
+
+def test_sync_without_truncation_keeps_no_gap(tmp_path, timeline):
+    root = str(tmp_path)
+    timeline.n, timeline.pinned = 4, 1
+    sync_posts(_L(), "akun", limit=None, root=root)
+    timeline.n = 8
+    rows = sync_posts(_L(), "akun", limit=None, root=root)
+    assert _codes(rows) == {"P004", "P005", "P006", "P007"}   # pinned lama tidak diambil ulang
+    state = load_sync_state("akun", root)
+    assert state["shortcode"] == "P007" and state["gaps"] == []
@@ -0,0 +1,42 @@
+import threading
+import time
+
+from scraper_core import jobs
+
+def _fake_runner(started, durations):
+    lock = threading.Lock()
+
+    def run_one(t, output, dataset, retries):
+        with lock:
+            started.append((t["target"], time.monotonic()))
+        time.sleep(durations[t["platform"]])
+        return {"platform": t["platform"], "target": str(t["target"]), "output": output,
+                "status": "ok", "rows": 1, "attempts": 1, "seconds": durations[t["platform"]], "error": None}
+    return run_one
+
+def test_platform_with_free_slots_starts_immediately(tmp_path, monkeypatch):
+    started = []
+    monkeypatch.setattr(jobs, "_run_one", _fake_runner(started, {"instagram": 0.3, "tiktok": 0.01}))
+    targets = [{"platform": "instagram", "target": f"ig{i}", "format": "csv"} for i in range(4)]
+    targets += [{"platform": "tiktok", "target": f"tt{i}", "format": "csv"} for i in range(2)]
+
+    t0 = time.monotonic()
+    summary = jobs.run_batch(targets, str(tmp_path), limits={"instagram": 1, "tiktok": 2})
+
+    first = {name: ts - t0 for name, ts in started}
+    # TikTok tidak antre di belakang Instagram (limit 1): mulai sebelum IG pertama selesai
+    assert first["tt0"] < 0.2 and first["tt1"] < 0.2
+    # Instagram tetap satu per satu
+    assert first["ig1"] >= 0.3
+    assert [r["target"] for r in summary["results"]] == [t["target"] for t in targets]
+
+def test_deadline_does_not_skip_other_platforms(tmp_path, monkeypatch):
+    started = []
+    monkeypatch.setattr(jobs, "_run_one", _fake_runner(started, {"instagram": 0.3, "tiktok": 0.01}))
+    targets = [{"platform": "instagram", "target": f"ig{i}", "format": "csv"} for i in range(3)]
+    targets += [{"platform": "tiktok", "target": "tt0", "format": "csv"}]
+
+    summary = jobs.run_batch(targets, str(tmp_path), limits={"instagram": 1}, deadline_s=0.2)
+
+    status = {r["target"]: r["status"] for r in summary["results"]}
+    assert status == {"ig0": "ok", "ig1": "skipped", "ig2": "skipped", "tt0": "ok"}
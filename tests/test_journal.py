@@ -0,0 +1,171 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scraper_core.journal import Journal, open_journal
+
+def test_truncated_last_line_is_dropped_and_cut(tmp_path):
+    root = str(tmp_path)
+    j = open_journal("tiktok", "akun", root=root, limit=10)
+    j.note(entries=["a", "b", "c"])
+    j.checkpoint(["a"], {"next": 1})
+    j.checkpoint(["a", "b"], {"next": 2})
+    j.close()
+    with open(j.path, "ab") as f:
+        f.write(b'{"rows":["c"],"cur')          # proses mati saat menulis
+    good = os.path.getsize(j.path) - len(b'{"rows":["c"],"cur')
+
+    j = open_journal("tiktok", "akun", root=root, limit=10)
+    assert j.resumed
+    assert j.rows == ["a", "b"] and j.cursor == {"next": 2}
+    assert j.meta == {"entries": ["a", "b", "c"]}
+    assert os.path.getsize(j.path) == good     # sisa terpotong dibuang dari file
+
+    j.checkpoint(["a", "b", "c"], {"next": 3})  # append setelah pemotongan tetap NDJSON valid
+    j.close()
+    with open(j.path, "rb") as f:
+        assert all(json.loads(line) for line in f)
+    j = open_journal("tiktok", "akun", root=root, limit=10)
+    assert j.rows == ["a", "b", "c"] and j.cursor == {"next": 3}
+
+def test_stale_journal_is_discarded(tmp_path):
+    root = str(tmp_path)
+    j = open_journal("youtube", "akun", root=root, limit=5)
+    j.checkpoint(["x"], {"token": "t"})
+    j.close()
+
+    old = Journal(j.path, dict(j.header, params={"limit": 6}))   # parameter lain di path yang sama
+    assert not old.resumed and not os.path.exists(j.path)
+
+    j = open_journal("youtube", "akun", root=root, limit=5)
+    j.checkpoint(["x"], {"token": "t"})
+    j.close()
+    assert Journal(j.path, j.header, max_age=0).resumed                 # max_age <= 0 → tanpa batas umur
+    with open(j.path, "r+b") as f:                                       # header berumur 2 hari
+        lines = f.read().splitlines(keepends=True)
+        head = json.loads(lines[0])
+        head["created"] -= 2 * 86400
+        f.seek(0)
+        f.truncate()
+        f.write(json.dumps(head).encode() + b"\n" + b"".join(lines[1:]))
+    assert not Journal(j.path, j.header, max_age=86400).resumed
+    assert not os.path.exists(j.path)
+
+    j = open_journal("youtube", "akun", root=root, limit=5)
+    j.checkpoint(["x"], {"token": "t"})
+    j.close()
+    assert not open_journal("youtube", "akun", fresh=True, root=root, limit=5).resumed
+
+# ================== resume Instagram (freeze/thaw) ==================
+instaloader = pytest.importorskip("instaloader")
+from instaloader.nodeiterator import FrozenNodeIterator
+
+import scraper_core.instagram as ig
+
+class _Post:
+    typename = "GraphImage"
+    is_video = False
+    likes = 0
+    is_pinned = False
+
+    def __init__(self, i: int, boom: dict):
+        self.i = i
+        self.shortcode = f"P{i:03d}"
+        self.date_utc = datetime(2025, 1, 1, tzinfo=timezone.utc) - timedelta(hours=i)
+        self.url = f"https://example.com/{i}.jpg"
+        self._boom = boom
+
+    @property
+    def caption(self):
+        if self._boom.pop(("post", self.i), None):
+            raise ConnectionError("putus di tengah post")
+        return f"post {self.i}"
+
+class _Posts:
+    """NodeIterator palsu: freeze() menunjuk item terakhir yang di-yield, thaw() hanya untuk iterator baru."""
+    def __init__(self, n: int, boom: dict, query_hash: str = "q"):
+        self.items = [_Post(i, boom) for i in range(n)]
+        self.index = 0
+        self.thawed_at = None
+        self.query_hash = query_hash
+        self._boom = boom
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._boom.pop(("page", self.index), None):
+            raise ConnectionError("putus saat paginasi")
+        if self.index >= len(self.items):
+            raise StopIteration
+        self.index += 1
+        return self.items[self.index - 1]
+
+    def freeze(self):
+        return FrozenNodeIterator(query_hash=self.query_hash, query_variables={}, query_referer=None,
+                                  context_username=None, total_index=max(self.index - 1, 0),
+                                  best_before=1.0, remaining_data={}, first_node=None, doc_id=None)
+
+    def thaw(self, frozen):
+        if self.index or frozen.query_hash != self.query_hash:
+            raise ValueError("mismatch")
+        self.index = self.thawed_at = frozen.total_index
+
+class _Profile:
+    def __init__(self, posts):
+        self.posts = posts
+
+    def get_posts(self):
+        return self.posts
+
+class _L:
+    context = None
+
+@pytest.fixture
+def timeline(monkeypatch):
+    state = {"n": 12, "boom": {}, "query_hash": "q", "last": None}
+
+    def from_username(ctx, name):
+        state["last"] = _Posts(state["n"], state["boom"], state["query_hash"])
+        return _Profile(state["last"])
+
+    monkeypatch.setattr(instaloader.Profile, "from_username", staticmethod(from_username))
+    monkeypatch.setattr(ig, "CHECKPOINT_EVERY", 3)
+    return state
+
+def _run(root, **kw):
+    return ig.scrape_posts_range(_L(), "akun", limit=None, journal=open_journal("instagram", "akun", root=root),
+                                 **kw)
+
+def _links(rows):
+    return [r["link_post"] for r in rows]
+
+@pytest.mark.parametrize("boom, frozen_at", [
+    ({("page", 7): True}, 6),    # gagal saat ambil post ke-8 → lanjut dari post ke-7 (di-skip)
+    ({("post", 7): True}, 7),    # gagal di tengah post ke-8 → post itu diulang
+    ({("page", 2): True}, 1),    # gagal sebelum checkpoint berkala pertama
+])
+def test_instagram_resumes_from_frozen_cursor(tmp_path, timeline, boom, frozen_at):
+    full = _links(ig.scrape_posts_range(_L(), "akun", limit=None))
+    root = str(tmp_path)
+
+    timeline["boom"].update(boom)
+    with pytest.raises(ConnectionError):
+        _run(root)
+    rows = _run(root)
+    assert timeline["last"].thawed_at == frozen_at
+    assert _links(rows) == full                  # tidak ada post dobel / hilang
+    assert not os.listdir(os.path.join(root, "instagram"))   # run selesai → jurnal dihapus
+
+def test_instagram_stale_cursor_starts_over(tmp_path, timeline):
+    full = _links(ig.scrape_posts_range(_L(), "akun", limit=None))
+    root = str(tmp_path)
+    timeline["boom"][("page", 5)] = True
+    with pytest.raises(ConnectionError):
+        _run(root)
+    timeline["query_hash"] = "lain"              # cursor dari query lain → thaw gagal, mulai dari awal
+    rows = _run(root)
+    assert timeline["last"].thawed_at is None
+    assert _links(rows) == full
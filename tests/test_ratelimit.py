@@ -0,0 +1,93 @@
+import time as _time
+from types import SimpleNamespace
+
+import pytest
+
+from scraper_core import ratelimit
+from scraper_core.ratelimit import (
+    CircuitBreaker, CircuitOpenError, HostBucket, RateLimiter, retry_after_seconds,
+)
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Jam palsu untuk modul ratelimit (monotonic/sleep/time) + jitter backoff = 1.0."""
+    c = SimpleNamespace(now=1000.0)
+    c.monotonic = lambda: c.now
+    c.time = lambda: _time.time()
+    c.sleep = lambda s: setattr(c, "now", c.now + s)
+    monkeypatch.setattr(ratelimit, "time", c)
+    monkeypatch.setattr(ratelimit.random, "uniform", lambda a, b: 1.0)
+    return c
+
+def test_aimd_halves_on_throttle_and_recovers_additively(clock):
+    b = HostBucket("x.com", rate=2.0, burst=4)
+    b.report(429)
+    assert b.rate == 1.0
+    b.report(403)
+    assert b.rate == 0.5
+    for _ in range(10):
+        b.report(503)
+    assert b.rate == pytest.approx(2.0 * ratelimit.MIN_RATE_FRACTION)   # tidak turun di bawah lantai
+    b.report(200)
+    assert b.rate == pytest.approx(0.1 + 2.0 * ratelimit.RECOVER_STEP)
+    for _ in range(100):
+        b.report(200)
+    assert b.rate == 2.0   # pulih sampai laju dasar, tidak lebih
+
+def test_backoff_doubles_per_strike_and_resets_on_success(clock):
+    b = HostBucket("x.com", rate=1.0, burst=1)
+    b.report(429)
+    assert b.blocked_until == clock.now + ratelimit.BACKOFF_BASE
+    b.report(429)
+    assert b.blocked_until == clock.now + ratelimit.BACKOFF_BASE * 2
+    b.report(200)
+    assert b.strikes == 0
+    b.report(429)
+    assert b.blocked_until == clock.now + ratelimit.BACKOFF_BASE * 2   # blocked_until tidak mundur
+    clock.now += 10
+    b.report(429)
+    assert b.blocked_until == clock.now + ratelimit.BACKOFF_BASE * 2   # strike ke-2 sejak sukses terakhir
+
+def test_retry_after_extends_backoff_and_blocks_acquire(clock):
+    b = HostBucket("instagram.com", rate=10.0, burst=10)
+    b.report(429, retry_after=30)
+    assert b.blocked_until == clock.now + 30
+    with pytest.raises(TimeoutError):
+        b.acquire(deadline=clock.now + 5)
+    start = clock.now
+    b.acquire()
+    assert clock.now - start >= 30
+
+def test_retry_after_header_parsing():
+    assert retry_after_seconds("120") == 120.0
+    assert retry_after_seconds(None) is None
+    assert retry_after_seconds("bukan tanggal") is None
+    http_date = _time.strftime("%a, %d %b %Y %H:%M:%S GMT", _time.gmtime(_time.time() + 60))
+    assert 55 <= retry_after_seconds(http_date) <= 61
+
+def test_breaker_trips_then_half_open_retrips_longer_or_closes(clock):
+    br = CircuitBreaker("instagram", window=20, min_calls=8, ratio=0.5, cooldown=60)
+    for _ in range(7):
+        br.record(True)
+    assert br.state() == "closed"   # belum cukup hasil
+    br.record(True)
+    assert br.state() == "open" and br.remaining() == 60
+
+    br.record(True)                 # hasil request yang sudah di udara → diabaikan
+    assert br.trips == 1
+
+    clock.now += 60                 # half-open: error pertama → jeda lagi, dua kali lebih lama
+    br.record(True)
+    assert br.trips == 2 and br.remaining() == 120
+
+    clock.now += 120                # half-open: sukses → tertutup, hitungan trip direset
+    br.record(False)
+    assert br.state() == "closed" and br.trips == 0
+
+def test_limiter_fails_fast_while_platform_paused(clock):
+    rl = RateLimiter({"instagram.com": (100, 100), "*": (100, 100)})
+    for _ in range(ratelimit.BREAKER_MIN_CALLS):
+        rl.report("https://www.instagram.com/api/", 500)
+    with pytest.raises(CircuitOpenError):
+        rl.acquire("https://i.instagram.com/x", max_wait=5)
+    rl.acquire("https://example.com/", max_wait=5)   # platform lain tidak ikut dijeda
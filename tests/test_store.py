@@ -0,0 +1,48 @@
+from datetime import date, datetime, timedelta, timezone
+
+from scraper_core.records import PostRecord
+from scraper_core.store import ResultStore
+
+WIB = timezone(timedelta(hours=7))
+
+def _rec(post_id, posted_at, account="akun", platform="instagram", **kw):
+    return PostRecord(platform, post_id, account=account, posted_at=posted_at.astimezone(timezone.utc),
+                      url=f"https://x/{post_id}", **kw)
+
+def test_upsert_keeps_old_values_when_new_scrape_is_empty(tmp_path):
+    st = ResultStore(str(tmp_path / "r.sqlite3"))
+    t = datetime(2024, 5, 1, 10, tzinfo=WIB)
+    st.upsert_records([_rec("A", t, caption="lama", likes=10, views=100, image_url="https://img/a.jpg",
+                            extra={"music": "lagu"})])
+    st.upsert_records([_rec("A", t, caption="baru", likes=None, views=150, image_url=None)])
+
+    df = st.query("instagram", "akun")
+    assert len(df) == 1
+    row = df.iloc[0]
+    assert row["caption"] == "baru"              # nilai baru (tidak kosong) menimpa
+    assert row["views"] == 150
+    assert row["likes"] == 10                    # None tidak menghapus nilai lama
+    assert row["image_url"] == "https://img/a.jpg"
+    assert row["music"] == "lagu"                # extra lama ikut bertahan
+    st.close()
+
+def test_query_filters_by_inclusive_wib_days(tmp_path):
+    st = ResultStore(str(tmp_path / "r.sqlite3"))
+    st.upsert_records([
+        _rec("early", datetime(2024, 5, 1, 0, 10, tzinfo=WIB)),   # 30 Apr UTC, tapi 1 Mei WIB
+        _rec("late", datetime(2024, 5, 2, 23, 30, tzinfo=WIB)),   # 2 Mei WIB, 16:30 UTC
+        _rec("before", datetime(2024, 4, 30, 23, 59, tzinfo=WIB)),
+        _rec("after", datetime(2024, 5, 3, 0, 0, tzinfo=WIB)),
+        _rec("other", datetime(2024, 5, 1, 12, tzinfo=WIB), account="lain"),
+        _rec("tiktok", datetime(2024, 5, 1, 12, tzinfo=WIB), platform="tiktok"),
+    ])
+
+    df = st.query("instagram", "@akun", start=date(2024, 5, 1), end=date(2024, 5, 2))
+    assert df["post_id"].tolist() == ["late", "early"]   # terbaru dulu
+    assert str(df["posted_at"].dt.tz) == "UTC"
+
+    assert st.query("instagram", "akun", start=date(2024, 5, 3))["post_id"].tolist() == ["after"]
+    assert st.query("instagram", "akun", end=date(2024, 4, 30))["post_id"].tolist() == ["before"]
+    assert set(st.query(start=date(2024, 5, 1), end=date(2024, 5, 1))["post_id"]) == {"early", "other", "tiktok"}
+    assert st.query("instagram", "akun", limit=1)["post_id"].tolist() == ["after"]
+    st.close()
@@ -0,0 +1,30 @@
+import os
+
+from scraper_core.thumbcache import ThumbnailCache, canonical_url
+
+def test_signed_cdn_key_ignores_signature_but_keeps_rendition():
+    base = "https://scontent-sin6-2.cdninstagram.com/v/t51.29350-15/123_n.jpg"
+    a = f"{base}?stp=dst-jpg_e35_s640x640&_nc_ht=scontent&_nc_ohc=AAA&oh=00_sig1&oe=65F00000"
+    b = f"{base}?_nc_ohc=BBB&oe=65F11111&stp=dst-jpg_e35_s640x640&oh=00_sig2&_nc_ht=scontent"
+    small = f"{base}?stp=dst-jpg_e35_s150x150&_nc_ohc=AAA&oh=00_sig1&oe=65F00000"
+    assert canonical_url(a) == canonical_url(b)
+    assert canonical_url(a) != canonical_url(small)
+    assert "stp=" in canonical_url(a) and "oh=" not in canonical_url(a)
+
+def test_tiktok_signature_and_expiry_dropped():
+    base = "https://p16-sign-sg.tiktokcdn.com/obj/tos-alisg-p-0037/abc~tplv-photomode-zoomcover:720:720.jpeg"
+    assert canonical_url(f"{base}?x-expires=1&x-signature=aa") == canonical_url(f"{base}?x-signature=bb&x-expires=2")
+
+def test_other_hosts_keep_sorted_query():
+    assert canonical_url("HTTPS://Example.com/a.jpg?b=2&a=1#frag") == "https://example.com/a.jpg?a=1&b=2"
+
+def test_stale_index_entry_is_subtracted_on_miss(tmp_path):
+    cache = ThumbnailCache(str(tmp_path), max_bytes=10_000)
+    path = cache.put("https://example.com/a.jpg", b"x" * 300)
+    cache.put("https://example.com/b.jpg", b"y" * 200)
+    assert cache.stats()["bytes"] == 500
+    os.remove(path)   # file hilang di luar cache (mis. dihapus manual)
+    assert cache.get("https://example.com/a.jpg") is None
+    assert cache.stats()["bytes"] == 200
+    assert cache.get("https://example.com/a.jpg") is None
+    assert cache.stats()["bytes"] == 200
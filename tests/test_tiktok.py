@@ -0,0 +1,45 @@
+import io
+from collections import Counter
+
+import pandas as pd
+from PIL import Image
+
+from scraper_core import images, thumbcache
+from scraper_core.tiktok import build_preview_df_and_images
+
+class _Resp:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+class _Session:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.calls = Counter()
+
+    def get(self, url, **kwargs):
+        self.calls[url] += 1
+        return _Resp(self.content)
+
+def _jpeg() -> bytes:
+    bio = io.BytesIO()
+    Image.new("RGB", (400, 300), (10, 120, 200)).save(bio, format="JPEG")
+    return bio.getvalue()
+
+def test_preview_downloads_each_thumbnail_once_without_disk_cache(tmp_path, monkeypatch):
+    session = _Session(_jpeg())
+    monkeypatch.setattr(images, "_session", lambda: session)
+    monkeypatch.setattr(images, "default_cache", lambda: None)
+    monkeypatch.setattr(thumbcache, "STATIC_ROOT", str(tmp_path))
+    monkeypatch.setattr(thumbcache, "STATIC_DIR", str(tmp_path / "thumbs"))
+    monkeypatch.setattr(thumbcache, "_static_cache", None)
+
+    urls = [f"https://p16.tiktokcdn.com/obj/{i}.jpeg" for i in range(3)]
+    df = pd.DataFrame({"Gambar": urls, "Link Post": [f"https://www.tiktok.com/@a/video/{i}" for i in range(3)]})
+    df_prev, imgs = build_preview_df_and_images(df, None, workers=2)
+
+    assert dict(session.calls) == {u: 1 for u in urls}
+    assert all(png.startswith(b"\x89PNG") for png in imgs)
+    assert all(g.startswith(thumbcache.STATIC_URL + "/thumbs/") for g in df_prev["Gambar"])
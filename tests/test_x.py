@@ -0,0 +1,23 @@
+import pandas as pd
+
+from scraper_core.x import build_mini_table, filter_harvest
+
+def _raw_csv_frame() -> pd.DataFrame:
+    # tweet-harvest sendiri sudah punya kolom media_url (URL mentah, bisa bukan gambar)
+    return pd.DataFrame({
+        "created_at": ["2025-03-01T10:00:00Z", "2025-03-02T10:00:00Z"],
+        "id": ["111", "222"],
+        "full_text": ["satu", "dua"],
+        "favorite_count": [3, 4],
+        "media_url": ["https://pbs.twimg.com/media/AAA?format=jpg&name=small", "https://t.co/xyz"],
+    })
+
+def test_mini_table_upgrades_raw_media_url_column():
+    mini = build_mini_table(_raw_csv_frame())
+    assert mini["Gambar"].tolist() == ["https://pbs.twimg.com/media/AAA?format=jpg&name=orig", None]
+    assert mini["Link"].tolist() == ["https://x.com/i/web/status/111", "https://x.com/i/web/status/222"]
+
+def test_mini_table_same_with_or_without_filter_harvest():
+    df = _raw_csv_frame()
+    filtered = filter_harvest(df, "", "", only_original=False, exclude_quote=False, require_media=False)
+    pd.testing.assert_frame_equal(build_mini_table(filtered), build_mini_table(df))
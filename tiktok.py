@@ -9,271 +9,28 @@
 # pip install yt-dlp pandas requests pillow openpyxl
 
 import os
-import io
-import json
 import tempfile
-import hashlib
-from datetime import datetime, timedelta, date
-from typing import List, Dict, Any, Optional, Tuple
+from datetime import timedelta, date
+from typing import Optional
 
-import pandas as pd
-import requests
 import streamlit as st
-from yt_dlp import YoutubeDL
-from PIL import Image as PILImage
 
-from openpyxl import Workbook
-from openpyxl.drawing.image import Image as XLImage
-from openpyxl.styles import Font, Alignment
-
-UA = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/120.0.0.0 Safari/537.36"
+from scraper_core.tiktok import (
+    apply_date_filter,
+    build_dataframe,
+    build_preview_df_and_images,
+    fetch_user_videos_parallel,
+    TT_WORKERS,
+    make_excel_with_images,
+    write_netscape_from_json,
 )
-
-# --------------------- Helpers umum ---------------------
-def _parse_date(entry: Dict[str, Any]) -> Optional[str]:
-    ts = entry.get("timestamp")
-    if ts is not None:
-        try:
-            return datetime.fromtimestamp(int(float(ts))).strftime("%Y-%m-%d %H:%M")
-        except Exception:
-            pass
-    up = entry.get("upload_date")
-    if up:
-        try:
-            dt = datetime.strptime(str(up), "%Y%m%d")
-            return dt.strftime("%Y-%m-%d 00:00")
-        except Exception:
-            pass
-    return None
-
-def _get_thumb_url(entry: Dict[str, Any]) -> Optional[str]:
-    if entry.get("thumbnail"):
-        return entry["thumbnail"]
-    thumbs = entry.get("thumbnails") or []
-    if isinstance(thumbs, list) and thumbs:
-        return (thumbs[-1] or {}).get("url")
-    return None
-
-def _get_int(entry: Dict[str, Any], *keys: str) -> Optional[int]:
-    for k in keys:
-        v = entry.get(k)
-        if isinstance(v, (int, float)) and not pd.isna(v):
-            return int(v)
-    return None
-
-def _normalize_row(entry: Dict[str, Any]) -> Dict[str, Any]:
-    return {
-        "Tanggal Post": _parse_date(entry),
-        "Gambar": _get_thumb_url(entry),     # URL (nanti diubah ke bytes utk preview)
-        "Link Post": entry.get("webpage_url") or entry.get("url"),
-        "Caption": entry.get("title") or entry.get("description"),
-        "Like": _get_int(entry, "like_count", "likes"),
-        "Views": _get_int(entry, "view_count", "views", "play_count"),
-        "Comments": _get_int(entry, "comment_count", "comments"),
-        "Shares": _get_int(entry, "repost_count", "share_count", "shares"),
-    }
-
-def build_dataframe(entries: List[Dict[str, Any]]) -> pd.DataFrame:
-    rows = [_normalize_row(e) for e in entries]
-    df = pd.DataFrame(
-        rows,
-        columns=["Tanggal Post", "Gambar", "Link Post", "Caption", "Like", "Views", "Comments", "Shares"],
-    )
-    if df["Tanggal Post"].notna().any():
-        df["__dt"] = pd.to_datetime(df["Tanggal Post"], errors="coerce")
-        df = df.sort_values("__dt", ascending=False)
-        df["Tanggal Post"] = df["__dt"].dt.strftime("%Y-%m-%d %H:%M")
-        df = df.drop(columns="__dt")
-    return df
-
-def write_netscape_from_json(json_bytes: bytes) -> str:
-    data = json.loads(json_bytes.decode("utf-8"))
-    if not isinstance(data, list):
-        raise ValueError("Format cookies JSON tidak valid: harus list of objects")
-    fd, path = tempfile.mkstemp(prefix="tiktok_cookies_", suffix=".txt")
-    os.close(fd)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write("# Netscape HTTP Cookie File\n")
-        f.write("# Generated by Streamlit module (TikTok).\n")
-        for c in data:
-            domain = c.get("domain") or c.get("host") or ""
-            if not domain:
-                continue
-            include_subdomains = "TRUE" if (domain.startswith(".") or (c.get("hostOnly") is False)) else "FALSE"
-            path_cookie = c.get("path") or "/"
-            secure = "TRUE" if c.get("secure") else "FALSE"
-            exp_raw = c.get("expirationDate")
-            if exp_raw is None or c.get("session"):
-                expires = 0
-            else:
-                try:
-                    expires = int(float(exp_raw))
-                except Exception:
-                    expires = 0
-            name = str(c.get("name", ""))
-            value = str(c.get("value", ""))
-            f.write(f"{domain}\t{include_subdomains}\t{path_cookie}\t{secure}\t{expires}\t{name}\t{value}\n")
-    return path
-
-def _cookies_dict_from_json_bytes(cookie_json_bytes: Optional[bytes]) -> Dict[str, str]:
-    out: Dict[str, str] = {}
-    if not cookie_json_bytes:
-        return out
-    try:
-        arr = json.loads(cookie_json_bytes.decode("utf-8"))
-        if isinstance(arr, list):
-            for c in arr:
-                name, value = c.get("name"), c.get("value")
-                if name and value:
-                    out[name] = value
-    except Exception:
-        pass
-    return out
-
-def _fetch_thumbnail_png_bytes(url: str, referer_url: Optional[str], cookie_json_bytes: Optional[bytes], target_w: int = 120) -> Optional[bytes]:
-    if not url:
-        return None
-    headers = {
-        "User-Agent": UA,
-        "Referer": referer_url or "https://www.tiktok.com/",
-        "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
-        "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7",
-    }
-    cookies = _cookies_dict_from_json_bytes(cookie_json_bytes)
-    try:
-        resp = requests.get(url, headers=headers, cookies=cookies, timeout=20)
-        resp.raise_for_status()
-        img = PILImage.open(io.BytesIO(resp.content))
-        # Komposit alpha → putih
-        if img.mode == "RGBA":
-            bg = PILImage.new("RGB", img.size, (255, 255, 255))
-            bg.paste(img, mask=img.split()[3])
-            img = bg
-        elif img.mode != "RGB":
-            img = img.convert("RGB")
-        # Resize kecil untuk preview
-        w0, h0 = img.size
-        if w0 > 0 and target_w:
-            scale = target_w / float(w0)
-            img = img.resize((int(w0 * scale), int(h0 * scale)))
-        bio = io.BytesIO()
-        img.save(bio, format="PNG")
-        bio.seek(0)
-        return bio.getvalue()
-    except Exception:
-        return None
-
-def build_preview_df_and_images(df_url: pd.DataFrame, cookie_json_bytes: Optional[bytes]) -> Tuple[pd.DataFrame, List[bytes]]:
-    df_prev = df_url.copy()
-    imgs: List[bytes] = []
-    for _, row in df_url.iterrows():
-        url = row.get("Gambar")
-        ref = row.get("Link Post") or "https://www.tiktok.com/"
-        png = _fetch_thumbnail_png_bytes(url, ref, cookie_json_bytes, target_w=120)
-        imgs.append(png if png is not None else b"")
-    df_prev["Gambar"] = imgs  # bytes → tampil di ImageColumn tanpa hotlink
-    return df_prev, imgs
-
-def make_excel_with_images(df_meta: pd.DataFrame, preloaded_images: Optional[List[bytes]]) -> bytes:
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "TikTok"
-
-    headers = ["Tanggal Post", "Gambar", "Link Post", "Caption", "Like", "Views", "Comments", "Shares"]
-    ws.append(headers)
-
-    for col_idx in range(1, len(headers) + 1):
-        ws.cell(row=1, column=col_idx).font = Font(bold=True)
-    widths = [18, 20, 45, 60, 12, 12, 12, 12]
-    for idx, w in enumerate(widths, start=1):
-        ws.column_dimensions[chr(64 + idx)].width = w
-
-    for i, row in enumerate(df_meta.itertuples(index=False), start=2):
-        row_dict = dict(zip(df_meta.columns, row))
-        ws.cell(i, 1, row_dict.get("Tanggal Post"))
-        link_url = row_dict.get("Link Post")
-        link_cell = ws.cell(i, 3, "Buka")
-        if link_url:
-            link_cell.hyperlink = link_url
-            try:
-                link_cell.style = "Hyperlink"
-            except Exception:
-                pass
-        cap_cell = ws.cell(i, 4, row_dict.get("Caption"))
-        cap_cell.alignment = Alignment(wrap_text=True, vertical="top")
-        ws.cell(i, 5, row_dict.get("Like"))
-        ws.cell(i, 6, row_dict.get("Views"))
-        ws.cell(i, 7, row_dict.get("Comments"))
-        ws.cell(i, 8, row_dict.get("Shares"))
-
-        # Pakai image bytes yang sama dengan preview (konsisten; anti putih)
-        png_bytes = None
-        if preloaded_images and len(preloaded_images) >= (i - 1):
-            png_bytes = preloaded_images[i - 2]
-        if png_bytes:
-            buf = io.BytesIO(png_bytes); buf.seek(0); buf.name = "thumb.png"
-            xl_img = XLImage(buf)
-            ws.add_image(xl_img, f"B{i}")
-            try:
-                im = PILImage.open(io.BytesIO(png_bytes))
-                ws.row_dimensions[i].height = max(ws.row_dimensions[i].height or 0, im.size[1] * 0.75)
-            except Exception:
-                ws.row_dimensions[i].height = max(ws.row_dimensions[i].height or 0, 90)
-
-    out = io.BytesIO()
-    wb.save(out); out.seek(0)
-    return out.getvalue()
-
-def fetch_user_videos(user: str, limit: int, cookies_path: Optional[str] = None) -> List[Dict[str, Any]]:
-    profile_url = f"https://www.tiktok.com/@{user}"
-    ydl_opts = {
-        "quiet": True,
-        "skip_download": True,
-        "extract_flat": False,
-        "ignoreerrors": True,
-        "playlistend": limit,
-        "http_headers": {"User-Agent": UA},
-    }
-    if cookies_path:
-        ydl_opts["cookiefile"] = cookies_path
-
-    entries: List[Dict[str, Any]] = []
-    with YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(profile_url, download=False)
-        if not info:
-            return []
-        if isinstance(info, dict) and "entries" in info and isinstance(info["entries"], list):
-            for ent in info["entries"]:
-                if len(entries) >= limit:
-                    break
-                if ent is None:
-                    continue
-                if ent.get("_type") == "url" and ent.get("url"):
-                    try:
-                        vinfo = ydl.extract_info(ent["url"], download=False)
-                        if vinfo:
-                            entries.append(vinfo)
-                    except Exception:
-                        continue
-                else:
-                    entries.append(ent)
-        else:
-            entries.append(info)
-    return entries[:limit]
-
-def apply_date_filter(df: pd.DataFrame, start_d: Optional[date], end_d: Optional[date]) -> pd.DataFrame:
-    if start_d is None or end_d is None or df.empty:
-        return df
-    sdt = pd.to_datetime(start_d.strftime("%Y-%m-%d") + " 00:00")
-    edt = pd.to_datetime(end_d.strftime("%Y-%m-%d") + " 23:59:59")
-    tmp = df.copy()
-    tmp["__dt"] = pd.to_datetime(tmp["Tanggal Post"], errors="coerce")
-    tmp = tmp[(tmp["__dt"] >= sdt) & (tmp["__dt"] <= edt)]
-    tmp = tmp.drop(columns="__dt")
-    return tmp
+from scraper_core.journal import open_journal
+from scraper_core.columnar import PYARROW_AVAILABLE, to_arrow_bytes, to_parquet_bytes
+from scraper_core.records import legacy_to_frame
+from scraper_core.memo import frame_fingerprint, memoized
+from scraper_core.metrics import collect
+from scraper_core.store import default_store, load_legacy, save_legacy
+from scraper_core.xlsx import read_all
 
 # --------------------- UI/MAIN ---------------------
 def render_app(key_prefix: str = "tt_"):
@@ -285,6 +42,8 @@ def render_app(key_prefix: str = "tt_"):
         st.markdown("**Pengaturan TikTok**")
         username = st.text_input("Username (tanpa @)", key=f"{key_prefix}username", placeholder="mis: viralkan.id")
         max_videos = st.slider("Maksimal video", 5, 300, 60, 5, key=f"{key_prefix}max")
+        workers = st.slider("Paralel ekstraksi", 1, 16, TT_WORKERS, 1, key=f"{key_prefix}workers",
+                            help="Jumlah video yang diambil detailnya bersamaan. Terlalu tinggi bisa memicu rate limit.")
         use_date_filter = st.checkbox("Gunakan filter tanggal", value=False, key=f"{key_prefix}use_date")
         if use_date_filter:
             today = date.today()
@@ -301,11 +60,28 @@ def render_app(key_prefix: str = "tt_"):
             key=f"{key_prefix}cookie",
         )
         start_btn = st.button("🚀 Scrape Sekarang", use_container_width=True, key=f"{key_prefix}go")
+        store_btn = st.button("📂 Muat dari store lokal", use_container_width=True, key=f"{key_prefix}store",
+                              disabled=default_store() is None,
+                              help="Ambil hasil scrape sebelumnya untuk username ini tanpa jaringan.")
 
     # --- Init session_state scoped by prefix ---
-    for k in ("df_meta", "last_username", "cookie_path", "cookie_json_bytes"):
+    for k in ("df_meta", "last_username", "cookie_path", "cookie_json_bytes", "errors", "metrics"):
         st.session_state.setdefault(f"{key_prefix}{k}", None)
 
+    # --- On click: muat dari store lokal ---
+    if store_btn and not start_btn:
+        if not (username or "").strip():
+            st.error("Masukkan username TikTok terlebih dahulu.")
+        else:
+            user = username.strip().lstrip("@")
+            df_meta = load_legacy("tiktok", user, start_date, end_date,
+                                  limit=None if use_date_filter else int(max_videos))
+            st.session_state[f"{key_prefix}df_meta"] = df_meta if not df_meta.empty else None
+            st.session_state[f"{key_prefix}last_username"] = user
+            st.session_state[f"{key_prefix}errors"] = None
+            if df_meta.empty:
+                st.warning(f"Store lokal belum punya data untuk @{user}.")
+
     # --- On click: scrape & store ---
     if start_btn:
         if not (username or "").strip():
@@ -327,8 +103,20 @@ def render_app(key_prefix: str = "tt_"):
                             f.write(cookie_file.read())
                         cookie_json_bytes = None
 
-                with st.spinner("Mengambil data…"):
-                    entries = fetch_user_videos((username or "").strip().lstrip("@"), max_videos, cookie_path)
+                # Checkpoint posisi di daftar video: run yang terputus dilanjutkan saat scrape diulang
+                journal = open_journal("tiktok", username.strip().lstrip("@"), limit=int(max_videos))
+                if journal is not None and journal.resumed:
+                    st.info(f"↩️ Melanjutkan run sebelumnya yang terputus: {len(journal.rows)} video dari checkpoint.")
+                with st.spinner("Mengambil data…"), collect("tiktok", username.strip()) as run:
+                    prog = st.progress(0.0, text="Mengambil daftar video…")
+                    entries, errors = fetch_user_videos_parallel(
+                        (username or "").strip().lstrip("@"), max_videos, cookie_path, workers=int(workers),
+                        on_progress=lambda i, n: prog.progress(min(1.0, i / max(1, n)), text=f"Mengambil detail video… {i}/{n}"),
+                        journal=journal,
+                    )
+                    prog.empty()
+                st.session_state[f"{key_prefix}errors"] = errors
+                st.session_state[f"{key_prefix}metrics"] = run
 
                 if not entries:
                     st.warning("Tidak ada data yang bisa diambil. Coba unggah cookies, ganti jaringan, atau kurangi limit.")
@@ -338,9 +126,18 @@ def render_app(key_prefix: str = "tt_"):
                     st.session_state[f"{key_prefix}last_username"] = (username or "").strip().lstrip("@")
                     st.session_state[f"{key_prefix}cookie_path"] = cookie_path
                     st.session_state[f"{key_prefix}cookie_json_bytes"] = cookie_json_bytes
+                    try:
+                        save_legacy(df_meta, "tiktok", (username or "").strip().lstrip("@"))
+                    except Exception as e:
+                        st.warning(f"Gagal menyimpan ke store lokal: {e}")
             except Exception as e:
                 st.error(f"Gagal mengambil data: {e}")
 
+    errors = st.session_state.get(f"{key_prefix}errors")
+    if errors:
+        with st.expander(f"⚠️ {len(errors)} video gagal diambil"):
+            st.dataframe(errors, use_container_width=True)
+
     # --- Always render preview if we have data ---
     df_meta = st.session_state.get(f"{key_prefix}df_meta")
     if df_meta is None:
@@ -354,9 +151,19 @@ def render_app(key_prefix: str = "tt_"):
             st.info("Tidak ada video dalam rentang/filter yang dipilih.")
             return
 
-    # Build preview bytes (anti putih) + Excel bytes
+    # Build preview bytes (anti putih) + Excel bytes — dimemo per sidik data, tidak diulang tiap rerun
     cookie_json_bytes = st.session_state.get(f"{key_prefix}cookie_json_bytes")
-    df_preview, preloaded_imgs = build_preview_df_and_images(df_show, cookie_json_bytes)
+    fp = frame_fingerprint(df_show, cookies=cookie_json_bytes or b"")
+    tt_user = st.session_state.get(f"{key_prefix}last_username") or "user"
+    # Unduh thumbnail + Excel melanjutkan run scrape terakhir (panel metrik di bawah)
+    with collect("tiktok", tt_user, run=st.session_state.get(f"{key_prefix}metrics")) as run:
+        df_preview, preloaded_imgs = memoized(
+            st.session_state, f"{key_prefix}memo_preview", fp,
+            lambda: build_preview_df_and_images(df_show, cookie_json_bytes),
+        )
+        xlsx_bytes = memoized(st.session_state, f"{key_prefix}memo_xlsx", fp,
+                              lambda: read_all(make_excel_with_images(df_show, preloaded_images=preloaded_imgs)))
+    st.session_state[f"{key_prefix}metrics"] = run
 
     st.success(f"Berhasil! Ditemukan {len(df_preview)} video untuk @{st.session_state.get(f'{key_prefix}last_username','user')}.")
     st.dataframe(
@@ -373,7 +180,8 @@ def render_app(key_prefix: str = "tt_"):
     )
 
     # Unduhan
-    csv_bytes = df_show.to_csv(index=False).encode("utf-8")
+    csv_bytes = memoized(st.session_state, f"{key_prefix}memo_csv", fp,
+                         lambda: df_show.to_csv(index=False).encode("utf-8"))
     st.download_button(
         "💾 Download CSV",
         data=csv_bytes,
@@ -383,7 +191,6 @@ def render_app(key_prefix: str = "tt_"):
         key=f"{key_prefix}dl_csv",
     )
 
-    xlsx_bytes = make_excel_with_images(df_show, preloaded_images=preloaded_imgs)
     st.download_button(
         "📥 Download Excel (XLSX, dengan thumbnail)",
         data=xlsx_bytes,
@@ -393,6 +200,26 @@ def render_app(key_prefix: str = "tt_"):
         key=f"{key_prefix}dl_xlsx",
     )
 
+    # Parquet / Arrow (kolom bertipe) untuk job analitik
+    if PYARROW_AVAILABLE:
+        unified = lambda: legacy_to_frame(df_show, "tiktok", tt_user)
+        st.download_button(
+            "🧱 Download Parquet",
+            data=memoized(st.session_state, f"{key_prefix}memo_parquet", fp, lambda: to_parquet_bytes(unified())),
+            file_name=f"tiktok_{tt_user}.parquet",
+            mime="application/vnd.apache.parquet",
+            use_container_width=True,
+            key=f"{key_prefix}dl_parquet",
+        )
+        st.download_button(
+            "🧱 Download Arrow",
+            data=memoized(st.session_state, f"{key_prefix}memo_arrow", fp, lambda: to_arrow_bytes(unified())),
+            file_name=f"tiktok_{tt_user}.arrow",
+            mime="application/vnd.apache.arrow.file",
+            use_container_width=True,
+            key=f"{key_prefix}dl_arrow",
+        )
+
     # Duplikasi tombol Excel di sidebar (biar gampang dicari)
     st.sidebar.download_button(
         "📥 Download Excel (TikTok)",
@@ -402,6 +229,15 @@ def render_app(key_prefix: str = "tt_"):
         key=f"{key_prefix}dl_xlsx_sidebar",
     )
 
+    if run.stages:
+        tot = run.totals()
+        with st.expander(f"⏱️ Metrik run — {run.wall_seconds:.1f} s, {tot['requests']} request, {tot['retries']} retry"):
+            st.dataframe(run.table(), use_container_width=True, hide_index=True, key=f"{key_prefix}metrics_table")
+            st.download_button("⬇️ Metrik JSON", data=run.to_json(), file_name=f"tiktok_{tt_user}_metrics.json",
+                               mime="application/json", use_container_width=True, key=f"{key_prefix}dl_metrics_json")
+            st.download_button("⬇️ Metrik Prometheus", data=run.to_prometheus(), file_name=f"tiktok_{tt_user}_metrics.prom",
+                               mime="text/plain", use_container_width=True, key=f"{key_prefix}dl_metrics_prom")
+
     with st.expander("ℹ️ Rincian Teknis"):
         st.markdown(
             """